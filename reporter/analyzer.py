@@ -1,13 +1,22 @@
 import pandas as pd
 import numpy as np
 from functools import reduce
-from utils import format_duration, format_bytes, format_ratio
-
-def calculate_counts_summary(df: pd.DataFrame, metric_name: str, duration_sec: int) -> dict:
+import rollup
+from utils import format_duration, format_bytes, format_ratios
+from metric_index import MetricIndex
+from sketch import QuantileSketch, grouped_sketches, RELATIVE_ACCURACY
+from percentile import grouped_percentiles, PERCENTILES
+
+# 퍼센타일 계산 방식
+#   exact  : 원본 값을 정렬 해서 계산 (np.percentile 과 동일)
+#   sketch : 그룹별 QuantileSketch 로 근사 (메모리 제한, 병합 가능)
+PERCENTILE_ENGINES = ("exact", "sketch")
+
+def calculate_counts_summary(index: MetricIndex, metric_name: str, duration_sec: int) -> dict:
     """
     특정 metric_name 에 대해 총 건수(total)를 계산
     """
-    filtered = df[df["metric_name"] == metric_name]
+    filtered = index.get(metric_name)
 
     if filtered.empty:
         return {"total": 0}
@@ -16,40 +25,64 @@ def calculate_counts_summary(df: pd.DataFrame, metric_name: str, duration_sec: i
         "total": len(filtered)
     }
 
-def calculate_durations_summary(df: pd.DataFrame, metric: str) -> dict:
+def calculate_durations_summary(index: MetricIndex, metric: str, engine: str = "exact",
+                                relative_accuracy: float = RELATIVE_ACCURACY) -> dict:
+    """
+    주어진 metric_name 에 대해 avg, min, max, p50, p90, p95, p99 값을 계산 해서 표시용 dict 로 반환
+    """
+    stats = calculate_durations_stats(index, metric, engine, relative_accuracy)
+    return format_durations_summary(stats) if stats else {}
+
+
+def calculate_durations_stats(index: MetricIndex, metric: str, engine: str = "exact",
+                              relative_accuracy: float = RELATIVE_ACCURACY) -> dict:
     """
-    주어진 metric_name 에 대해 avg, min, max, p50, p90, p95, p99 값을 계산 해서 dict 로 반환
+    주어진 metric_name 에 대해 avg, min, max, p50, p90, p95, p99 수치(ms) dict 반환 (데이터 가 없으면 빈 dict)
     """
-    df_filtered = df[df["metric_name"] == metric]
+    df_filtered = index.get(metric)
 
     if df_filtered.empty:
         print(f"[WARN] No data for metric: {metric}")
         return {}
 
-    values = df_filtered["metric_value"]
-    result = {
+    values = df_filtered["metric_value"].astype("float64")
+    if engine == "sketch":
+        sketch = QuantileSketch(relative_accuracy)
+        sketch.add(values.to_numpy())
+        return sketch.stats()
+
+    return {
         "avg": values.mean(),
         "min": values.min(),
         "max": values.max(),
-        "p50": np.percentile(values, 50),
-        "p90": np.percentile(values, 90),
-        "p95": np.percentile(values, 95),
-        "p99": np.percentile(values, 99),
+        **{f"p{q}": v for q, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))},
     }
-    result = {k: format_duration(v) for k, v in result.items()}
-    return result
 
 
-def calculate_total_transfer_summary(df: pd.DataFrame, duration_sec: int) -> dict:
+def format_durations_summary(stats: dict) -> dict:
+    """
+    avg, min, max, p50 ... 수치 dict 를 표시용 문자열 dict 로 변환
+    """
+    return {k: format_duration(v) for k, v in stats.items()}
+
+
+def calculate_total_transfer_summary(index: MetricIndex, duration_sec: int) -> dict:
     """
     data_sent, data_received 총량과 초당 전송량 요약을 dict 로 반환
     """
-    if df.empty:
+    if index.empty:
         return {}
 
-    data_received_total = df[df["metric_name"] == "data_received"]["metric_value"].sum()
-    data_sent_total = df[df["metric_name"] == "data_sent"]["metric_value"].sum()
+    data_received_total = index.get("data_received")["metric_value"].astype("float64").sum()
+    data_sent_total = index.get("data_sent")["metric_value"].astype("float64").sum()
+
+    return format_transfer_summary(data_received_total, data_sent_total, duration_sec)
+
 
+def format_transfer_summary(data_received_total: float, data_sent_total: float, duration_sec: int) -> dict:
+    """
+    송수신 총량을 초당 전송량과 함께 표시용 문자열 dict 로 변환
+    """
     data_received_per_sec = data_received_total / duration_sec if duration_sec else 0
     data_sent_per_sec = data_sent_total / duration_sec if duration_sec else 0
 
@@ -61,117 +94,132 @@ def calculate_total_transfer_summary(df: pd.DataFrame, duration_sec: int) -> dic
     }
 
 
-def generate_time_binned_vus_summary(df: pd.DataFrame, interval_sec: int = 5) -> pd.DataFrame:
+def generate_time_binned_vus_summary(index: MetricIndex, interval_sec: int = 5) -> pd.DataFrame:
     """
     timestamp 기준 interval_sec 간격 으로 VUs 시계열 샘플링
     """
-    if df.empty:
+    if index.empty:
         return pd.DataFrame()
 
-    df_vus = df[df["metric_name"] == "vus"].copy()
-    df_vus["bucket"] = df_vus["timestamp"].dt.floor(f"{interval_sec}s")
+    df_vus = index.with_buckets("vus", interval_sec)
 
     return (
-        df_vus.sort_values("timestamp")
+        df_vus.sort_values("timestamp", kind="stable")
         .groupby("bucket", as_index=False)
         .first()[["bucket", "metric_value"]]
         .rename(columns={"bucket": "timestamp", "metric_value": "vus"})
     )
 
 
-def generate_time_binned_tps(df: pd.DataFrame, interval_sec: int = 10) -> pd.DataFrame:
+def generate_time_binned_tps(index: MetricIndex, interval_sec: int = 10) -> pd.DataFrame:
     """
     interval_sec 간격 으로 성공 TPS(Time per Second) 시계열 데이터 생성
     """
-    if df.empty:
+    if index.empty:
         return pd.DataFrame(columns=["timestamp", "tps"])
 
-    # 필요한 메트릭 만 추출
-    reqs = df[df["metric_name"] == "http_reqs"].copy()
-    fails = df[(df["metric_name"] == "http_req_failed") & (df["metric_value"] == 1)].copy()
+    return success_tps(generate_time_binned_counts(index, interval_sec), interval_sec)
 
-    # 시간 구간 정리
-    reqs["interval"] = reqs["timestamp"].dt.floor(f"{interval_sec}s")
-    fails["interval"] = fails["timestamp"].dt.floor(f"{interval_sec}s")
+
+def generate_time_binned_counts(index: MetricIndex, interval_sec: int) -> pd.DataFrame:
+    """
+    interval_sec 간격 별 요청 수(req_count), 실패 수(fail_count) DataFrame (timestamp 컬럼 은 버킷 시작 epoch 초)
+    """
+    # 필요한 메트릭 만 추출 (시간 구간은 인덱스 에서 한 번만 계산)
+    reqs = index.with_buckets("http_reqs", interval_sec)
+    fails = index.with_buckets("http_req_failed", interval_sec)
+    fails = fails[fails["metric_value"] == 1]
 
     # 각 구간별 요청 수
-    req_counts = reqs.groupby("interval").size().reset_index(name="req_count")
-    fail_counts = fails.groupby("interval").size().reset_index(name="fail_count")
+    req_counts = reqs.groupby("bucket").size().reset_index(name="req_count")
+    fail_counts = fails.groupby("bucket").size().reset_index(name="fail_count")
 
-    # 성공 TPS 계산
-    merged = pd.merge(req_counts, fail_counts, on="interval", how="left")
+    merged = pd.merge(req_counts, fail_counts, on="bucket", how="left")
     merged["fail_count"] = merged["fail_count"].fillna(0).astype(int)
-    merged["success_count"] = merged["req_count"] - merged["fail_count"]
-    merged["tps"] = (merged["success_count"] / interval_sec).round(2)
-    merged = merged.rename(columns={"interval": "timestamp"})
+    return merged.rename(columns={"bucket": "timestamp"})
 
-    return merged[["timestamp", "tps"]]
 
+def success_tps(counts: pd.DataFrame, interval_sec: int) -> pd.DataFrame:
+    """
+    generate_time_binned_counts 결과 → timestamp, tps (성공 요청 수 / 초)
+    """
+    tps = ((counts["req_count"] - counts["fail_count"]) / interval_sec).round(2)
+    return pd.DataFrame({"timestamp": counts["timestamp"], "tps": tps})
 
-def generate_time_binned_latency_summary(df: pd.DataFrame, interval_sec: int = 5) -> pd.DataFrame:
+
+def generate_time_binned_latency_summary(index: MetricIndex, interval_sec: int = 5, engine: str = "exact",
+                                         relative_accuracy: float = RELATIVE_ACCURACY) -> pd.DataFrame:
     """
     timestamp 기준 interval_sec 간격 으로 latency 통계 (avg, min, max, p50, p90, p95, p99) 생성
     """
-    if df.empty:
+    if index.empty:
         return pd.DataFrame()
 
-    df_latency = df[df["metric_name"] == "http_req_duration"].copy()
-    df_latency["bucket"] = df_latency["timestamp"].dt.floor(f"{interval_sec}s")
+    df_latency = index.with_buckets("http_req_duration", interval_sec)
 
     return (
-        df_latency.groupby("bucket")["metric_value"]
-        .agg(
-            avg="mean",
-            min="min",
-            max="max",
-            p50=lambda x: np.percentile(x, 50),
-            p90=lambda x: np.percentile(x, 90),
-            p95=lambda x: np.percentile(x, 95),
-            p99=lambda x: np.percentile(x, 99),
-        )
-        .reset_index()
+        summarize_latency(df_latency, "bucket", engine, relative_accuracy)
         .rename(columns={"bucket": "timestamp"})
     )
 
-def generate_latency_detail_summary(df: pd.DataFrame) -> pd.DataFrame:
+def generate_time_rollups(index: MetricIndex, duration_sec: int, engine: str = "exact",
+                          relative_accuracy: float = RELATIVE_ACCURACY) -> dict:
+    """
+    VU / 성공 TPS / latency 시계열 을 rollup.rollup_intervals 의 모든 해상도 로 계산 해서
+    {"vus" | "tps" | "latency": {interval_sec: DataFrame}} 로 반환 (확대 가능한 차트 용)
+
+    VU 와 요청 / 실패 건수 는 가장 작은 간격 으로 한 번만 집계 한 뒤 큰 간격 으로 다시 묶고,
+    latency 는 간격 별로 summarize_latency 로 계산 한다 (exact 는 간격 마다 한 번의 정렬).
+    """
+    if index.empty:
+        return {"vus": {}, "tps": {}, "latency": {}}
+
+    intervals = rollup.rollup_intervals(duration_sec)
+    vus = generate_time_binned_vus_summary(index, intervals[0])
+    counts = generate_time_binned_counts(index, intervals[0])
+    return {
+        "vus": {interval: rollup.rebin_first(vus, interval) for interval in intervals},
+        "tps": {interval: success_tps(rollup.rebin_sum(counts, interval), interval) for interval in intervals},
+        "latency": {
+            interval: generate_time_binned_latency_summary(index, interval, engine, relative_accuracy)
+            for interval in intervals
+        },
+    }
+
+
+def generate_latency_detail_summary(index: MetricIndex, engine: str = "exact",
+                                    relative_accuracy: float = RELATIVE_ACCURACY) -> pd.DataFrame:
     """
     URL 별로 전체 요청수, 성공수, 실패수, 성공률, avg, min, max, p50, p90, p95, p99, errors 통계를 계산해서 반환
     """
-    if df.empty:
+    if index.empty:
+        return pd.DataFrame()
+    return format_latency_detail_table(calculate_latency_detail(index, engine, relative_accuracy))
+
+
+def calculate_latency_detail(index: MetricIndex, engine: str = "exact",
+                             relative_accuracy: float = RELATIVE_ACCURACY) -> pd.DataFrame:
+    """
+    URL 별 url, total, fail, avg ~ p99 (ms), errors 수치 DataFrame (표시용 정리 전)
+    """
+    if index.empty:
         return pd.DataFrame()
 
     # 1. 전체 요청수 (http_reqs)
-    df_reqs = df[df["metric_name"] == "http_reqs"]
-    total_reqs = df_reqs.groupby("url")["metric_value"].count().reset_index(name="total")
+    df_reqs = index.get("http_reqs")
+    total_reqs = df_reqs.groupby("url", observed=True)["metric_value"].count().reset_index(name="total")
 
     # 2. 실패 요청수 (http_req_failed, metric_value == 1 인 것)
-    df_failed = df[(df["metric_name"] == "http_req_failed") & (df["metric_value"] == 1)]
-    failed_reqs = df_failed.groupby("url")["metric_value"].count().reset_index(name="fail")
+    df_req_failed = index.get("http_req_failed")
+    df_failed = df_req_failed[df_req_failed["metric_value"] == 1]
+    failed_reqs = df_failed.groupby("url", observed=True)["metric_value"].count().reset_index(name="fail")
 
     # 3. latency (http_req_duration)
-    df_latency = df[df["metric_name"] == "http_req_duration"]
-    latency_summary = df_latency.groupby("url")["metric_value"].agg(
-        avg="mean",
-        min="min",
-        max="max",
-        p50=lambda x: np.percentile(x, 50),
-        p90=lambda x: np.percentile(x, 90),
-        p95=lambda x: np.percentile(x, 95),
-        p99=lambda x: np.percentile(x, 99),
-    ).reset_index()
+    df_latency = index.get("http_req_duration")
+    latency_summary = summarize_latency(df_latency, "url", engine, relative_accuracy)
 
     # 4. URL별 errors 요약 추가
-    df_errors = df[(df["metric_name"] == "http_req_failed") & (df["error"].notna())]
-    if not df_errors.empty:
-        error_summary = (
-            df_errors
-            .groupby("url")["error"]
-            .apply(lambda x: ", ".join(f"{err}({cnt})" for err, cnt in x.value_counts().items()))
-            .reset_index()
-            .rename(columns={"error": "errors"})
-        )
-    else:
-        error_summary = pd.DataFrame(columns=["url", "errors"])
+    error_summary = summarize_errors(df_req_failed)
 
     # 5. 합치기
     result = (
@@ -180,15 +228,74 @@ def generate_latency_detail_summary(df: pd.DataFrame) -> pd.DataFrame:
         .merge(latency_summary, on="url", how="left")
         .merge(error_summary, on="url", how="left")
     )
+    return result
+
+
+def summarize_errors(df_req_failed: pd.DataFrame) -> pd.DataFrame:
+    """
+    URL 별 "에러(건수), ..." 문자열 (건수 가 많은 순) 을 [url, errors] DataFrame 으로 반환
+
+    (url, error) 쌍 건수 를 한 번의 groupby 로 구하고, 쌍 단위 문자열 을 만든 뒤 URL 별로 이어 붙인다 (URL 마다 value_counts 를 돌지 않음)
+    """
+    df_errors = df_req_failed[df_req_failed["error"].notna()]
+    if df_errors.empty:
+        return pd.DataFrame(columns=["url", "errors"])
+
+    counts = df_errors.groupby(["url", "error"], observed=True).size().reset_index(name="count")
+    counts = counts[counts["count"] > 0].sort_values(["url", "count"], ascending=[True, False], kind="stable")
+    counts["label"] = counts["error"].astype(str) + "(" + counts["count"].astype(str) + ")"
+    return counts.groupby("url", observed=True, sort=False)["label"].agg(", ".join).reset_index(name="errors")
+
+
+def summarize_latency(df_latency: pd.DataFrame, by: str, engine: str = "exact",
+                      relative_accuracy: float = RELATIVE_ACCURACY) -> pd.DataFrame:
+    """
+    by 컬럼 값 별로 metric_value 의 avg, min, max, p50, p90, p95, p99 를 계산 해서 [by, avg, ..., p99] DataFrame 으로 반환
+    """
+    if engine == "sketch":
+        sketches = build_latency_sketches(df_latency, by, relative_accuracy)
+        rows = [{by: key, **sketch.stats()} for key, sketch in sketches.items()]
+        return pd.DataFrame(rows, columns=[by, "avg", "min", "max", "p50", "p90", "p95", "p99"])
+
+    # avg/min/max 는 groupby 내장 집계, 퍼센타일 은 한 번의 정렬로 모든 그룹을 계산
+    values = df_latency["metric_value"].astype("float64")
+    result = values.groupby(df_latency[by], observed=True).agg(avg="mean", min="min", max="max").reset_index()
+    codes = pd.Index(result[by]).get_indexer(df_latency[by])
+    valid = codes >= 0
+    percentiles = grouped_percentiles(codes[valid], values.to_numpy()[valid], len(result))
+    for j, q in enumerate(PERCENTILES):
+        result[f"p{q}"] = percentiles[:, j]
+    return result
+
+
+def build_latency_sketches(df_latency: pd.DataFrame, by: str,
+                           relative_accuracy: float = RELATIVE_ACCURACY) -> dict:
+    """
+    by 컬럼 값(URL, 시간 버킷 등) 별 QuantileSketch dict 생성 (key 순 정렬, NaN key 제외)
+    """
+    codes, uniques = pd.factorize(df_latency[by], sort=True)
+    valid = codes >= 0
+    sketches = grouped_sketches(codes[valid], df_latency["metric_value"].to_numpy()[valid], len(uniques), relative_accuracy)
+    return dict(zip(uniques, sketches))
+
 
+def format_latency_detail_table(result: pd.DataFrame) -> pd.DataFrame:
+    """
+    url, total, fail, avg ~ p99, errors 컬럼을 가진 URL 별 집계 결과에 성공률을 붙이고 표시용 으로 정리
+    """
     result["fail"] = result["fail"].fillna(0).astype(int)
     result["ok"] = result["total"] - result["fail"]
-    result["ratio"] = result.apply(lambda row: format_ratio(row["ok"], row["total"]) if row["total"] > 0 else 0, axis=1)
+    result["ratio"] = format_ratios(result["ok"], result["total"])
     result = result.drop(columns=["ok"])
 
     # 6. 숫자 포맷 정리
     latency_cols = ["avg", "min", "max", "p50", "p90", "p95", "p99"]
-    result[latency_cols] = result[latency_cols].round(0).astype(int)
+    latency = result[latency_cols].round(0)
+    if latency.isna().any().any():
+        # http_req_duration 이 없는 URL (--metrics 로 제외 등) 은 "-"
+        result[latency_cols] = latency.astype("Int64").astype(object).where(latency.notna(), "-")
+    else:
+        result[latency_cols] = latency.astype(int)
 
     # 7. 열 순서 재정렬
     result = result[["url", "total", "fail", "ratio", "avg", "min", "max", "p50", "p90", "p95", "p99", "errors"]]
@@ -196,29 +303,38 @@ def generate_latency_detail_summary(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
-def generate_check_summary(df: pd.DataFrame) -> pd.DataFrame:
+def generate_check_summary(index: MetricIndex) -> pd.DataFrame:
     """
     checks metric 에 대해 check 별로 total, success, fail 집계
     """
-    if df.empty:
+    if index.empty:
         return pd.DataFrame()
 
-    checks_df = df[df["metric_name"] == "checks"]
+    checks_df = index.get("checks")
 
     if checks_df.empty:
         return pd.DataFrame(columns=["check", "total", "fail", "ratio"])
 
+    # float32 합계 는 1,677만 건을 넘으면 오차가 생기므로 float64 로 집계
     result = (
         checks_df
-        .groupby("check", as_index=False)
+        .astype({"metric_value": "float64"})
+        .groupby("check", as_index=False, observed=True)
         .agg(
             total=('metric_value', 'count'),
             success=('metric_value', 'sum'),
         )
         .assign(success=lambda x: x["success"].astype(int))
     )
+    return format_check_table(result)
+
+
+def format_check_table(result: pd.DataFrame) -> pd.DataFrame:
+    """
+    check, total, success 컬럼을 가진 check 별 집계 결과에 실패수, 성공률을 붙이고 정렬
+    """
     result["fail"] = result["total"] - result["success"]
-    result["ratio"] = result.apply(lambda row: format_ratio(row["success"], row["total"]), axis=1)
+    result["ratio"] = format_ratios(result["success"], result["total"])
     result = result.drop(columns=["success"])
 
     # 정렬
@@ -227,12 +343,12 @@ def generate_check_summary(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
-def calculate_failures_summary(df: pd.DataFrame) -> dict:
+def calculate_failures_summary(index: MetricIndex) -> dict:
     """
     http_req_failed 메트릭 기준 으로
     실패 수(failures), 성공 수(successes), 성공률(success_rate), 에러 요약(errors) 계산 하여 dict 로 반환
     """
-    failed_df = df[df["metric_name"] == "http_req_failed"]
+    failed_df = index.get("http_req_failed")
 
     if failed_df.empty:
         return {
@@ -243,27 +359,29 @@ def calculate_failures_summary(df: pd.DataFrame) -> dict:
         }
 
     # 실패 건수 (metric_value == 1 인 행 수)
-    failures = int(failed_df["metric_value"].sum())
+    failures = int(failed_df["metric_value"].astype("float64").sum())
 
     # 전체 요청 수 (http_req_failed 행 전체 개수)
     total = len(failed_df)
 
+    # 전체 error 종류별 count
+    error_counts = failed_df[failed_df["error"].notna()].groupby("error", observed=True).size()
+
+    return format_failures_summary(failures, total, error_counts.to_dict())
+
+
+def format_failures_summary(failures: int, total: int, error_counts: dict) -> dict:
+    """
+    실패 수, 전체 수, error 종류별 count 로 실패 요약 dict 생성
+    """
     # 성공 건수
     successes = total - failures
 
     # 성공률
     success_rate = round((successes / total) * 100, 2) if total > 0 else 0.0
 
-    # 전체 error 종류별 count
-    error_summary_df = (
-        failed_df[failed_df["error"].notna()]
-        .groupby("error")
-        .size()
-        .reset_index(name="count")
-    )
-
-    # 에러 문자열 조합
-    error_summary = ", ".join(f"{row['error']}({row['count']})" for _, row in error_summary_df.iterrows())
+    # 에러 문자열 조합 (error 이름 순)
+    error_summary = ", ".join(f"{err}({cnt})" for err, cnt in sorted(error_counts.items()))
 
     return {
         "failures": failures,
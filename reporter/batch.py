@@ -0,0 +1,207 @@
+import argparse
+import glob
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+
+import history
+import html_writer
+import main as report
+import parser
+import url_template
+import utils
+from cache import ParsedRunCache, DEFAULT_CACHE_DIR
+
+# 파일 하나를 처리할 때의 최대 메모리 사용량 추정치
+#   일반 모드  : CSV 크기 x IN_MEMORY_FACTOR (category/float32 로 읽은 DataFrame + 파싱 버퍼)
+#   스트리밍 모드: chunk 행 수 x STREAM_BYTES_PER_ROW (chunk 하나 + 집계 상태)
+IN_MEMORY_FACTOR = 1.0
+STREAM_BYTES_PER_ROW = 300
+# .gz 입력은 압축 전 크기를 알 수 없으므로 압축률 추정치 로 환산, NDJSON 은 같은 행 수의 CSV 보다 약 3배 크다
+GZIP_RATIO_ESTIMATE = 10
+JSON_TO_CSV_BYTES = 1 / 3
+# 입력 으로 인식 하는 k6 결과 파일
+INPUT_PATTERNS = ("*.csv", "*.csv.gz", "*.json", "*.json.gz", "*.ndjson", "*.ndjson.gz")
+# 메모리 예산 을 지정 하지 않으면 물리 메모리 의 70% 사용
+DEFAULT_MEMORY_FRACTION = 0.7
+
+
+def find_inputs(pattern: str) -> list:
+    """
+    디렉터리 면 그 아래 k6 결과 파일(INPUT_PATTERNS), 아니면 glob 패턴 으로 입력 파일 목록 반환 (이름 순)
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted({f for p in INPUT_PATTERNS for f in path.glob(p)})
+    return sorted(Path(p) for p in glob.glob(pattern) if Path(p).is_file())
+
+
+def output_stems(inputs: list) -> dict:
+    """
+    입력 파일 → 리포트 파일 이름 stem. 같은 stem 의 입력 (run.csv 와 run.json.gz, 다른 디렉터리 의 같은 이름) 은
+    형식 (run_csv, run_json_gz), 그래도 겹치면 순번 (run_csv_2) 을 붙여서 리포트 가 서로 덮어쓰지 않게 한다
+    """
+    stems = {path: parser.result_stem(path) for path in inputs}
+    counts = Counter(stems.values())
+    for path, stem in stems.items():
+        if counts[stem] > 1:
+            stems[path] = f"{stem}_{path.name[len(stem):].strip('.').replace('.', '_')}"
+
+    seen = Counter()
+    for path in sorted(stems):
+        seen[stems[path]] += 1
+        if seen[stems[path]] > 1:
+            stems[path] = f"{stems[path]}_{seen[stems[path]]}"
+    return stems
+
+
+def estimate_memory(path: Path, stream: bool, chunk_size: int) -> int:
+    if stream:
+        return chunk_size * STREAM_BYTES_PER_ROW
+    size = path.stat().st_size
+    if parser.is_compressed(path):
+        size *= GZIP_RATIO_ESTIMATE
+    if parser.is_json(path):
+        size *= JSON_TO_CSV_BYTES
+    return int(size * IN_MEMORY_FACTOR)
+
+
+def default_memory_budget() -> int:
+    try:
+        return int(os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") * DEFAULT_MEMORY_FRACTION)
+    except (ValueError, OSError, AttributeError):
+        return 8 * 1024 ** 3
+
+
+def run_batch(inputs: list, output_dir: Path, workers: int, memory_budget: int, options: dict) -> list:
+    """
+    입력 파일 들을 worker 프로세스 풀에서 동시에 처리
+
+    동시에 실행 중인 파일들의 추정 메모리 합이 memory_budget 을 넘지 않는 범위 에서만 새 파일을 시작 한다.
+    (예산 보다 큰 파일은 단독 으로 실행). 큰 파일 부터 시작 해서 마지막 에 큰 파일 하나만 남는 상황을 줄인다.
+    """
+    stems = output_stems(inputs)
+    pending = sorted(inputs, key=lambda p: p.stat().st_size, reverse=True)
+    results = []
+    running = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while pending or running:
+            in_use = sum(estimate for _, estimate in running.values())
+            while pending and len(running) < workers:
+                estimate = estimate_memory(pending[0], options["stream"], options["chunk_size"])
+                if running and in_use + estimate > memory_budget:
+                    break
+                path = pending.pop(0)
+                future = executor.submit(run_one, str(path), str(output_dir), options, stems[path])
+                running[future] = (path, estimate)
+                in_use += estimate
+                print(f"[INFO] Started {path.name} (estimated memory {utils.format_bytes(estimate)})")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, _ = running.pop(future)
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    print(f"[ERROR] Failed to process {path}: {e}")
+                    results.append({"input": path.name, "html": None, "error": str(e)})
+
+    return sorted(results, key=lambda r: r["input"])
+
+
+def run_one(input_path: str, output_dir: str, options: dict, stem: str = None) -> dict:
+    """
+    worker 프로세스 에서 실행: main.main 으로 리포트 하나를 만들고 인덱스 페이지용 요약을 반환
+
+    동시에 도는 worker 의 콘솔 출력 이 섞이지 않도록 콘솔 요약 은 출력 하지 않는다 (HTML, CSV, 실행 요약 만)
+    """
+    cache = ParsedRunCache(options["cache_dir"], options["cache_max_bytes"]) if options["cache_dir"] else None
+    result = report.main(
+        input_path,
+        stream=options["stream"],
+        chunk_size=options["chunk_size"],
+        cache=cache,
+        timezone=options["timezone"],
+        output_dir=Path(output_dir),
+        csv_engine=options["csv_engine"],
+        time_from=options["time_from"],
+        time_to=options["time_to"],
+        metrics=options["metrics"],
+        exclude_metrics=options["exclude_metrics"],
+        history_db=options["history_db"],
+        url_templates=options["url_templates"],
+        raw_urls=options["raw_urls"],
+        max_urls=options["max_urls"],
+        outputs=["html", "csv", "summary"],
+        stem=stem,
+    )
+    if result is None:
+        raise ValueError(f"[ERROR] No report generated for {input_path}")
+    html_output, processed = result
+    return {
+        "input": Path(input_path).name,
+        "html": html_output.name,
+        "test_duration": processed["test_duration"],
+        "summary_http_request": processed["summary_http_request"],
+    }
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate reports for many k6 result files concurrently")
+    arg_parser.add_argument("inputs", help="Directory containing k6 result files (.csv/.json, optionally .gz), or a glob pattern (quote it)")
+    arg_parser.add_argument("--output-dir", default=str(Path(__file__).resolve().parent / "out"))
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Max files processed at once")
+    arg_parser.add_argument("--memory-budget", default=None,
+                            help="Total estimated memory for concurrently processed files (e.g. 16G, default: 70%% of RAM)")
+    arg_parser.add_argument("--stream", action="store_true", help="Use streaming aggregation for every file")
+    arg_parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    arg_parser.add_argument("--timezone", default=utils.DEFAULT_TIMEZONE)
+    arg_parser.add_argument("--csv-engine", choices=parser.CSV_ENGINES, default="pandas")
+    arg_parser.add_argument("--from", dest="time_from", default=None,
+                            help="Only rows at or after this time (offsets like 3m are relative to each file's test start)")
+    arg_parser.add_argument("--to", dest="time_to", default=None)
+    arg_parser.add_argument("--metrics", type=utils.parse_list, default=None)
+    arg_parser.add_argument("--exclude-metrics", type=utils.parse_list, default=None)
+    arg_parser.add_argument("--url-template", dest="url_templates", action="append", default=None,
+                            metavar="REGEX=>TEMPLATE", help="Rewrite URLs matching REGEX before grouping (repeatable)")
+    arg_parser.add_argument("--max-urls", type=int, default=url_template.DEFAULT_MAX_ENDPOINTS)
+    arg_parser.add_argument("--raw-urls", action="store_true")
+    arg_parser.add_argument("--history", nargs="?", const=str(history.DEFAULT_DB_PATH), default=None,
+                            help="Store every run summary in a SQLite history file")
+    arg_parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    arg_parser.add_argument("--cache-max-size", default="10G")
+    arg_parser.add_argument("--no-cache", action="store_true")
+    args = arg_parser.parse_args()
+
+    inputs = find_inputs(args.inputs)
+    if not inputs:
+        print(f"[ERROR] No input files found: {args.inputs}")
+        raise SystemExit(1)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    memory_budget = utils.parse_bytes(args.memory_budget) if args.memory_budget else default_memory_budget()
+    print(f"[INFO] {len(inputs)} files, {args.workers} workers, memory budget {utils.format_bytes(memory_budget)}")
+
+    results = run_batch(inputs, output_dir, args.workers, memory_budget, {
+        "stream": args.stream,
+        "chunk_size": args.chunk_size,
+        "timezone": args.timezone,
+        "csv_engine": args.csv_engine,
+        "time_from": args.time_from,
+        "time_to": args.time_to,
+        "metrics": args.metrics,
+        "exclude_metrics": args.exclude_metrics,
+        "history_db": args.history,
+        "url_templates": args.url_templates,
+        "raw_urls": args.raw_urls,
+        "max_urls": args.max_urls,
+        "cache_dir": None if args.no_cache else args.cache_dir,
+        "cache_max_bytes": utils.parse_bytes(args.cache_max_size),
+    })
+
+    index_output = output_dir / f"index_{report.generate_timestamp()}.html"
+    html_writer.generate_batch_index(index_output, results, args.timezone)
+    print(f"[DONE] Batch complete: {sum(1 for r in results if r['html'])}/{len(results)} reports")
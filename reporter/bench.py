@@ -0,0 +1,259 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+import analyzer
+import csv_writer
+import cube
+import data_processor
+import errors
+import html_writer
+import parser
+import streaming
+import synth
+import utils
+from metric_index import MetricIndex
+from sketch import RELATIVE_ACCURACY
+
+DEFAULT_BENCH_DIR = Path(__file__).resolve().parent / "out" / "bench"
+
+# 기준 결과 대비 중앙값 이 이 비율 을 넘게 느려지면 표시
+REGRESSION_RATIO = 1.10
+
+
+class Stage:
+    """
+    측정 단위 하나. setup(ctx) 결과 (측정 제외) 를 run 에 넘겨서 실행 시간 과 Python 힙 최대 사용량 을 잰다
+    """
+
+    def __init__(self, name: str, run: Callable, setup: Optional[Callable] = None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda ctx: ctx)
+
+
+def build_stages(engine: str = "exact", relative_accuracy: float = RELATIVE_ACCURACY) -> list:
+    """
+    parser / analyzer / report 단계 목록 (process_data 와 같은 순서, 같은 인자)
+
+    analyzer 단계 는 매번 새 MetricIndex 로 실행 하므로 metric 별 행 추출 비용 도 처음 쓰는 단계 에 포함 된다.
+    """
+    p = {"engine": engine, "relative_accuracy": relative_accuracy}
+
+    def fresh_index(ctx):
+        return {**ctx, "index": MetricIndex(ctx["df"])}
+
+    def analyzer_stage(name, fn):
+        return Stage(f"analyzer.{name}", lambda c: fn(c["index"], c), fresh_index)
+
+    return [
+        Stage("parser.load_csv[pandas]", lambda c: parser.load_csv(c["path"], "pandas")),
+        Stage("parser.load_csv[mmap]", lambda c: parser.load_csv(c["path"], "mmap")),
+        Stage("metric_index.MetricIndex", lambda c: MetricIndex(c["df"])),
+        analyzer_stage("calculate_counts_summary",
+                       lambda index, c: analyzer.calculate_counts_summary(index, "http_reqs", c["seconds"])),
+        analyzer_stage("calculate_failures_summary", lambda index, c: analyzer.calculate_failures_summary(index)),
+        analyzer_stage("calculate_durations_stats",
+                       lambda index, c: [analyzer.calculate_durations_stats(index, metric, **p)
+                                         for metric in ("http_req_duration", "iteration_duration")]),
+        analyzer_stage("calculate_total_transfer_summary",
+                       lambda index, c: analyzer.calculate_total_transfer_summary(index, c["seconds"])),
+        analyzer_stage("generate_time_binned_vus_summary",
+                       lambda index, c: analyzer.generate_time_binned_vus_summary(index, c["interval"])),
+        analyzer_stage("generate_time_binned_tps", lambda index, c: analyzer.generate_time_binned_tps(index, c["interval"])),
+        analyzer_stage("generate_time_binned_latency_summary",
+                       lambda index, c: analyzer.generate_time_binned_latency_summary(index, c["interval"], **p)),
+        analyzer_stage("generate_time_rollups", lambda index, c: analyzer.generate_time_rollups(index, c["seconds"], **p)),
+        analyzer_stage("calculate_latency_detail", lambda index, c: analyzer.calculate_latency_detail(index, **p)),
+        Stage("analyzer.format_latency_detail_table", lambda c: analyzer.format_latency_detail_table(c["latency_detail"]),
+              lambda c: {**c, "latency_detail": c["latency_detail"].copy()}),
+        analyzer_stage("generate_check_summary", lambda index, c: analyzer.generate_check_summary(index)),
+        Stage("errors.build_error_crosstab", lambda c: errors.build_error_crosstab(c["index"], c["interval"]), fresh_index),
+        Stage("cube.build_cube", lambda c: cube.build_cube(c["index"], relative_accuracy), fresh_index),
+        Stage("data_processor.process_data",
+              lambda c: data_processor.process_data(c["df"], engine, relative_accuracy).compute()),
+        Stage("streaming.process_csv_streaming",
+              lambda c: streaming.aggregate_chunks(parser.iter_result_chunks(c["path"]), relative_accuracy).compute()),
+        Stage("html_writer.generate_report", lambda c: html_writer.generate_report(c["tmp"] / "report.html", c["processed"])),
+        Stage("csv_writer.export_detail_tables_to_csv",
+              lambda c: csv_writer.export_detail_tables_to_csv(c["tmp"], "report", c["processed"])),
+    ]
+
+
+def measure(stage: Stage, ctx: dict, repeat: int) -> dict:
+    """
+    stage 를 repeat 번 실행한 시간 (초) 과, 한 번 더 tracemalloc 아래 에서 실행한 Python 힙 최대 증가량 (바이트)
+    """
+    seconds = []
+    # 단계 안의 [INFO] 출력 은 숨긴다
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            args = stage.setup(ctx)
+            gc.collect()
+            started = time.perf_counter()
+            stage.run(args)
+            seconds.append(time.perf_counter() - started)
+
+        args = stage.setup(ctx)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            baseline = tracemalloc.get_traced_memory()[0]
+            stage.run(args)
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+        finally:
+            tracemalloc.stop()
+
+    return {
+        "seconds": [round(s, 6) for s in seconds],
+        "min": round(min(seconds), 6),
+        "median": round(statistics.median(seconds), 6),
+        "peak_bytes": int(peak),
+    }
+
+
+def run_dataset(path: Path, stages: list, repeat: int) -> dict:
+    """
+    한 입력 파일 에 대해 모든 단계 를 측정
+    """
+    df = parser.load_csv(path)
+    seconds = utils.calculate_test_duration(df)["seconds"]
+    index = MetricIndex(df)
+    with tempfile.TemporaryDirectory() as tmp:
+        ctx = {
+            "path": path,
+            "df": df,
+            "seconds": seconds,
+            "interval": utils.determine_interval_seconds(seconds),
+            "latency_detail": analyzer.calculate_latency_detail(index),
+            "processed": data_processor.process_data(df).compute(),
+            "tmp": Path(tmp),
+        }
+        results = {}
+        for stage in stages:
+            stats = results[stage.name] = measure(stage, ctx, repeat)
+            print(f"[INFO]   {stage.name:<46} {stats['median']:8.3f}s  peak {utils.format_bytes(stats['peak_bytes'])}")
+
+    return {
+        "file": path.name,
+        "bytes": path.stat().st_size,
+        "rows": len(df),
+        "test_seconds": seconds,
+        "stages": results,
+    }
+
+
+def dataset_path(data_dir: Path, rows: int, options: dict) -> Path:
+    """
+    생성 옵션 이 같으면 같은 파일 이름 (이미 있으면 다시 만들지 않는다)
+    """
+    tag = "_".join(f"{key}{value}" for key, value in sorted(options.items()) if value is not None)
+    return data_dir / f"synth_{rows}_{tag}.csv"
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parent, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    try:
+        import numba
+        numba_version = numba.__version__
+    except ImportError:
+        numba_version = None
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "numba": numba_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(current: dict, baseline: dict) -> list:
+    """
+    (행 수, 단계) 가 같은 측정값 의 중앙값 비교 행 목록 [(rows, stage, 기준 초, 현재 초, 비율)]
+    """
+    base = {(d["rows"], name): s["median"] for d in baseline["datasets"] for name, s in d["stages"].items()}
+    rows = []
+    for dataset in current["datasets"]:
+        for name, stats in dataset["stages"].items():
+            before = base.get((dataset["rows"], name))
+            if before:
+                rows.append((dataset["rows"], name, before, stats["median"], stats["median"] / before))
+    return rows
+
+
+def print_comparison(rows: list) -> None:
+    print(f"\n{'rows':>12}  {'stage':<46} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for n, name, before, after, ratio in rows:
+        flag = "  <- slower" if ratio > REGRESSION_RATIO else ""
+        print(f"{n:>12,}  {name:<46} {before:>9.3f}s {after:>9.3f}s {ratio:>6.2f}x{flag}")
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Time and memory-profile the report pipeline on synthetic k6 results")
+    arg_parser.add_argument("--rows", type=utils.parse_list, default=["1M"],
+                            help="Comma-separated dataset sizes (e.g. 1M,10M,100M)")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage (min / median are reported)")
+    arg_parser.add_argument("--filter", default=None, help="Only stages whose name contains this text (e.g. analyzer.)")
+    arg_parser.add_argument("--percentile-engine", choices=analyzer.PERCENTILE_ENGINES, default="exact")
+    arg_parser.add_argument("--urls", type=int, default=2, help="Generator: API endpoints per iteration")
+    arg_parser.add_argument("--ids", type=int, default=1, help="Generator: distinct ids per endpoint path")
+    arg_parser.add_argument("--checks", type=int, default=None, help="Generator: distinct check names")
+    arg_parser.add_argument("--error-rate", type=float, default=0.05, help="Generator: failed request ratio")
+    arg_parser.add_argument("--duration", default=None, help="Generator: stretch stress-api.js stages to this length")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    arg_parser.add_argument("--data-dir", default=str(DEFAULT_BENCH_DIR / "data"), help="Where generated inputs are kept")
+    arg_parser.add_argument("--output", default=None, help="Result JSON (default: out/bench/bench_<timestamp>.json)")
+    arg_parser.add_argument("--baseline", default=None, help="Earlier result JSON to compare medians against")
+    args = arg_parser.parse_args()
+
+    stages = [s for s in build_stages(args.percentile_engine) if not args.filter or args.filter in s.name]
+    stretch = utils.parse_time_bound(args.duration, 0) if args.duration else None
+    generator = {"urls": args.urls, "ids": args.ids, "checks": args.checks, "err": args.error_rate,
+                 "dur": stretch, "seed": args.seed}
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "config": {"repeat": args.repeat, "percentile_engine": args.percentile_engine, "generator": generator},
+        "datasets": [],
+    }
+    for rows in (utils.parse_count(r) for r in args.rows):
+        path = dataset_path(Path(args.data_dir), rows, generator)
+        if not path.exists():
+            stage_plan = synth.scale_stages(synth.DEFAULT_STAGES, stretch) if stretch else synth.DEFAULT_STAGES
+            run = synth.SyntheticRun(rows, stage_plan, args.urls, args.ids, args.checks, args.error_rate, args.seed)
+            print(f"[INFO] Generating {path}")
+            run.write(path)
+        print(f"[INFO] Benchmarking {path.name} ({utils.format_bytes(path.stat().st_size)})")
+        report["datasets"].append(run_dataset(path, stages, args.repeat))
+
+    report["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Linux: KiB 단위
+    output = Path(args.output) if args.output else DEFAULT_BENCH_DIR / f"bench_{datetime.now().strftime('%Y%m%d%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[DONE] Benchmark results: {output}")
+
+    if args.baseline:
+        print_comparison(compare(report, json.loads(Path(args.baseline).read_text(encoding="utf-8"))))
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+import parser
+
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parent / "out" / "cache"
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+
+# 캐시 포맷 이 바뀌면 올려서 이전 캐시 를 무효화
+CACHE_VERSION = 5
+
+# 내용 해시 는 전체 파일 대신 앞/뒤 1MiB 와 중간 샘플 블록만 읽어서 계산 (수십 GB 파일도 즉시 계산)
+HASH_EDGE_BYTES = 1024 ** 2
+HASH_SAMPLE_BYTES = 64 * 1024
+HASH_SAMPLES = 8
+
+
+class ParsedRunCache:
+    """
+    parser.load_results 결과를 컬럼별 .npy 파일로 저장 해 두는 디스크 캐시
+
+    - 키: 파일 경로, 크기, mtime, 샘플 내용 해시
+    - 포맷: 숫자/시간 컬럼 은 .npy (memory-map 으로 로드), 문자열 컬럼 은 int32 코드 .npy + 카테고리 목록(meta.json)
+    - 전체 크기가 max_bytes 를 넘으면 가장 오래 사용 하지 않은 항목 부터 삭제
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def fingerprint(self, path: Union[str, Path]) -> str:
+        path = Path(path).resolve()
+        stat = path.stat()
+
+        digest = hashlib.sha256()
+        digest.update(f"v{CACHE_VERSION}|{path}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        with path.open("rb") as f:
+            for offset, length in _sample_blocks(stat.st_size):
+                f.seek(offset)
+                digest.update(f.read(length))
+        return digest.hexdigest()[:32]
+
+    def load(self, path: Union[str, Path]) -> Optional[pd.DataFrame]:
+        entry = self.cache_dir / self.fingerprint(path)
+        meta_file = entry / "meta.json"
+        if not meta_file.exists():
+            return None
+
+        try:
+            meta = json.loads(meta_file.read_text(encoding="utf-8"))
+            df = pd.DataFrame({col: _load_column(entry, spec) for col, spec in meta["columns"].items()})
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARN] Ignoring broken cache entry {entry}: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+
+        # 최근 사용 시각 갱신 (eviction 기준)
+        os.utime(meta_file)
+        return df
+
+    def store(self, path: Union[str, Path], df: pd.DataFrame) -> Path:
+        key = self.fingerprint(path)
+        entry = self.cache_dir / key
+        tmp = self.cache_dir / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+
+        columns = {col: _store_column(tmp / f"{i}.npy", df[col]) for i, col in enumerate(df.columns)}
+        meta = {"version": CACHE_VERSION, "source": str(Path(path).resolve()), "rows": len(df), "columns": columns}
+        (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+        shutil.rmtree(entry, ignore_errors=True)
+        tmp.rename(entry)
+        self.evict()
+        return entry
+
+    def evict(self) -> None:
+        """
+        전체 캐시 크기가 max_bytes 이하가 될 때 까지 오래된 항목 부터 삭제
+        """
+        entries = [e for e in self.cache_dir.iterdir() if not e.name.startswith(".") and (e / "meta.json").exists()]
+        sizes = {e: sum(f.stat().st_size for f in e.iterdir()) for e in entries}
+        total = sum(sizes.values())
+
+        for entry in sorted(entries, key=lambda e: (e / "meta.json").stat().st_mtime):
+            if total <= self.max_bytes:
+                break
+            print(f"[INFO] Evicting cache entry: {entry.name}")
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= sizes[entry]
+
+
+def load_csv_cached(path: Union[str, Path], cache: Optional[ParsedRunCache], csv_engine: str = "pandas",
+                    row_filter: Optional[parser.RowFilter] = None) -> pd.DataFrame:
+    """
+    캐시 에 있으면 캐시 에서, 없으면 parser.load_results 로 파싱 한 뒤 캐시 에 저장
+
+    캐시 는 항상 전체 행을 담는다. row_filter 가 있으면 캐시 적중 시 로드한 결과 에 적용 하고,
+    미적중 시 에는 파싱 중에 걸러서 읽고 (일부 행 이므로) 캐시 에 저장 하지 않는다.
+    """
+    if cache is None:
+        return parser.load_results(path, csv_engine, row_filter)
+
+    started = time.perf_counter()
+    df = cache.load(path)
+    if df is not None:
+        print(f"[INFO] Loaded parsed run from cache in {time.perf_counter() - started:.2f}s")
+        return row_filter.apply(df).reset_index(drop=True) if row_filter is not None else df
+
+    if row_filter is not None:
+        return parser.load_results(path, csv_engine, row_filter)
+
+    df = parser.load_results(path, csv_engine)
+    entry = cache.store(path, df)
+    print(f"[INFO] Stored parsed run in cache: {entry}")
+    return df
+
+
+def _sample_blocks(size: int) -> list:
+    # (offset, length) 목록: 파일 앞/뒤 HASH_EDGE_BYTES + 중간 HASH_SAMPLES 개 블록
+    blocks = [(0, HASH_EDGE_BYTES), (max(size - HASH_EDGE_BYTES, 0), HASH_EDGE_BYTES)]
+    blocks += [(size * i // (HASH_SAMPLES + 1), HASH_SAMPLE_BYTES) for i in range(1, HASH_SAMPLES + 1)]
+    return blocks
+
+
+def _store_column(file: Path, series: pd.Series) -> dict:
+    if pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype):
+        np.save(file, series.to_numpy())
+        return {"kind": "numeric", "file": file.name}
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # 카테고리 순서(정렬 기준)를 그대로 유지
+        codes, categories, kind = series.cat.codes.to_numpy(), series.cat.categories, "categorical"
+    else:
+        codes, categories = pd.factorize(series)
+        kind = "object"
+    np.save(file, codes.astype("int32"))
+    return {"kind": kind, "file": file.name, "categories": [str(c) for c in categories]}
+
+
+def _load_column(entry: Path, spec: dict):
+    values = np.load(entry / spec["file"], mmap_mode="r")
+
+    if spec["kind"] == "numeric":
+        return values
+
+    codes = np.asarray(values)
+    if spec["kind"] == "categorical":
+        return pd.Categorical.from_codes(codes, categories=spec["categories"])
+
+    # object 컬럼: 코드 → 문자열, 코드 -1 은 NaN
+    categories = np.array(spec["categories"] + [np.nan], dtype=object)
+    return categories[codes]
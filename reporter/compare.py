@@ -0,0 +1,156 @@
+import argparse
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import pandas as pd
+
+import run_summary
+
+# 비교 하는 전체 duration 통계 (ms)
+DURATION_STATS = ("avg", "p50", "p90", "p95", "p99", "max")
+# URL 별 비교 통계 (ms)
+URL_STATS = ("p95", "p99")
+
+
+def compare_runs(baseline: dict, current: dict) -> tuple:
+    """
+    두 실행 요약(run_summary) 을 비교 해서 (전체 비교 DataFrame, URL 별 비교 DataFrame) 반환
+
+    - 전체: TPS, 요청 수, 성공률, http_req_duration / iteration_duration 통계 의 baseline, current, delta, delta_pct
+    - URL 별: p95 / p99 (ms) 와 성공 TPS 의 baseline, current, delta
+    """
+    return overall_deltas(baseline, current), url_deltas(baseline, current)
+
+
+def overall_deltas(baseline: dict, current: dict) -> pd.DataFrame:
+    rows = [
+        ("tps", baseline["requests"]["tps"], current["requests"]["tps"]),
+        ("total_reqs", baseline["requests"]["total"], current["requests"]["total"]),
+        ("success_rate", baseline["requests"]["success_rate"], current["requests"]["success_rate"]),
+        ("vus_max", baseline["requests"]["vus_max"], current["requests"]["vus_max"]),
+    ]
+    for metric in run_summary.DURATION_METRICS:
+        base_stats = baseline["durations"].get(metric, {}).get("stats", {})
+        cur_stats = current["durations"].get(metric, {}).get("stats", {})
+        rows += [(f"{metric}.{stat}", base_stats.get(stat), cur_stats.get(stat)) for stat in DURATION_STATS]
+
+    result = pd.DataFrame(rows, columns=["metric", "baseline", "current"])
+    return _with_deltas(result, "baseline", "current", "delta", "delta_pct")
+
+
+def url_deltas(baseline: dict, current: dict) -> pd.DataFrame:
+    """
+    URL 별 p95 / p99 (ms), 성공 TPS 비교. 한쪽 실행 에만 있는 URL 은 다른 쪽 값이 빈 값(NaN)
+    """
+    urls = sorted(set(baseline["urls"]) | set(current["urls"]))
+    columns = {"url": urls}
+    for name, summary in (("base", baseline), ("cur", current)):
+        seconds = summary["test_duration"]["seconds"]
+        entries = [summary["urls"].get(url) for url in urls]
+        for stat in URL_STATS:
+            columns[f"{name}_{stat}"] = [_stat(entry, stat) for entry in entries]
+        columns[f"{name}_tps"] = [
+            (entry["total"] - entry["fail"]) / seconds if entry and seconds else np.nan for entry in entries
+        ]
+
+    result = pd.DataFrame(columns)
+    for stat in (*URL_STATS, "tps"):
+        result = _with_deltas(result, f"base_{stat}", f"cur_{stat}", f"delta_{stat}", f"delta_{stat}_pct")
+    order = ["url"] + [
+        col for stat in (*URL_STATS, "tps")
+        for col in (f"base_{stat}", f"cur_{stat}", f"delta_{stat}", f"delta_{stat}_pct")
+    ]
+    return result[order]
+
+
+def find_regressions(overall: pd.DataFrame, urls: pd.DataFrame, max_regression_pct: float) -> list:
+    """
+    p95 / p99 가 max_regression_pct % 보다 많이 늘었거나 TPS 가 그만큼 줄어든 항목 설명 목록
+    """
+    regressions = []
+    for _, row in overall.iterrows():
+        metric = row["metric"]
+        if metric.endswith((".p95", ".p99")) and row["delta_pct"] > max_regression_pct:
+            regressions.append(f"{metric}: {row['baseline']:.1f}ms -> {row['current']:.1f}ms ({row['delta_pct']:+.1f}%)")
+        elif metric == "tps" and row["delta_pct"] < -max_regression_pct:
+            regressions.append(f"tps: {row['baseline']:.2f} -> {row['current']:.2f} ({row['delta_pct']:+.1f}%)")
+
+    for _, row in urls.iterrows():
+        for stat in URL_STATS:
+            if row[f"delta_{stat}_pct"] > max_regression_pct:
+                regressions.append(
+                    f"{row['url']} {stat}: {row[f'base_{stat}']:.1f}ms -> {row[f'cur_{stat}']:.1f}ms "
+                    f"({row[f'delta_{stat}_pct']:+.1f}%)"
+                )
+    return regressions
+
+
+def resolve_summary_path(path: Union[str, Path]) -> Path:
+    """
+    요약 파일(.summary.json) 또는 리포트 HTML 경로 → 요약 파일 경로
+    """
+    path = Path(path)
+    return run_summary.summary_path(path) if path.suffix == ".html" else path
+
+
+def print_comparison(overall: pd.DataFrame, urls: pd.DataFrame, baseline_name: str, current_name: str) -> None:
+    print(f"\n===== 실행 비교: {baseline_name} (baseline) → {current_name} =====")
+    print(overall.to_string(index=False, float_format=lambda v: f"{v:,.2f}", na_rep="-"))
+
+    print("\n===== URL 별 비교 (ms, TPS) =====")
+    print(urls.to_string(index=False, float_format=lambda v: f"{v:,.1f}", na_rep="-"))
+
+
+def _stat(entry, stat: str) -> float:
+    if not entry:
+        return np.nan
+    value = entry["stats"].get(stat)
+    return np.nan if value is None else value
+
+
+def _with_deltas(df: pd.DataFrame, base_col: str, cur_col: str, delta_col: str, pct_col: str) -> pd.DataFrame:
+    base = pd.to_numeric(df[base_col], errors="coerce").astype("float64")
+    cur = pd.to_numeric(df[cur_col], errors="coerce").astype("float64")
+    df[delta_col] = cur - base
+    with np.errstate(divide="ignore", invalid="ignore"):
+        df[pct_col] = np.where(base != 0, (cur - base) / base * 100, np.nan)
+    return df
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Compare a k6 run against a baseline using saved run summaries")
+    arg_parser.add_argument("baseline", help="Baseline <report>.summary.json (or the report .html next to it)")
+    arg_parser.add_argument("current", help="Current <report>.summary.json (or the report .html next to it)")
+    arg_parser.add_argument("--output-dir", default=str(Path(__file__).resolve().parent / "out"))
+    arg_parser.add_argument("--max-regression", type=float, default=None,
+                            help="Exit with status 1 if any p95/p99 grows (or TPS drops) by more than this percent")
+    args = arg_parser.parse_args()
+
+    baseline_path, current_path = resolve_summary_path(args.baseline), resolve_summary_path(args.current)
+    try:
+        baseline, current = run_summary.load(baseline_path), run_summary.load(current_path)
+    except (OSError, ValueError) as e:
+        print(e)
+        raise SystemExit(1)
+
+    overall, urls = compare_runs(baseline, current)
+    baseline_name = baseline_path.name.removesuffix(".summary.json")
+    current_name = current_path.name.removesuffix(".summary.json")
+    print_comparison(overall, urls, baseline_name, current_name)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    compare_file = output_dir / f"compare_{baseline_name}_vs_{current_name}.csv"
+    urls.to_csv(compare_file, index=False, encoding="utf-8-sig")
+    overall_file = output_dir / f"compare_{baseline_name}_vs_{current_name}_overall.csv"
+    overall.to_csv(overall_file, index=False, encoding="utf-8-sig")
+    print(f"\n[DONE] 비교 결과 저장 완료: {compare_file}, {overall_file}")
+
+    if args.max_regression is not None:
+        regressions = find_regressions(overall, urls, args.max_regression)
+        for regression in regressions:
+            print(f"[WARN] Regression: {regression}")
+        if regressions:
+            raise SystemExit(1)
+        print(f"[INFO] No regression above {args.max_regression}%")
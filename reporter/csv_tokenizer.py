@@ -0,0 +1,505 @@
+import mmap
+import time
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import parser
+
+try:
+    # 설치 되어 있으면 필드 스캔/해시 를 numba 로 컴파일 한 한 번의 바이트 순회 로 처리 (없으면 NumPy 벡터 연산)
+    import numba
+except ImportError:
+    numba = None
+
+# 한 번에 토큰화 하는 바이트 수 (블록 하나의 임시 배열 메모리 ≒ BLOCK_BYTES x 약 3)
+BLOCK_BYTES = 64 * 1024 ** 2
+
+# pd.read_csv 가 기본 으로 NaN 처리 하는 문자열 (pandas 와 같은 결과를 내기 위해 동일 하게 처리)
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+}
+
+_COMMA, _NEWLINE, _QUOTE, _CR = 44, 10, 34, 13
+# 블록 경계(줄바꿈)를 찾을 때 한 번에 뒤로 훑는 바이트 수
+_TAIL_BYTES = 64 * 1024
+
+
+class UnsupportedLayout(ValueError):
+    """
+    줄마다 컬럼 수가 다르거나 헤더 에 필요한 컬럼 이 없는 등, 고정 레이아웃 토크나이저 로 읽을 수 없는 CSV
+    """
+
+
+def read_csv(path: Union[str, Path], byte_range: Optional[Tuple[int, int]] = None,
+             row_filter: Optional["parser.RowFilter"] = None) -> pd.DataFrame:
+    """
+    k6 CSV 를 memory-map 해서 KEEP_COLUMNS 만 NumPy 배열로 바로 읽는다 (parser.clean_frame 전 단계 DataFrame)
+
+    문자열 컬럼 은 블록 마다 정수 코드 로 intern 한 뒤, 마지막 에 정렬된 전체 카테고리 로 코드를 맞춰서
+    pd.read_csv(dtype=category) 와 같은 Categorical 을 만든다.
+    """
+    blocks = list(iter_blocks(path, byte_range=byte_range, row_filter=row_filter))
+    if not blocks:
+        return pd.DataFrame({col: [] for col in parser.KEEP_COLUMNS})
+
+    columns = {}
+    for col in list(blocks[0]):
+        # 컬럼 하나를 합칠 때 마다 블록 쪽 배열을 버려서 최대 메모리 를 줄인다
+        parts = [block.pop(col) for block in blocks]
+        if isinstance(parts[0], tuple):
+            columns[col] = _concat_categorical(parts)
+        else:
+            columns[col] = np.concatenate(parts)
+        del parts
+    return pd.DataFrame(columns)
+
+
+def iter_csv_chunks(path: Union[str, Path], chunk_size: int = 1_000_000,
+                    byte_range: Optional[Tuple[int, int]] = None,
+                    row_filter: Optional["parser.RowFilter"] = None) -> Iterator[pd.DataFrame]:
+    """
+    parser.iter_csv_chunks 와 같은 역할. 블록 크기는 chunk_size 행 분량의 바이트 로 환산
+    """
+    block_bytes = max(chunk_size * _bytes_per_row(path), 1024 ** 2)
+    for block in iter_blocks(path, block_bytes, byte_range, row_filter):
+        yield pd.DataFrame({
+            col: pd.Categorical.from_codes(*value) if isinstance(value, tuple) else value
+            for col, value in block.items()
+        })
+
+
+def iter_blocks(path: Union[str, Path], block_bytes: int = BLOCK_BYTES,
+                byte_range: Optional[Tuple[int, int]] = None,
+                row_filter: Optional["parser.RowFilter"] = None) -> Iterator[dict]:
+    """
+    줄 경계 로 자른 블록 단위로 {컬럼: 배열} 을 반환. 문자열 컬럼 은 (codes, categories) 튜플
+    row_filter 를 주면 metric_name/timestamp 만 먼저 변환 해서 조건 에 맞는 행의 나머지 컬럼 만 변환 한다
+    """
+    path = Path(path)
+    header = parser.read_header(path)
+    positions = {col: header.index(col) for col in parser.KEEP_COLUMNS if col in header}
+    missing = {"metric_name", "timestamp", "metric_value"} - set(positions)
+    if missing:
+        raise UnsupportedLayout(f"Missing columns in header: {sorted(missing)}")
+
+    if path.stat().st_size == 0:
+        return
+
+    with path.open("rb") as f:
+        # mmap 은 명시적 으로 닫지 않고, 마지막 NumPy 뷰가 해제될 때 같이 해제 되도록 둔다
+        # (예외 traceback 이 블록 뷰를 잡고 있어도 BufferError 가 나지 않도록)
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buf = np.frombuffer(mm, dtype=np.uint8)
+
+    if byte_range is None:
+        start, end = _body_start(buf), len(buf)
+    else:
+        start, end = byte_range
+
+    while start < end:
+        block_end = _block_end(buf, start, min(start + block_bytes, end), end)
+        yield _tokenize_block(buf[start:block_end], len(header), positions, row_filter)
+        _release(mm, start, block_end)
+        start = block_end
+
+
+def _tokenize_block(block: np.ndarray, n_cols: int, positions: dict,
+                    row_filter: Optional["parser.RowFilter"] = None) -> dict:
+    """
+    블록(완전한 줄 들) 하나를 필요한 컬럼 의 (행, 컬럼) 별 필드 시작/끝 위치로 나눈 뒤 변환
+    """
+    slots = np.full(n_cols, -1, dtype="int64")
+    slots[list(positions.values())] = np.arange(len(positions))
+    if numba is not None:
+        starts, ends, n_rows = _scan_fields_jit(block, n_cols, slots, len(positions))
+        if n_rows < 0:
+            raise UnsupportedLayout("Rows have a different number of fields than the header")
+        starts, ends = starts[:n_rows], ends[:n_rows]
+    else:
+        starts, ends = _scan_fields(block, n_cols)
+        starts, ends = starts[:, list(positions.values())], ends[:, list(positions.values())]
+
+    lengths = ends - starts
+    data = block if numba is not None else _padded(block, lengths)
+
+    # 블록 결과 는 전체 파일 분량 이 쌓일 수 있으므로 바로 compact 타입 으로 (실수 컬럼 은 최종 타입, 코드 는 최소 정수 타입)
+    result = {}
+    if row_filter is not None:
+        result, starts, lengths = _filter_rows(data, starts, lengths, list(positions), row_filter)
+
+    for slot, col in enumerate(positions):
+        if col in result:
+            continue
+        if col in parser.CATEGORY_COLUMNS:
+            result[col] = _intern(data, starts[:, slot], lengths[:, slot])
+        else:
+            values = _parse_numbers(data, starts[:, slot], lengths[:, slot])
+            dtype = np.dtype(parser.NUMERIC_DTYPES.get(col, "float64"))
+            result[col] = values.astype(dtype) if dtype.kind == "f" else values
+    return result
+
+
+def _filter_rows(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray, columns: list,
+                 row_filter: "parser.RowFilter") -> tuple:
+    """
+    metric_name/timestamp 컬럼 만 먼저 변환 해서 row_filter 마스크 를 구하고,
+    (변환한 컬럼 의 남은 행, 남은 행의 starts, lengths) 반환
+    """
+    name_slot, time_slot = columns.index("metric_name"), columns.index("timestamp")
+    codes, categories = _intern(data, starts[:, name_slot], lengths[:, name_slot])
+    timestamps = _parse_numbers(data, starts[:, time_slot], lengths[:, time_slot])
+
+    allowed = np.append(row_filter.metric_mask(categories), False)  # 코드 -1 은 마지막 (False)
+    mask = allowed[codes] & row_filter.time_mask(timestamps)
+    if mask.all():
+        return {"metric_name": (codes, categories), "timestamp": timestamps}, starts, lengths
+    return {"metric_name": (codes[mask], categories), "timestamp": timestamps[mask]}, starts[mask], lengths[mask]
+
+
+def _scan_fields(block: np.ndarray, n_cols: int) -> tuple:
+    """
+    모든 구분자 위치를 벡터 연산 으로 찾아서 (행, n_cols) 시작/끝 위치 배열 반환
+    """
+    delims = np.flatnonzero((block == _COMMA) | (block == _NEWLINE))
+    quotes = np.flatnonzero(block == _QUOTE)
+    if len(quotes):
+        delims = delims[~_inside_quotes(delims, quotes)]
+    if len(block) and block[-1] != _NEWLINE:
+        delims = np.append(delims, len(block))  # 마지막 줄에 줄바꿈 이 없는 경우
+
+    starts = np.empty_like(delims)
+    starts[0:1] = 0
+    starts[1:] = delims[:-1] + 1
+
+    # 모든 줄의 필드 수가 n_cols 이면 n_cols 번째 구분자 마다 줄바꿈 이어야 한다 (빠른 확인)
+    is_newline = np.append(block, np.uint8(_NEWLINE))[delims] == _NEWLINE
+    regular = len(delims) % n_cols == 0 and is_newline[n_cols - 1::n_cols].all() and \
+        is_newline.sum() == len(delims) // n_cols
+    if not regular:
+        # 줄 별 구분자 수가 n_cols 가 아닌 줄: 빈 줄은 건너뛰고, 그 외는 지원 하지 않는 레이아웃
+        line_ends = np.flatnonzero(is_newline)
+        per_line = np.diff(line_ends, prepend=-1)
+        blank = (per_line == 1) & (delims[line_ends] - starts[line_ends] <= 1)
+        if (~blank & (per_line != n_cols)).any():
+            raise UnsupportedLayout("Rows have a different number of fields than the header")
+        keep = np.repeat(per_line == n_cols, per_line)
+        delims, starts = delims[keep], starts[keep]
+
+    ends = delims.reshape(-1, n_cols)
+    starts = starts.reshape(-1, n_cols)
+
+    last = n_cols - 1
+    last_ends = ends[:, last]
+    has_cr = (last_ends > starts[:, last]) & (block[np.maximum(last_ends - 1, 0)] == _CR)
+    ends[has_cr, last] -= 1
+    return starts, ends
+
+
+def _inside_quotes(delims: np.ndarray, quotes: np.ndarray) -> np.ndarray:
+    # 따옴표 쌍 (q0, q1), (q2, q3) ... 구간 안에 있는 구분자 표시 ("" 이스케이프 는 빈 구간 이 되어 영향 없음)
+    marks = np.zeros(len(delims) + 1, dtype="int64")
+    np.add.at(marks, np.searchsorted(delims, quotes[0::2]), 1)
+    np.add.at(marks, np.searchsorted(delims, quotes[1::2]), -1)
+    return np.cumsum(marks[:-1]) > 0
+
+
+def _padded(block: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # 블록 끝의 필드 도 고정 폭 으로 잘라낼 수 있도록, 가장 긴 필드 만큼 0 을 덧붙인 사본
+    pad = int(lengths.max()) if lengths.size else 0
+    return np.concatenate([block, np.zeros(_round_up(pad), dtype=np.uint8)])
+
+
+def _gather(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray, width: int) -> np.ndarray:
+    # 필드 들을 0 으로 채운 (행, width) 고정 폭 바이트 행렬 로 복사 (data 끝에 width 이상의 0 이 있어야 함)
+    out = np.lib.stride_tricks.sliding_window_view(data, width)[starts]
+    out[np.arange(width) >= lengths[:, None]] = 0
+    return out
+
+
+def _intern(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> tuple:
+    """
+    문자열 필드 를 (정수 코드, 정렬된 카테고리 목록) 으로 변환. 빈 값/NA 문자열 은 코드 -1
+
+    필드 바이트 를 해시 해서 pd.factorize 로 묶고, 해시 충돌 이 없는지 대표값(첫 등장) 과 비교해서 확인 한다.
+    """
+    codes = np.full(len(starts), -1, dtype="int32")
+    present = np.flatnonzero(lengths > 0)
+    if not len(present):
+        return codes, []
+    starts, lengths = starts[present], lengths[present]
+
+    if numba is not None:
+        inverse, _ = pd.factorize(_hash_fields_jit(data, starts, lengths))
+        first = _first_occurrence(inverse)
+        same = _fields_equal_jit(data, starts, lengths, first[inverse])
+    else:
+        fixed = _gather(data, starts, lengths, _round_up(int(lengths.max())))
+        inverse, _ = pd.factorize(_hash_words(fixed.view("<u8"), lengths))
+        first = _first_occurrence(inverse)
+        same = (fixed == fixed[first[inverse]]).all()
+
+    if same:
+        uniques = [bytes(data[starts[i]:starts[i] + lengths[i]]) for i in first]
+    else:
+        fixed = _gather(_padded(data, lengths), starts, lengths, int(lengths.max()))
+        uniques, inverse = np.unique(fixed.view(f"S{fixed.shape[1]}").ravel(), return_inverse=True)
+
+    values = [_unquote(u.decode("utf-8")) for u in uniques]
+    categories = sorted({v for v in values if v not in NA_STRINGS})
+    index = {v: i for i, v in enumerate(categories)}
+    mapping = np.array([index.get(v, -1) for v in values], dtype="int32")
+
+    codes[present] = mapping[inverse.ravel()]
+    return codes.astype(_code_dtype(len(categories))), categories
+
+
+def _hash_words(words: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    # (행, 8바이트 워드) 행렬 을 행 별 64비트 해시 로
+    hashes = lengths.astype("uint64")
+    for k in range(words.shape[1]):
+        hashes = hashes * np.uint64(0x9E3779B97F4A7C15) + words[:, k]
+        hashes ^= hashes >> np.uint64(29)
+    return hashes
+
+
+def _first_occurrence(inverse: np.ndarray) -> np.ndarray:
+    # 코드 별 첫 등장 위치 (역순 으로 대입 하면 마지막 대입 = 첫 등장)
+    first = np.empty(inverse.max() + 1, dtype="int64")
+    first[inverse[::-1]] = np.arange(len(inverse) - 1, -1, -1)
+    return first
+
+
+def _parse_numbers(data: np.ndarray, starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    숫자 필드 를 float64 로 변환 (numba 가 있으면 10진수 파서, 없으면 고정 폭 바이트 문자열 의 NumPy 캐스팅).
+    그 방식 으로 변환 할 수 없는 값만 float() 로 변환 하고, 변환 불가 는 NaN
+    """
+    if len(starts) == 0:
+        return np.empty(0, dtype="float64")
+
+    if numba is not None:
+        values, parsed = _parse_decimals_jit(data, starts, lengths)
+        for i in np.flatnonzero(~parsed & (lengths > 0)):
+            values[i] = _to_float(bytes(data[starts[i]:starts[i] + lengths[i]]))
+        return values
+
+    width = max(int(lengths.max()), 3)
+    fixed = _gather(data, starts, lengths, width)
+    fixed[lengths == 0, :3] = np.frombuffer(b"nan", dtype=np.uint8)
+    text = fixed.view(f"S{width}").ravel()
+    try:
+        return text.astype("float64")
+    except ValueError:
+        return np.array([_to_float(value) for value in text], dtype="float64")
+
+
+def _to_float(value: bytes) -> float:
+    try:
+        return float(_unquote(value.decode("utf-8", errors="replace")))
+    except ValueError:
+        return np.nan
+
+
+def _round_up(width: int) -> int:
+    # 8바이트 단위 로 올림 (해시 를 uint64 단위 로 계산)
+    return max((width + 7) // 8 * 8, 8)
+
+
+def _concat_categorical(parts: list) -> pd.Categorical:
+    categories = sorted(set().union(*(cats for _, cats in parts)))
+    index = pd.Index(categories)
+    codes = []
+    for block_codes, block_categories in parts:
+        mapping = np.append(index.get_indexer(block_categories), -1).astype(_code_dtype(len(categories)))
+        codes.append(mapping[block_codes])  # 코드 -1 은 mapping 의 마지막 (-1)
+    return pd.Categorical.from_codes(np.concatenate(codes), categories=categories)
+
+
+def _code_dtype(n_categories: int) -> str:
+    # 카테고리 수에 맞는 최소 코드 타입 (pandas Categorical 과 같은 기준, -1 = 결측)
+    for dtype in ("int8", "int16", "int32"):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return "int64"
+
+
+def _unquote(text: str) -> str:
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        return text[1:-1].replace('""', '"')
+    return text
+
+
+def _body_start(buf: np.ndarray) -> int:
+    newlines = np.flatnonzero(buf[:1024 ** 2] == _NEWLINE)
+    return int(newlines[0]) + 1 if len(newlines) else len(buf)
+
+
+def _block_end(buf: np.ndarray, start: int, target: int, end: int) -> int:
+    """
+    target 이전의 마지막 줄바꿈(따옴표 밖) 다음 위치. 뒤에서 부터 작은 구간 씩 찾고,
+    한 줄이 블록 보다 길면 블록 을 늘려서 찾는다
+    """
+    hi = target
+    while hi < end:
+        lo = hi
+        while lo > start:
+            lo, upper = max(lo - _TAIL_BYTES, start), lo
+            for pos in np.flatnonzero(buf[lo:upper] == _NEWLINE)[::-1]:
+                cut = lo + int(pos)
+                if np.count_nonzero(buf[start:cut] == _QUOTE) % 2 == 0:
+                    return cut + 1
+        hi = min(start + 2 * (hi - start), end)
+    return end
+
+
+def _release(mm: mmap.mmap, start: int, end: int) -> None:
+    # 다 읽은 구간 의 페이지 를 프로세스 메모리(RSS) 에서 내린다 (파일 캐시 에는 남음)
+    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+        page_start = start - start % mmap.PAGESIZE
+        mm.madvise(mmap.MADV_DONTNEED, page_start, end - page_start)
+
+
+def _bytes_per_row(path: Union[str, Path]) -> int:
+    with open(path, "rb") as f:
+        sample = f.read(1024 ** 2)
+    return max(len(sample) // max(sample.count(b"\n"), 1), 1)
+
+
+if numba is not None:
+    @numba.njit(cache=True, nogil=True)
+    def _scan_fields_jit(block, n_cols, slots, n_slots):
+        """
+        바이트 를 한 번 순회 하면서 slots 에 지정된 컬럼 의 필드 시작/끝 위치만 기록.
+        반환: (starts, ends, 행 수). 필드 수가 n_cols 가 아닌 줄이 있으면 행 수 -1
+        """
+        n = len(block)
+        max_rows = 1
+        for i in range(n):
+            if block[i] == 10:
+                max_rows += 1
+        starts = np.empty((max_rows, n_slots), dtype=np.int64)
+        ends = np.empty((max_rows, n_slots), dtype=np.int64)
+
+        row = 0
+        col = 0
+        field_start = 0
+        line_start = 0
+        in_quotes = False
+        total = n + 1 if n > 0 and block[n - 1] != 10 else n
+        for i in range(total):
+            c = block[i] if i < n else 10  # 마지막 줄에 줄바꿈 이 없으면 가상의 줄바꿈
+            if c == 34:
+                in_quotes = not in_quotes
+                continue
+            if in_quotes or (c != 44 and c != 10):
+                continue
+
+            if col < n_cols and slots[col] >= 0:
+                end = i
+                if c == 10 and end > field_start and block[end - 1] == 13:
+                    end -= 1
+                starts[row, slots[col]] = field_start
+                ends[row, slots[col]] = end
+            col += 1
+            field_start = i + 1
+
+            if c == 10:
+                if col == n_cols:
+                    row += 1
+                elif not (col == 1 and i - line_start <= 1):  # 빈 줄 (\r\n 포함) 은 건너뛴다
+                    return starts, ends, -1
+                col = 0
+                line_start = i + 1
+        return starts, ends, row
+
+    @numba.njit(cache=True, nogil=True)
+    def _parse_decimals_jit(data, starts, lengths):
+        """
+        [-]digits[.digits] 형태 (15자리 이하) 필드 를 float64 로 변환.
+        15자리 이하 정수 mantissa / 10^k 는 한 번의 반올림 이라 strtod 와 같은 값이 된다.
+        반환: (값, 변환 여부). 빈 값은 NaN, 그 외 형태는 변환 안 됨 (호출 측 에서 float() 로 처리)
+        """
+        n = len(starts)
+        values = np.full(n, np.nan)
+        parsed = np.zeros(n, dtype=np.bool_)
+        for r in range(n):
+            pos = starts[r]
+            end = pos + lengths[r]
+            negative = pos < end and data[pos] == 45
+            if negative:
+                pos += 1
+            mantissa = 0
+            digits = 0
+            frac_digits = 0
+            seen_dot = False
+            ok = pos < end
+            while pos < end:
+                c = data[pos]
+                if 48 <= c <= 57:
+                    mantissa = mantissa * 10 + (c - 48)
+                    digits += 1
+                    if seen_dot:
+                        frac_digits += 1
+                elif c == 46 and not seen_dot:
+                    seen_dot = True
+                else:
+                    ok = False
+                    break
+                pos += 1
+            if ok and 0 < digits <= 15:
+                value = mantissa / 10.0 ** frac_digits
+                values[r] = -value if negative else value
+                parsed[r] = True
+        return values, parsed
+
+    @numba.njit(cache=True, nogil=True)
+    def _hash_fields_jit(data, starts, lengths):
+        # 필드 별 FNV-1a 64비트 해시 (길이 포함)
+        hashes = np.empty(len(starts), dtype=np.uint64)
+        for r in range(len(starts)):
+            h = np.uint64(14695981039346656037)
+            for i in range(starts[r], starts[r] + lengths[r]):
+                h = (h ^ np.uint64(data[i])) * np.uint64(1099511628211)
+            hashes[r] = h ^ np.uint64(lengths[r])
+        return hashes
+
+    @numba.njit(cache=True, nogil=True)
+    def _fields_equal_jit(data, starts, lengths, reference):
+        # 모든 필드 가 reference 행의 필드 와 같은 바이트 인지
+        for r in range(len(starts)):
+            ref = reference[r]
+            if lengths[r] != lengths[ref]:
+                return False
+            for k in range(lengths[r]):
+                if data[starts[r] + k] != data[starts[ref] + k]:
+                    return False
+        return True
+
+
+if __name__ == "__main__":
+    import argparse
+    import resource
+
+    arg_parser = argparse.ArgumentParser(description="Compare the mmap tokenizer with pd.read_csv on a k6 CSV")
+    arg_parser.add_argument("input")
+    arg_parser.add_argument("--engine", choices=parser.CSV_ENGINES, default=None,
+                            help="Run only one engine (run each engine in its own process to compare peak memory)")
+    arg_parser.add_argument("--stream", action="store_true", help="Read in chunks instead of loading the whole file")
+    arg_parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    size = Path(args.input).stat().st_size
+    for engine in [args.engine] if args.engine else parser.CSV_ENGINES:
+        started = time.perf_counter()
+        if args.stream:
+            rows = sum(len(chunk) for chunk in parser.iter_csv_chunks(args.input, args.chunk_size, engine=engine))
+        else:
+            rows = len(parser.load_csv(args.input, engine=engine))
+        elapsed = time.perf_counter() - started
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        print(f"[INFO] {engine:6} rows {rows:,} in {elapsed:.2f}s "
+              f"({size / elapsed / 1024 ** 2:.0f} MiB/s, {rows / elapsed:,.0f} rows/s), peak RSS {peak / 1024 ** 2:,.0f} MiB")
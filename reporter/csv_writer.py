@@ -1,17 +1,42 @@
 from pathlib import Path
 
+import pandas as pd
+
 
 def export_detail_tables_to_csv(output_dir: Path, stem: str, data: dict):
     """
-    detail_table, detail_check_table 을 각각 CSV로 저장
+    detail_table, detail_check_table, 상태 코드 / 에러 분류 (시간 별, URL 별), 차원 별 요약 (breakdown), 큐브 셀 (cube) 을 각각 CSV로 저장
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
     detail_table_file = output_dir / f"{stem}_detail_table.csv"
     detail_check_table_file = output_dir / f"{stem}_detail_check_table.csv"
+    status_errors_file = output_dir / f"{stem}_status_errors.csv"
+    url_errors_file = output_dir / f"{stem}_url_errors.csv"
+    breakdown_file = output_dir / f"{stem}_breakdown.csv"
+    cube_file = output_dir / f"{stem}_cube.csv"
 
     data["detail_table"].to_csv(detail_table_file, index=False, encoding="utf-8-sig")
     data["detail_check_table"].to_csv(detail_check_table_file, index=False, encoding="utf-8-sig")
+    data["chart_error_timeseries"].to_csv(status_errors_file, index=False, encoding="utf-8-sig")
+    data["url_error_table"].to_csv(url_errors_file, index=False, encoding="utf-8-sig")
+    breakdown_frame(data["breakdown_tables"]).to_csv(breakdown_file, index=False, encoding="utf-8-sig")
+    data["cube_table"].to_csv(cube_file, index=False, encoding="utf-8-sig")
 
     print(f"[DONE] 상세 테이블 저장 완료: {detail_table_file}")
     print(f"[DONE] 체크 테이블 저장 완료: {detail_check_table_file}")
+    print(f"[DONE] 상태 코드 / 에러 분류 시계열 저장 완료: {status_errors_file}")
+    print(f"[DONE] URL 별 상태 코드 / 에러 분류 저장 완료: {url_errors_file}")
+    print(f"[DONE] 차원 별 요약 저장 완료: {breakdown_file}")
+    print(f"[DONE] 큐브 저장 완료: {cube_file}")
+
+
+def breakdown_frame(tables: dict) -> pd.DataFrame:
+    """
+    {차원: 요약 표} 를 dimension, value 컬럼 을 가진 하나의 표로 합친다
+    """
+    frames = [table.rename(columns={dim: "value"}).assign(dimension=dim) for dim, table in tables.items()]
+    if not frames:
+        return pd.DataFrame(columns=["dimension", "value"])
+    result = pd.concat(frames, ignore_index=True)
+    return result[["dimension", *result.columns.drop("dimension")]]
@@ -0,0 +1,237 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import utils
+from metric_index import MetricIndex
+from sketch import QuantileSketch, grouped_sketches, RELATIVE_ACCURACY
+
+# 큐브 차원 (k6 태그). url 은 URL 템플릿 단계 를 거친 endpoint
+DIMENSIONS = ("scenario", "group", "method", "status", "expected_response", "url")
+
+# 리포트 / CSV 의 차원 별 요약 표 (url 별 표는 detail_table 이 따로 있다)
+BREAKDOWN_DIMENSIONS = ("scenario", "group", "method", "status", "expected_response")
+
+# 큐브 시간 버킷 (초). 셀 마다 latency 스케치 를 가지므로 차트 (5 ~ 30초) 보다 굵게 잡아서 셀 수를 제한 한다
+CUBE_INTERVAL_SEC = 60
+
+# 태그 값이 없는 행 (k6 의 root group 등) 의 차원 값
+MISSING_VALUE = "-"
+
+LATENCY_COLUMNS = ["avg", "min", "max", "p50", "p90", "p95", "p99"]
+
+
+class MetricCube:
+    """
+    HTTP 요청 을 (차원 값 조합 × 시간 버킷) 셀 로 한 번에 미리 집계 한 큐브
+
+    차원 값 은 차원 별 사전 (값 → 정수 코드) 으로 바꿔서 셀 키 를 정수 튜플 로 유지 하고,
+    셀 마다 요청 수 (http_reqs), 실패 수 (http_req_failed), latency 스케치 (http_req_duration 의 건수 / 합계 / 분위수) 를 누적 한다.
+    slice 로 원본 행을 다시 훑지 않고 원하는 차원 조합 / 조건 / 시간 버킷 별 표를 만들고,
+    설정 이 같은 큐브 끼리는 merge 로 합칠 수 있다 (chunk / shard / 노드). 분위수 는 QuantileSketch 근사값.
+    """
+
+    def __init__(self, dimensions=DIMENSIONS, interval_sec: int = CUBE_INTERVAL_SEC,
+                 relative_accuracy: float = RELATIVE_ACCURACY):
+        self.dimensions = tuple(dimensions)
+        self.interval_sec = interval_sec
+        self.relative_accuracy = relative_accuracy
+        self.values = {dim: [] for dim in self.dimensions}
+        self._codes = {dim: {} for dim in self.dimensions}
+        self.keys = []        # 셀 번호 → (차원 코드 ..., 버킷)
+        self._cells = {}      # (차원 코드 ..., 버킷) → 셀 번호
+        self.requests = np.zeros(0, dtype="int64")
+        self.failures = np.zeros(0, dtype="int64")
+        self.sketches = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def update(self, index: MetricIndex) -> None:
+        """
+        MetricIndex (전체 DataFrame 또는 chunk 하나) 의 http_reqs / http_req_failed / http_req_duration 행을 누적
+        """
+        reqs = index.get("http_reqs")
+        if not reqs.empty:
+            local, cells = self._cell_ids(reqs)
+            self.requests[cells] += np.bincount(local, minlength=len(cells))
+
+        failed = index.get("http_req_failed")
+        if not failed.empty:
+            local, cells = self._cell_ids(failed)
+            is_failed = failed["metric_value"].to_numpy() == 1
+            self.failures[cells] += np.bincount(local[is_failed], minlength=len(cells))
+
+        latency = index.get("http_req_duration")
+        if not latency.empty:
+            local, cells = self._cell_ids(latency)
+            sketches = grouped_sketches(local, latency["metric_value"].to_numpy(), len(cells), self.relative_accuracy)
+            for cell, sketch in zip(cells, sketches):
+                self._merge_sketch(cell, sketch)
+
+    def merge(self, other: "MetricCube") -> None:
+        """
+        다른 큐브 의 셀 을 합산 (차원 사전 은 값 기준 으로 다시 맞춘다)
+        """
+        if (other.dimensions, other.interval_sec, other.relative_accuracy) != \
+                (self.dimensions, self.interval_sec, self.relative_accuracy):
+            raise ValueError("[ERROR] Cannot merge cubes with different dimensions, interval or accuracy")
+
+        lookups = [[self._code(dim, value) for value in other.values[dim]] for dim in self.dimensions]
+        self._add_cells(other, lookups)
+
+    def relabel(self, dim: str, rename) -> "MetricCube":
+        """
+        dim 차원 값 (MISSING_VALUE 제외) 을 rename(값) 으로 바꾼 새 큐브 (같은 값 이 된 셀 은 합산, 이 큐브 는 그대로 둔다)
+        """
+        result = MetricCube(self.dimensions, self.interval_sec, self.relative_accuracy)
+        lookups = [[result._code(d, rename(value) if d == dim and value != MISSING_VALUE else value)
+                    for value in self.values[d]] for d in self.dimensions]
+        result._add_cells(self, lookups, copy=True)
+        return result
+
+    def frame(self) -> pd.DataFrame:
+        """
+        셀 마다 한 행: 차원 값 컬럼, timestamp (버킷 시작 epoch 초), total, fail
+        """
+        n = len(self.keys)
+        keys = np.array(self.keys, dtype="int64").reshape(n, len(self.dimensions) + 1)
+        columns = {dim: np.array(self.values[dim], dtype=object)[keys[:, i]]
+                   for i, dim in enumerate(self.dimensions)}
+        return pd.DataFrame({**columns, "timestamp": keys[:, -1], "total": self.requests[:n], "fail": self.failures[:n]})
+
+    def slice(self, by=(), where: Optional[dict] = None, over_time: bool = False) -> pd.DataFrame:
+        """
+        by 차원 (over_time 이면 시간 버킷 도) 별 total, fail, ratio, avg ~ p99 (ms) DataFrame
+
+        where 는 {차원: 값 또는 값 목록} 조건 (예: {"scenario": "login", "status": ["500", "502"]})
+        """
+        unknown = [dim for dim in [*by, *(where or {})] if dim not in self.dimensions]
+        if unknown:
+            raise ValueError(f"[ERROR] Unknown cube dimension(s): {', '.join(unknown)} "
+                             f"(choose from {', '.join(self.dimensions)})")
+
+        cells = self.frame()
+        mask = np.ones(len(cells), dtype=bool)
+        for dim, wanted in (where or {}).items():
+            mask &= cells[dim].isin([wanted] if isinstance(wanted, str) else list(wanted)).to_numpy()
+        cells = cells[mask]
+        positions = np.flatnonzero(mask)
+
+        keys = [*by, "timestamp"] if over_time else list(by)
+        if keys:
+            groups = cells.groupby(keys, sort=True)
+            result = groups[["total", "fail"]].sum().reset_index()
+            group_codes = groups.ngroup().to_numpy()
+        else:
+            result = pd.DataFrame({"total": [int(cells["total"].sum())], "fail": [int(cells["fail"].sum())]})
+            group_codes = np.zeros(len(cells), dtype="int64")
+
+        merged = [QuantileSketch(self.relative_accuracy) for _ in range(len(result))]
+        for group, position in zip(group_codes, positions):
+            if self.sketches[position] is not None:
+                merged[group].merge(self.sketches[position])
+        stats = pd.DataFrame([sketch.stats() if sketch.count else {} for sketch in merged],
+                             columns=LATENCY_COLUMNS, index=result.index)
+
+        result["ratio"] = utils.format_ratios(result["total"] - result["fail"], result["total"])
+        return pd.concat([result, stats], axis=1)
+
+    def _cell_ids(self, part: pd.DataFrame) -> tuple:
+        # 행 별 chunk 안 셀 번호 (0 ~ k-1) 와, chunk 셀 번호 → 큐브 셀 번호 배열
+        epoch = part["timestamp"].to_numpy().astype("int64")
+        columns = [self._encode(dim, part) for dim in self.dimensions] + [epoch - epoch % self.interval_sec]
+
+        # 컬럼 을 하나씩 붙이면서 factorize (여러 컬럼 조합 을 하나의 작은 정수 코드 로)
+        local = np.zeros(len(part), dtype="int64")
+        for column in columns:
+            codes, uniques = pd.factorize(column)
+            local, _ = pd.factorize(local * len(uniques) + codes)
+
+        _, first = np.unique(local, return_index=True)
+        cells = np.array([self._cell(key) for key in zip(*(column[first].tolist() for column in columns))],
+                         dtype="int64")
+        return local, cells
+
+    def _encode(self, dim: str, part: pd.DataFrame) -> np.ndarray:
+        # 차원 컬럼 → 큐브 사전 코드 (카테고리 값 마다 한 번만 조회, 값 없음 은 MISSING_VALUE)
+        if dim not in part.columns:
+            return np.full(len(part), self._code(dim, None), dtype="int64")
+        column = part[dim]
+        if not isinstance(column.dtype, pd.CategoricalDtype):
+            column = column.astype("category")
+        lookup = [self._code(dim, value) for value in column.cat.categories] + [self._code(dim, None)]
+        return np.asarray(lookup, dtype="int64")[column.cat.codes.to_numpy()]
+
+    def _code(self, dim: str, value) -> int:
+        value = MISSING_VALUE if value is None else str(value)
+        codes = self._codes[dim]
+        if value not in codes:
+            codes[value] = len(self.values[dim])
+            self.values[dim].append(value)
+        return codes[value]
+
+    def _cell(self, key: tuple) -> int:
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = self._cells[key] = len(self.keys)
+            self.keys.append(key)
+            self.sketches.append(None)
+            if cell >= len(self.requests):
+                grow = max(len(self.requests), 64)
+                self.requests = np.concatenate([self.requests, np.zeros(grow, dtype="int64")])
+                self.failures = np.concatenate([self.failures, np.zeros(grow, dtype="int64")])
+        return cell
+
+    def _add_cells(self, other: "MetricCube", lookups: list, copy: bool = False) -> None:
+        # other 의 셀 을 차원 별 코드 변환표 (other 코드 → 이 큐브 코드) 로 옮겨서 합산
+        for i, key in enumerate(other.keys):
+            cell = self._cell(tuple(lookup[code] for lookup, code in zip(lookups, key[:-1])) + (key[-1],))
+            self.requests[cell] += other.requests[i]
+            self.failures[cell] += other.failures[i]
+            if other.sketches[i] is not None:
+                self._merge_sketch(cell, other.sketches[i], copy)
+
+    def _merge_sketch(self, cell: int, sketch: QuantileSketch, copy: bool = False) -> None:
+        if sketch.count == 0:
+            return
+        if self.sketches[cell] is None and copy:
+            self.sketches[cell] = QuantileSketch(self.relative_accuracy)
+        if self.sketches[cell] is None:
+            self.sketches[cell] = sketch
+        else:
+            self.sketches[cell].merge(sketch)
+
+
+def build_cube(index: MetricIndex, relative_accuracy: float = RELATIVE_ACCURACY) -> MetricCube:
+    """
+    전체 행 MetricIndex 로 큐브 생성
+    """
+    cube = MetricCube(relative_accuracy=relative_accuracy)
+    cube.update(index)
+    return cube
+
+
+def breakdown_tables(cube: MetricCube, dimensions=BREAKDOWN_DIMENSIONS) -> dict:
+    """
+    {차원: 차원 값 별 요약 표} (리포트 / CSV 용 표시 형식)
+    """
+    return {dim: format_slice_table(cube.slice([dim])) for dim in dimensions if dim in cube.dimensions}
+
+
+def cube_table(cube: MetricCube) -> pd.DataFrame:
+    """
+    셀 (모든 차원 × 시간 버킷) 별 요약 표. 스프레드시트 등에서 원하는 차원 으로 다시 거를 수 있는 형태
+    """
+    return format_slice_table(cube.slice(cube.dimensions, over_time=True))
+
+
+def format_slice_table(result: pd.DataFrame) -> pd.DataFrame:
+    """
+    slice 결과 의 latency 를 ms 정수 로 반올림 (latency 가 없는 행은 "-")
+    """
+    latency = result[LATENCY_COLUMNS].round(0)
+    result = result.copy()
+    result[LATENCY_COLUMNS] = latency.astype("Int64").astype(object).where(latency.notna(), "-")
+    return result
@@ -1,70 +1,164 @@
 import utils
 import analyzer
+import cube
+import errors
+import run_summary
 import pandas as pd
+from metric_index import MetricIndex
+from percentile import PERCENTILES
+from sketch import QuantileSketch, RELATIVE_ACCURACY
+from report_graph import ReportGraph, ref
+from parser import RowFilter
+from url_template import UrlTemplater
 
-def process_data(df):
+def process_data(df, percentile_engine: str = "exact", relative_accuracy: float = RELATIVE_ACCURACY,
+                 url_templater: UrlTemplater = None, row_filter: RowFilter = None) -> ReportGraph:
     """
     전체 DataFrame(df)을 받아서,
     HTML/CSV 출력을 위해 필요한 데이터 묶음을 dict 형태로 반환.
+    percentile_engine 이 "sketch" 이면 퍼센타일 을 relative_accuracy 오차의 QuantileSketch 로 계산 한다.
+    url_templater 를 주면 집계 전에 url 을 endpoint 템플릿 으로 바꾼다.
+    row_filter (--from / --to) 를 주면 테스트 시간 은 데이터 범위 로 자른 선택 구간 의 길이.
+
+    반환값 은 지연 계산 dict (ReportGraph) 로, 꺼내는 섹션 과 그 의존 섹션 만 계산 한다
+    (예: 콘솔 요약 만 쓰면 시간 버킷 별 퍼센타일 / 롤업 / URL 테이블 은 계산 하지 않는다).
     """
-    # 테스트 시간
-    test_duration = utils.calculate_test_duration(df)
+    percentiles = {"engine": percentile_engine, "relative_accuracy": relative_accuracy}
+    graph = ReportGraph()
+
+    # 집계 대상 행 (URL 템플릿 적용), 테스트 시간, metric_name 별 행 인덱스 (전체 행은 여기서 한 번만 훑는다)
+    if url_templater is not None:
+        graph.add("frame", url_templater.apply, public=False, df=df)
+    else:
+        graph.value("frame", df, public=False)
+    graph.add("test_duration", utils.calculate_test_duration, "frame",
+              window_start=row_filter.start if row_filter else None, window_end=row_filter.end if row_filter else None)
+    graph.add("index", MetricIndex, "frame", public=False)
+    graph.add("interval_sec", utils.determine_interval_seconds, public=False, duration_sec=ref("test_duration", "seconds"))
 
     # HTTP 요청 요약
-    http_reqs = analyzer.calculate_counts_summary(df, 'http_reqs', test_duration["seconds"])
-    http_req_failed = analyzer.calculate_failures_summary(df)
-    vus_min = df[df["metric_name"] == "vus"]["metric_value"].min()
-    vus_max = df[df["metric_name"] == "vus"]["metric_value"].max()
+    graph.add("http_reqs", analyzer.calculate_counts_summary, "index", public=False,
+              metric_name="http_reqs", duration_sec=ref("test_duration", "seconds"))
+    graph.add("http_req_failed", analyzer.calculate_failures_summary, "index", public=False)
+    graph.add("vus_range", vus_range, "index", public=False)
+    graph.add("summary_http_request", build_summary_http_request, "http_reqs", "http_req_failed",
+              vus_min=ref("vus_range", 0), vus_max=ref("vus_range", 1), test_duration=ref("test_duration"))
 
-    summary_http_request = {
-        "total_reqs": http_reqs.get("total", 0),
-        "tps": round(http_req_failed.get("successes", 0) / test_duration["seconds"], 2),
-        "failed_reqs": http_req_failed.get("failures", 0),
-        "success_reqs": http_req_failed.get("successes", 0),
-        "success_rate": http_req_failed.get("success_rate", 0),
-        "vus_min": int(vus_min) if not pd.isna(vus_min) else 0,
-        "vus_max": int(vus_max) if not pd.isna(vus_max) else 0,
-    }
-    summary_http_request = {k: f"{v:,}" if isinstance(v, int) else v for k, v in summary_http_request.items()}
+    # HTTP Request Duration / Iteration Duration 요약 (수치 는 실행 요약 에도 사용)
+    for metric in run_summary.DURATION_METRICS:
+        graph.add(f"{metric}_stats", analyzer.calculate_durations_stats, "index", public=False, metric=metric, **percentiles)
+    graph.add("duration_stats", bundle, public=False,
+              **{metric: ref(f"{metric}_stats") for metric in run_summary.DURATION_METRICS})
+    graph.add("summary_http_req_duration", analyzer.format_durations_summary, "http_req_duration_stats")
+    graph.add("summary_iteration_duration", analyzer.format_durations_summary, "iteration_duration_stats")
+
+    # Network Usage 요약
+    graph.add("summary_network_usage", analyzer.calculate_total_transfer_summary, "index",
+              duration_sec=ref("test_duration", "seconds"))
 
     # HTTP Request Error 요약
-    summary_http_errors = http_req_failed.get("errors", "-")
+    graph.add("summary_http_errors", failure_errors, "http_req_failed")
 
-    # HTTP Request Duration 요약
-    summary_http_req_duration = analyzer.calculate_durations_summary(df, 'http_req_duration')
+    # VU / TPS / HTTP Request Latency 시계열 데이터
+    graph.add("chart_vus_timeseries", analyzer.generate_time_binned_vus_summary, "index", "interval_sec")
+    graph.add("chart_tps_timeseries", analyzer.generate_time_binned_tps, "index", "interval_sec")
+    graph.add("chart_latency_timeseries", analyzer.generate_time_binned_latency_summary, "index", "interval_sec",
+              **percentiles)
 
-    # Iteration Duration 요약
-    summary_iteration_duration = analyzer.calculate_durations_summary(df, 'iteration_duration')
+    # 확대 가능한 차트 용 다중 해상도 롤업 (1초 / 10초 / 1분 / 10분)
+    graph.add("chart_rollups", analyzer.generate_time_rollups, "index", duration_sec=ref("test_duration", "seconds"),
+              **percentiles)
 
-    # Network Usage 요약
-    summary_network_usage = analyzer.calculate_total_transfer_summary(df, test_duration["seconds"])
+    # URL 별 통계 테이블
+    graph.add("latency_detail", analyzer.calculate_latency_detail, "index", public=False, **percentiles)
+    graph.add("detail_table", format_detail_table, "index", "latency_detail")
 
-    # VU 시계열 데이터
-    interval_sec = utils.determine_interval_seconds(test_duration["seconds"])
-    chart_vus_timeseries = analyzer.generate_time_binned_vus_summary(df, interval_sec)
+    # checks 결과 요약
+    graph.add("detail_check_table", analyzer.generate_check_summary, "index")
 
-    # TPS 시계열 데이터
-    chart_tps_timeseries = analyzer.generate_time_binned_tps(df, interval_sec)
+    # 상태 코드 × 에러 분류 교차표 (시간 버킷 별 / URL 별)
+    graph.add("error_crosstab", errors.build_error_crosstab, "index", "interval_sec", public=False)
+    graph.add("chart_error_timeseries", errors.status_error_timeseries, "error_crosstab", "interval_sec")
+    graph.add("url_error_table", errors.url_error_table, "error_crosstab")
 
-    # HTTP Request Latency 시계열 데이터
-    chart_latency_timeseries = analyzer.generate_time_binned_latency_summary(df, interval_sec)
+    # scenario / group / method / status / expected_response / url × 시간 버킷 큐브 와 차원 별 요약 표
+    graph.add("cube", cube.build_cube, "index", public=False, relative_accuracy=relative_accuracy)
+    graph.add("breakdown_tables", cube.breakdown_tables, "cube")
+    graph.add("cube_table", cube.cube_table, "cube")
 
-    # URL 별 통계 테이블
-    detail_latency_table = analyzer.generate_latency_detail_summary(df)
+    # compare / 이력 저장 용 수치 요약
+    graph.add("run_summary", build_run_summary, "index", "test_duration", "http_reqs", "http_req_failed",
+              vus_min=ref("vus_range", 0), vus_max=ref("vus_range", 1), duration_stats=ref("duration_stats"),
+              latency_detail=ref("latency_detail"), relative_accuracy=relative_accuracy,
+              charts=ref("chart_series"))
+    graph.add("chart_series", bundle, public=False, vus=ref("chart_vus_timeseries"), tps=ref("chart_tps_timeseries"),
+              latency=ref("chart_latency_timeseries"))
+    return graph
 
-    # checks 결과 요약
-    detail_check_table = analyzer.generate_check_summary(df)
-
-    return {
-        "test_duration": test_duration,
-        "summary_http_request": summary_http_request,
-        "summary_http_req_duration": summary_http_req_duration,
-        "summary_iteration_duration": summary_iteration_duration,
-        "summary_network_usage": summary_network_usage,
-        "summary_http_errors": summary_http_errors,
-        "chart_vus_timeseries": chart_vus_timeseries,
-        "chart_tps_timeseries": chart_tps_timeseries,
-        "chart_latency_timeseries": chart_latency_timeseries,
-        "detail_table": detail_latency_table,
-        "detail_check_table": detail_check_table
+
+def vus_range(index: MetricIndex) -> tuple:
+    vus = index.get("vus")["metric_value"]
+    return vus.min(), vus.max()
+
+
+def failure_errors(http_req_failed: dict):
+    return http_req_failed.get("errors", "-")
+
+
+def format_detail_table(index: MetricIndex, latency_detail: pd.DataFrame) -> pd.DataFrame:
+    return analyzer.format_latency_detail_table(latency_detail.copy()) if not index.empty else latency_detail
+
+
+def bundle(**sections) -> dict:
+    return sections
+
+
+def build_run_summary(index: MetricIndex, test_duration: dict, http_reqs: dict, http_req_failed: dict, vus_min, vus_max,
+                      duration_stats: dict, latency_detail: pd.DataFrame, relative_accuracy: float,
+                      charts: dict) -> dict:
+    """
+    compare / 이력 저장 용 수치 요약 (run_summary.build). 스케치 는 percentile_engine 과 관계 없이 relative_accuracy 로 생성
+    """
+    durations = {}
+    for metric, stats in duration_stats.items():
+        sketch = QuantileSketch(relative_accuracy)
+        sketch.add(index.get(metric)["metric_value"].to_numpy())
+        durations[metric] = (stats, sketch)
+
+    url_sketches = analyzer.build_latency_sketches(index.get("http_req_duration"), "url", relative_accuracy)
+    urls = {}
+    for row in latency_detail.to_dict("records"):
+        stats = {k: row[k] for k in ("avg", "min", "max", *(f"p{q}" for q in PERCENTILES)) if k in row}
+        fail = row.get("fail")
+        urls[row["url"]] = (row["total"], 0 if pd.isna(fail) else fail, stats, url_sketches.get(row["url"]))
+
+    checks_df = index.get("checks")
+    checks = {}
+    if not checks_df.empty:
+        grouped = checks_df["metric_value"].astype("float64").groupby(checks_df["check"], observed=True)
+        totals, successes = grouped.count(), grouped.sum()
+        checks = {check: (totals[check], successes[check]) for check in totals.index}
+
+    requests = run_summary.request_totals(
+        http_reqs.get("total", 0), http_req_failed.get("failures", 0), http_req_failed.get("successes", 0),
+        http_req_failed.get("success_rate", 0.0), vus_min, vus_max, test_duration["seconds"],
+    )
+    transfer = {metric: index.get(metric)["metric_value"].astype("float64").sum() for metric in ("data_received", "data_sent")}
+    return run_summary.build(test_duration, requests, durations, transfer, urls, checks, relative_accuracy, charts)
+
+
+def build_summary_http_request(http_reqs: dict, http_req_failed: dict, vus_min, vus_max, test_duration: dict) -> dict:
+    """
+    HTTP 요청 요약 카드 데이터 생성 (process_data 와 streaming 집계가 공유)
+    """
+    seconds = test_duration["seconds"]
+    summary_http_request = {
+        "total_reqs": http_reqs.get("total", 0),
+        "tps": round(http_req_failed.get("successes", 0) / seconds, 2) if seconds else 0.0,
+        "failed_reqs": http_req_failed.get("failures", 0),
+        "success_reqs": http_req_failed.get("successes", 0),
+        "success_rate": http_req_failed.get("success_rate", 0),
+        "vus_min": int(vus_min) if not pd.isna(vus_min) else 0,
+        "vus_max": int(vus_max) if not pd.isna(vus_max) else 0,
     }
+    return {k: f"{v:,}" if isinstance(v, int) else v for k, v in summary_http_request.items()}
@@ -0,0 +1,264 @@
+import re
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import utils
+
+# 에러 문자열 이 아래 정규식 에 맞으면 해당 분류 로 묶는다 (위에서 부터 처음 맞는 규칙)
+ERROR_CLASS_RULES = (
+    (re.compile(r"timeout|timed out|deadline exceeded", re.IGNORECASE), "timeout"),
+    (re.compile(r"connection refused", re.IGNORECASE), "connection refused"),
+    (re.compile(r"connection reset|broken pipe", re.IGNORECASE), "connection reset"),
+    (re.compile(r"no such host|server misbehaving|\blookup\b", re.IGNORECASE), "dns"),
+    (re.compile(r"tls|x509|certificate", re.IGNORECASE), "tls"),
+    (re.compile(r"\bEOF\b"), "eof"),
+)
+
+# 규칙 에 맞지 않는 에러 는 가변 부분 (URL, IP:port, id, 숫자) 을 placeholder 로 바꾸고 길이 를 잘라서 분류 이름 으로 쓴다
+_VARIABLE_PARTS = (
+    (re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*://\S+"), "{url}"),
+    (re.compile(r"\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?"), "{ip}"),
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "{uuid}"),
+    (re.compile(r"\d+"), "{n}"),
+    (re.compile(r"\s+"), " "),
+)
+MAX_CLASS_LENGTH = 80
+
+# 분류 가 이 개수 를 넘으면 요청 수 가 적은 나머지 는 OTHER_ERROR_CLASS 하나로 묶는다
+DEFAULT_MAX_ERROR_CLASSES = 20
+OTHER_ERROR_CLASS = "(other)"
+
+# 에러 가 없는 요청 의 분류 / 상태 코드 가 없는 행 의 상태 값
+NO_ERROR = "-"
+
+# 스택 차트 에 따로 그리는 최대 (상태 코드, 에러 분류) 조합 수 (나머지 는 OTHER_ERROR_CLASS)
+MAX_CHART_SERIES = 8
+
+# chunk 별 교차표 가 이만큼 쌓이면 하나로 합친다
+_COMPACT_EVERY = 32
+
+_TIMELINE_KEYS = ["timestamp", "status", "error_class"]
+_URL_KEYS = ["url", "status", "error_class"]
+
+
+class ErrorClassifier:
+    """
+    에러 문자열 을 개수가 제한된 분류 이름 으로 바꾸는 규칙
+
+    ERROR_CLASS_RULES 에 맞으면 그 분류, 아니면 가변 부분 을 placeholder 로 바꾼 문자열.
+    서로 다른 분류 가 max_classes 를 넘으면 요청 수 가 많은 순 (같으면 이름 순) 으로 max_classes 개만 남기고
+    나머지 는 OTHER_ERROR_CLASS 로 묶는다 (limit). 전체 건수 로 고르므로 행 / chunk / shard 순서 와 무관 하다.
+    apply 는 행이 아니라 error 카테고리 값 마다 한 번만 규칙 을 적용 한다 (max_classes 적용 전 분류).
+    """
+
+    def __init__(self, max_classes: Optional[int] = DEFAULT_MAX_ERROR_CLASSES):
+        self.max_classes = max_classes
+        self._cache = {}
+
+    def classify(self, error) -> str:
+        if error is None:
+            return NO_ERROR
+        if error not in self._cache:
+            self._cache[error] = _rule_class(error)
+        return self._cache[error]
+
+    def limit(self, counts: dict) -> Optional[set]:
+        """
+        분류 별 요청 수 로 남길 분류 집합 (NO_ERROR 제외 분류 가 max_classes 이하 면 None = 모두 남김)
+        """
+        ranked = sorted((name for name, count in counts.items() if name != NO_ERROR and count > 0),
+                        key=lambda name: (-counts[name], name))
+        if self.max_classes is None or len(ranked) <= self.max_classes:
+            return None
+        return set(ranked[:self.max_classes])
+
+    def apply(self, errors: pd.Series) -> pd.Categorical:
+        """
+        error 컬럼 → 에러 분류 카테고리 (값 없음 은 NO_ERROR)
+        """
+        errors = errors if isinstance(errors.dtype, pd.CategoricalDtype) else errors.astype("category")
+        names = [self.classify(error) for error in errors.cat.categories] + [NO_ERROR]
+        categories = sorted(set(names))
+        position = {name: i for i, name in enumerate(categories)}
+        lookup = np.array([position[name] for name in names], dtype="int32")
+        return pd.Categorical.from_codes(lookup[errors.cat.codes.to_numpy()], categories=categories)
+
+
+class ErrorCrosstab:
+    """
+    http_req_failed 행 (요청 마다 한 행, status / error 태그 포함) 으로 누적 하는 상태 코드 × 에러 분류 교차표
+
+    - 시간 버킷 별: (timestamp, status, error_class) → total (요청 수), fail (실패 수)
+    - URL 별: (url, status, error_class) → total, fail
+    chunk 마다 카테고리 코드 로 groupby 한 작은 표 만 남기고 (행 단위 파이썬 루프 없음), 결과 를 꺼낼 때 합친다.
+    누적 은 max_classes 적용 전 분류 로 하고, 꺼낼 때 전체 요청 수 로 분류 수 를 제한 하므로 merge 순서 와 무관 하다.
+    """
+
+    def __init__(self, interval_sec: int = 1, classifier: Optional[ErrorClassifier] = None):
+        self.interval_sec = interval_sec
+        self.classifier = classifier or ErrorClassifier()
+        self._timeline = []
+        self._urls = []
+
+    def update(self, failed: pd.DataFrame) -> None:
+        """
+        http_req_failed 행 을 누적
+        """
+        if failed.empty:
+            return
+        epoch = failed["timestamp"].to_numpy()
+        frame = pd.DataFrame({
+            "timestamp": epoch - epoch % self.interval_sec,
+            "url": _as_category(failed["url"]).array if "url" in failed.columns else NO_ERROR,
+            "status": _as_category(failed["status"]).array if "status" in failed.columns else NO_ERROR,
+            "error_class": self.classifier.apply(failed["error"]) if "error" in failed.columns else NO_ERROR,
+            "fail": (failed["metric_value"].to_numpy() == 1).astype("int64"),
+        })
+        self._timeline.append(_count(frame, _TIMELINE_KEYS))
+        self._urls.append(_count(frame, _URL_KEYS))
+        if len(self._timeline) >= _COMPACT_EVERY:
+            self._compact()
+
+    def merge(self, other: "ErrorCrosstab") -> None:
+        if other.interval_sec != self.interval_sec:
+            raise ValueError(f"[ERROR] Cannot merge error crosstabs with different intervals: "
+                             f"{self.interval_sec} != {other.interval_sec}")
+        self._timeline.extend(other._timeline)
+        self._urls.extend(other._urls)
+        self._compact()
+
+    def timeline(self, interval_sec: Optional[int] = None) -> pd.DataFrame:
+        """
+        timestamp (interval_sec 버킷 시작 epoch 초), status, error_class 별 total, fail (시간 순)
+        """
+        self._compact()
+        counts = self._fold_classes(self._timeline[0])
+        if interval_sec and interval_sec != self.interval_sec:
+            counts["timestamp"] -= counts["timestamp"] % interval_sec
+        return _combine([counts], _TIMELINE_KEYS)
+
+    def by_url(self) -> pd.DataFrame:
+        """
+        url, status, error_class 별 total, fail
+        """
+        self._compact()
+        return _combine([self._fold_classes(self._urls[0])], _URL_KEYS)
+
+    def relabel_urls(self, rename) -> "ErrorCrosstab":
+        """
+        url (값 없음 제외) 을 rename(url) 로 바꾼 새 교차표 (URL 별 표만 다시 합산, 이 교차표 는 그대로 둔다)
+        """
+        result = ErrorCrosstab(self.interval_sec, self.classifier)
+        result._timeline = list(self._timeline)
+        urls = _combine(self._urls, _URL_KEYS)
+        result._urls = [urls.assign(url=[url if url == NO_ERROR else rename(url) for url in urls["url"]])]
+        return result
+
+    def _compact(self) -> None:
+        self._timeline = [_combine(self._timeline, _TIMELINE_KEYS)]
+        self._urls = [_combine(self._urls, _URL_KEYS)]
+
+    def _fold_classes(self, counts: pd.DataFrame) -> pd.DataFrame:
+        # 전체 요청 수 (시간 버킷 표 합계) 로 고른 분류 외에는 OTHER_ERROR_CLASS 로 바꾼 사본
+        totals = self._timeline[0].groupby("error_class")["total"].sum()
+        kept = self.classifier.limit(totals.to_dict())
+        if kept is None:
+            return counts.copy()
+        keep = counts["error_class"].isin(kept) | (counts["error_class"] == NO_ERROR)
+        return counts.assign(error_class=counts["error_class"].where(keep, OTHER_ERROR_CLASS))
+
+
+def build_error_crosstab(index, interval_sec: int) -> ErrorCrosstab:
+    """
+    전체 행 MetricIndex 의 http_req_failed 행 으로 교차표 생성
+    """
+    crosstab = ErrorCrosstab(interval_sec)
+    crosstab.update(index.get("http_req_failed"))
+    return crosstab
+
+
+def status_error_timeseries(crosstab: ErrorCrosstab, interval_sec: int) -> pd.DataFrame:
+    """
+    시간 버킷 별 상태 코드 / 에러 분류 건수 (CSV 와 스택 차트 용)
+    """
+    return crosstab.timeline(interval_sec)
+
+
+def url_error_table(crosstab: ErrorCrosstab) -> pd.DataFrame:
+    """
+    URL 별 (상태 코드 + 에러 분류) 요청 수 교차표. url, total, fail, ratio, 조합 별 건수 컬럼
+    """
+    counts = crosstab.by_url()
+    if counts.empty:
+        return pd.DataFrame(columns=["url", "total", "fail", "ratio"])
+
+    counts["label"] = series_labels(counts)
+    table = counts.pivot_table(index="url", columns="label", values="total", aggfunc="sum", fill_value=0)
+    table.columns.name = None
+    totals = counts.groupby("url")[["total", "fail"]].sum()
+    result = totals.assign(ratio=utils.format_ratios(totals["total"] - totals["fail"], totals["total"]))
+    return result.join(table).reset_index()
+
+
+def error_chart_series(timeline: pd.DataFrame, max_series: int = MAX_CHART_SERIES) -> pd.DataFrame:
+    """
+    실패 요청 을 (상태 코드 + 에러 분류) 조합 별 컬럼 으로 펼친 시계열 (timestamp, 조합 ...). 실패 가 많은 조합 순,
+    조합 이 max_series 를 넘으면 나머지 는 OTHER_ERROR_CLASS 컬럼 으로 합친다
+    """
+    failed = timeline[timeline["fail"] > 0]
+    if failed.empty:
+        return pd.DataFrame(columns=["timestamp"])
+
+    labels = series_labels(failed)
+    ranking = failed["fail"].groupby(labels).sum().sort_values(ascending=False, kind="stable")
+    kept = ranking.index[:max_series - 1] if len(ranking) > max_series else ranking.index
+    labels = labels.where(labels.isin(kept), OTHER_ERROR_CLASS)
+    wide = failed.assign(label=labels).pivot_table(index="timestamp", columns="label", values="fail", aggfunc="sum",
+                                                   fill_value=0)
+
+    columns = [label for label in kept if label in wide.columns]
+    if OTHER_ERROR_CLASS in wide.columns and OTHER_ERROR_CLASS not in columns:
+        columns.append(OTHER_ERROR_CLASS)
+    buckets = np.sort(timeline["timestamp"].unique())
+    wide = wide[columns].reindex(buckets, fill_value=0).rename_axis("timestamp").reset_index()
+    wide.columns.name = None
+    return wide
+
+
+def series_labels(counts: pd.DataFrame) -> pd.Series:
+    # "503", "503 timeout", "0 connection refused" (에러 가 없으면 상태 코드 만)
+    status = counts["status"].astype(str)
+    error_class = counts["error_class"].astype(str)
+    return status.where(error_class == NO_ERROR, status + " " + error_class)
+
+
+def _rule_class(error: str) -> str:
+    for pattern, name in ERROR_CLASS_RULES:
+        if pattern.search(error):
+            return name
+    for pattern, replacement in _VARIABLE_PARTS:
+        error = pattern.sub(replacement, error)
+    return error.strip()[:MAX_CLASS_LENGTH]
+
+
+def _as_category(column: pd.Series) -> pd.Series:
+    return column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype("category")
+
+
+def _count(frame: pd.DataFrame, keys: list) -> pd.DataFrame:
+    # 카테고리 코드 기준 groupby (관측된 조합 만) → keys, total, fail
+    counts = frame.groupby(keys, observed=True, dropna=False)["fail"].agg(total="size", fail="sum")
+    return counts.reset_index()
+
+
+def _combine(parts: list, keys: list) -> pd.DataFrame:
+    # chunk 별 카테고리 가 달라서 문자열 로 맞춘 뒤 합산 (값 없음 은 NO_ERROR)
+    if not parts:
+        return pd.DataFrame(columns=[*keys, "total", "fail"])
+    frame = pd.concat(parts, ignore_index=True)
+    for key in keys:
+        if key != "timestamp":
+            frame[key] = frame[key].astype(object).where(frame[key].notna(), NO_ERROR).astype(str)
+    return frame.groupby(keys, sort=True)[["total", "fail"]].sum().reset_index()
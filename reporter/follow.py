@@ -0,0 +1,166 @@
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import csv_writer
+import html_writer
+import parser
+import run_summary
+import utils
+from sketch import RELATIVE_ACCURACY
+from streaming import StreamingAggregator
+from url_template import UrlTemplater
+
+# 한 번에 읽는 최대 바이트 (밀린 데이터가 많아도 이 단위로 나눠서 집계)
+READ_BLOCK_BYTES = 64 * 1024 ** 2
+
+# 저장 상태 포맷 버전 (StreamingAggregator 누적 방식 이 바뀌면 올린다. 다른 버전 의 상태는 무시)
+STATE_VERSION = 7
+
+# 저장 상태 가 같은 실행 의 파일 인지 확인 할 때 비교 하는 파일 앞부분 바이트 (헤더 + 첫 행들, 첫 timestamp 포함)
+FINGERPRINT_BYTES = 4096
+
+
+class CsvTail:
+    """
+    k6 가 쓰고 있는 CSV 를 마지막 으로 읽은 바이트 위치(offset) 부터 이어서 읽는 reader
+
+    끝이 줄바꿈 으로 끝나지 않은 마지막 줄(쓰는 중인 행)은 다음 읽기로 미룬다.
+    """
+
+    def __init__(self, path: Union[str, Path], row_filter: Optional[parser.RowFilter] = None):
+        self.path = Path(path)
+        self.row_filter = row_filter
+        self.names = None
+        self.offset = 0
+
+    def read_new(self) -> list:
+        """
+        새로 추가된 완전한 줄 들을 정제된 DataFrame 목록 으로 반환 (없으면 빈 목록)
+        """
+        if not self.path.exists():
+            return []
+
+        size = self.path.stat().st_size
+        if size < self.offset:
+            raise ValueError(f"[ERROR] {self.path} was truncated ({size:,} < offset {self.offset:,})")
+
+        chunks = []
+        with self.path.open("rb") as f:
+            if self.names is None:
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    return []
+                self.names = parser.read_header(self.path)
+                self.offset = f.tell()
+
+            while self.offset < size:
+                f.seek(self.offset)
+                block = f.read(min(READ_BLOCK_BYTES, size - self.offset))
+                complete = block[:block.rfind(b"\n") + 1]
+                if not complete:
+                    break
+                self.offset += len(complete)
+                chunks.append(parser.parse_csv_block(complete, self.names, self.row_filter))
+        return chunks
+
+
+def follow_csv(input_path: Union[str, Path], output_dir: Path, refresh_sec: int = 10, idle_timeout: Optional[int] = None,
+               timezone: str = utils.DEFAULT_TIMEZONE, relative_accuracy: float = RELATIVE_ACCURACY,
+               row_filter: Optional[parser.RowFilter] = None, url_templater: Optional[UrlTemplater] = None):
+    """
+    CSV 를 따라가면서 refresh_sec 마다 새 행만 집계 에 반영 하고 HTML 리포트 를 다시 만든다.
+
+    - 집계 상태와 offset 은 <stem>_live.state 에 저장 해 두고, 다시 실행 하면 이어서 읽는다
+      (같은 실행 의 파일 (inode, 앞부분 내용) 이고 row_filter / url_templater / relative_accuracy 가 같을 때만).
+    - Ctrl+C 또는 idle_timeout 초 동안 파일이 늘지 않으면 종료 하고 최종 리포트/CSV 를 저장 한다.
+    """
+    input_file = Path(input_path)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = input_file.stem
+    html_output = output_dir / f"{stem}_live.html"
+    state_file = output_dir / f"{stem}_live.state"
+
+    tail, aggregator = _load_state(state_file, input_file, relative_accuracy, row_filter, url_templater)
+    print(f"[INFO] Following {input_file} from byte {tail.offset:,} (refresh every {refresh_sec}s, Ctrl+C to stop)")
+
+    last_growth = time.monotonic()
+    try:
+        while True:
+            started = time.perf_counter()
+            new_rows = 0
+            for chunk in tail.read_new():
+                aggregator.update(chunk)
+                new_rows += len(chunk)
+
+            if new_rows:
+                last_growth = time.monotonic()
+                processed = aggregator.result(row_filter)
+                html_writer.generate_report(html_output, processed, timezone, refresh_sec=refresh_sec)
+                _save_state(state_file, tail, aggregator)
+                _print_status(processed, aggregator.rows, new_rows, time.perf_counter() - started)
+            elif idle_timeout is not None and time.monotonic() - last_growth > idle_timeout:
+                print(f"[INFO] No new rows for {idle_timeout}s, stopping")
+                break
+
+            time.sleep(refresh_sec)
+    except KeyboardInterrupt:
+        print("\n[INFO] Stopped following")
+
+    if aggregator.rows == 0:
+        print("[WARN] No rows were read")
+        return None
+
+    processed = aggregator.result(row_filter)
+    html_writer.generate_report(html_output, processed, timezone)
+    csv_writer.export_detail_tables_to_csv(output_dir, f"{stem}_live", processed)
+    run_summary.save(run_summary.summary_path(html_output), processed["run_summary"])
+    _save_state(state_file, tail, aggregator)
+    return html_output, processed
+
+
+def _print_status(processed: dict, total_rows: int, new_rows: int, elapsed: float) -> None:
+    summary = processed["summary_http_request"]
+    duration = processed["summary_http_req_duration"]
+    print(
+        f"[LIVE] {time.strftime('%H:%M:%S')} rows {total_rows:,} (+{new_rows:,} in {elapsed:.2f}s) | "
+        f"reqs {summary['total_reqs']} | tps {summary['tps']} | fail {summary['failed_reqs']} | "
+        f"p95 {duration.get('p95', '-')} | vus {summary['vus_max']}"
+    )
+
+
+def _load_state(state_file: Path, input_file: Path, relative_accuracy: float, row_filter: Optional[parser.RowFilter],
+                url_templater: Optional[UrlTemplater]):
+    if state_file.exists():
+        with state_file.open("rb") as f:
+            state = pickle.load(f)
+        tail = state["tail"]
+        if (state.get("version") == STATE_VERSION and tail.path.resolve() == input_file.resolve()
+                and input_file.stat().st_size >= tail.offset
+                and state["fingerprint"] == _fingerprint(input_file, tail.offset)
+                and tail.row_filter == row_filter
+                and state["aggregator"].url_templater == url_templater
+                and state["aggregator"].relative_accuracy == relative_accuracy):
+            print(f"[INFO] Resuming from saved state: {state_file}")
+            return tail, state["aggregator"]
+        print(f"[WARN] Ignoring saved state for a different file or run, truncated file, different filter/URL templates/"
+              f"sketch accuracy or older format: {state_file}")
+    return CsvTail(input_file, row_filter), StreamingAggregator(relative_accuracy, url_templater)
+
+
+def _save_state(state_file: Path, tail: CsvTail, aggregator: StreamingAggregator) -> None:
+    tmp = state_file.with_suffix(".tmp")
+    with tmp.open("wb") as f:
+        pickle.dump({"version": STATE_VERSION, "tail": tail, "aggregator": aggregator,
+                     "fingerprint": _fingerprint(tail.path, tail.offset)}, f)
+    tmp.replace(state_file)
+
+
+def _fingerprint(path: Path, offset: int) -> tuple:
+    # (inode, 이미 읽은 구간 중 앞 FINGERPRINT_BYTES 의 해시). 같은 경로 에 새 실행 이 쓴 파일 은 첫 행 timestamp 가 달라서 구분 된다
+    with path.open("rb") as f:
+        head = f.read(min(offset, FINGERPRINT_BYTES))
+        return os.fstat(f.fileno()).st_ino, hashlib.sha1(head).hexdigest()
@@ -0,0 +1,340 @@
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+import html_writer
+import run_summary
+import utils
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent / "out" / "history.sqlite"
+
+# 값은 (대상, metric 이름) 별 한 행 (long format) 으로 저장 하고, metric / URL 이름은 정수 id 로 intern 한다.
+#   run_values    : 실행 전체 값 (tps, total_reqs, http_req_duration.p95 ...)
+#   url_values    : URL 별 값 (total, fail, tps, avg ~ p99)
+#   bucket_values : 시간 버킷 별 값 (tps, vus, http_req_duration.p95 ...)
+# 조회 패턴 (특정 URL/metric 의 최근 N 회, 특정 metric 의 시간 구간) 마다 인덱스 를 둬서 수백 회 실행 에서도 ms 단위 로 조회 한다.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      INTEGER PRIMARY KEY,
+    name        TEXT NOT NULL UNIQUE,
+    source      TEXT,
+    started_at  INTEGER NOT NULL,
+    ended_at    INTEGER NOT NULL,
+    seconds     INTEGER NOT NULL,
+    ingested_at INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS urls (
+    url_id INTEGER PRIMARY KEY,
+    url    TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    metric_id INTEGER PRIMARY KEY,
+    metric    TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS run_values (
+    run_id    INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    metric_id INTEGER NOT NULL,
+    value     REAL,
+    PRIMARY KEY (run_id, metric_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS run_values_metric ON run_values (metric_id, run_id);
+
+CREATE TABLE IF NOT EXISTS url_values (
+    run_id    INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    url_id    INTEGER NOT NULL,
+    metric_id INTEGER NOT NULL,
+    value     REAL,
+    PRIMARY KEY (run_id, url_id, metric_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS url_values_url_metric ON url_values (url_id, metric_id, run_id);
+
+CREATE TABLE IF NOT EXISTS bucket_values (
+    run_id    INTEGER NOT NULL REFERENCES runs (run_id) ON DELETE CASCADE,
+    metric_id INTEGER NOT NULL,
+    bucket    INTEGER NOT NULL,
+    value     REAL,
+    PRIMARY KEY (run_id, metric_id, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bucket_values_metric_time ON bucket_values (metric_id, bucket);
+"""
+
+# 차트 시계열 → bucket_values metric 이름
+TIMESERIES_METRICS = {
+    "vus": {"vus": "vus"},
+    "tps": {"tps": "tps"},
+    "latency": {stat: f"http_req_duration.{stat}" for stat in ("avg", "min", "max", "p50", "p90", "p95", "p99")},
+}
+
+
+class HistoryStore:
+    """
+    실행 요약(run_summary) 을 쌓아 두는 로컬 SQLite 저장소
+    """
+
+    def __init__(self, db_path: Union[str, Path] = DEFAULT_DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # batch 의 여러 프로세스 가 동시에 쓰면 잠금 이 풀릴 때 까지 기다린다
+        self.conn = sqlite3.connect(self.db_path, timeout=60)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+        self._ids = {"urls": {}, "metrics": {}}
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def ingest(self, summary: dict, name: str, source: Optional[str] = None, replace: bool = False) -> Optional[int]:
+        """
+        실행 요약 하나를 저장 하고 run_id 반환. 같은 이름의 실행이 이미 있으면 replace=False 일 때 건너뛴다 (None)
+        """
+        existing = self.conn.execute("SELECT run_id FROM runs WHERE name = ?", (name,)).fetchone()
+        if existing and not replace:
+            return None
+
+        try:
+            with self.conn:
+                if existing:
+                    self.conn.execute("DELETE FROM runs WHERE run_id = ?", existing)
+                duration = summary["test_duration"]
+                run_id = self.conn.execute(
+                    "INSERT INTO runs (name, source, started_at, ended_at, seconds, ingested_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (name, source, duration["start"], duration["end"], duration["seconds"], int(time.time())),
+                ).lastrowid
+
+                self.conn.executemany(
+                    "INSERT INTO run_values (run_id, metric_id, value) VALUES (?, ?, ?)",
+                    [(run_id, self._id("metrics", metric), value) for metric, value in run_metrics(summary).items()],
+                )
+                self.conn.executemany(
+                    "INSERT INTO url_values (run_id, url_id, metric_id, value) VALUES (?, ?, ?, ?)",
+                    [
+                        (run_id, self._id("urls", url), self._id("metrics", metric), value)
+                        for url, values in url_metrics(summary).items() for metric, value in values.items()
+                    ],
+                )
+                self.conn.executemany(
+                    "INSERT INTO bucket_values (run_id, metric_id, bucket, value) VALUES (?, ?, ?, ?)",
+                    [
+                        (run_id, self._id("metrics", metric), bucket, value)
+                        for metric, series in bucket_metrics(summary).items() for bucket, value in series
+                    ],
+                )
+        except Exception:
+            # rollback 된 트랜잭션 에서 추가한 url / metric id 가 캐시 에 남지 않게
+            self._ids = {"urls": {}, "metrics": {}}
+            raise
+        return run_id
+
+    def runs(self, last: int = 20) -> pd.DataFrame:
+        return pd.read_sql_query(
+            "SELECT run_id, name, started_at, seconds, source FROM runs ORDER BY started_at DESC LIMIT ?",
+            self.conn, params=(last,),
+        )
+
+    def query(self, metric: str, url: Optional[str] = None, last: int = 50) -> pd.DataFrame:
+        """
+        최근 last 회 실행의 metric 값 (url 을 주면 해당 URL 값). 컬럼: run_id, name, started_at, value (시간 순)
+        """
+        metric_id = self._lookup("metrics", metric)
+        if url is None:
+            sql = """
+                SELECT r.run_id, r.name, r.started_at, v.value
+                FROM run_values v JOIN runs r ON r.run_id = v.run_id
+                WHERE v.metric_id = ?
+                ORDER BY r.started_at DESC LIMIT ?
+            """
+            params = (metric_id, last)
+        else:
+            sql = """
+                SELECT r.run_id, r.name, r.started_at, v.value
+                FROM url_values v JOIN runs r ON r.run_id = v.run_id
+                WHERE v.url_id = ? AND v.metric_id = ?
+                ORDER BY r.started_at DESC LIMIT ?
+            """
+            params = (self.resolve_url(url), metric_id, last)
+        return pd.read_sql_query(sql, self.conn, params=params).iloc[::-1].reset_index(drop=True)
+
+    def query_buckets(self, metric: str, start: Optional[int] = None, end: Optional[int] = None) -> pd.DataFrame:
+        """
+        시간 구간 [start, end) 의 버킷 값 (여러 실행에 걸쳐). 컬럼: run_id, name, bucket, value
+        """
+        return pd.read_sql_query(
+            """
+            SELECT r.run_id, r.name, v.bucket, v.value
+            FROM bucket_values v JOIN runs r ON r.run_id = v.run_id
+            WHERE v.metric_id = ? AND v.bucket >= ? AND v.bucket < ?
+            ORDER BY v.bucket
+            """,
+            self.conn, params=(self._lookup("metrics", metric), start or 0, end or 2 ** 62),
+        )
+
+    def resolve_url(self, url: str) -> int:
+        """
+        URL 이 정확히 일치 하면 그 URL, 아니면 부분 일치 하는 URL 이 하나일 때 그 URL 의 id
+        """
+        row = self.conn.execute("SELECT url_id FROM urls WHERE url = ?", (url,)).fetchone()
+        if row:
+            return row[0]
+        matches = self.conn.execute("SELECT url_id, url FROM urls WHERE instr(url, ?) > 0 ORDER BY url", (url,)).fetchall()
+        if len(matches) == 1:
+            return matches[0][0]
+        if not matches:
+            raise ValueError(f"[ERROR] Unknown URL: {url}")
+        candidates = ", ".join(m[1] for m in matches[:10])
+        raise ValueError(f"[ERROR] Ambiguous URL '{url}' matches {len(matches)} URLs: {candidates}")
+
+    def names(self, table: str) -> list:
+        column = "url" if table == "urls" else "metric"
+        return [row[0] for row in self.conn.execute(f"SELECT {column} FROM {table} ORDER BY {column}")]
+
+    def _lookup(self, table: str, name: str) -> int:
+        column = "url" if table == "urls" else "metric"
+        row = self.conn.execute(f"SELECT {table[:-1]}_id FROM {table} WHERE {column} = ?", (name,)).fetchone()
+        if row is None:
+            raise ValueError(f"[ERROR] Unknown {column}: {name} (available: {', '.join(self.names(table))})")
+        return row[0]
+
+    def _id(self, table: str, name: str) -> int:
+        # 이름 → 정수 id (없으면 추가). 같은 연결 안에서는 메모리 에 캐시
+        cache = self._ids[table]
+        if name not in cache:
+            column = "url" if table == "urls" else "metric"
+            self.conn.execute(f"INSERT OR IGNORE INTO {table} ({column}) VALUES (?)", (name,))
+            cache[name] = self.conn.execute(f"SELECT {table[:-1]}_id FROM {table} WHERE {column} = ?", (name,)).fetchone()[0]
+        return cache[name]
+
+
+def run_metrics(summary: dict) -> dict:
+    """
+    실행 요약 → 실행 전체 값 {metric: value}
+    """
+    requests = summary["requests"]
+    values = {
+        "tps": requests["tps"],
+        "total_reqs": requests["total"],
+        "failed_reqs": requests["failed"],
+        "success_rate": requests["success_rate"],
+        "vus_max": requests["vus_max"],
+        **{metric: value for metric, value in summary["transfer"].items()},
+    }
+    for metric, entry in summary["durations"].items():
+        values.update({f"{metric}.{stat}": value for stat, value in entry["stats"].items()})
+    return values
+
+
+def url_metrics(summary: dict) -> dict:
+    """
+    실행 요약 → URL 별 값 {url: {metric: value}} (tps 는 성공 요청 / 초)
+    """
+    seconds = summary["test_duration"]["seconds"]
+    return {
+        url: {
+            "total": entry["total"],
+            "fail": entry["fail"],
+            "tps": (entry["total"] - entry["fail"]) / seconds if seconds else None,
+            **entry["stats"],
+        }
+        for url, entry in summary["urls"].items()
+    }
+
+
+def bucket_metrics(summary: dict) -> dict:
+    """
+    실행 요약 의 차트 시계열 → {metric: [(bucket, value), ...]}
+    """
+    result = {}
+    for chart, columns in TIMESERIES_METRICS.items():
+        series = summary.get("timeseries", {}).get(chart)
+        if not series:
+            continue
+        for column, metric in columns.items():
+            if column in series:
+                result[metric] = list(zip(series["timestamp"], series[column]))
+    return result
+
+
+def ingest_files(store: HistoryStore, paths: list, replace: bool = False) -> int:
+    """
+    요약 파일(.summary.json) 또는 그 파일들이 있는 디렉터리 목록 을 저장. 새로 저장한 실행 수 반환
+    """
+    files = []
+    for path in map(Path, paths):
+        files += sorted(path.glob("*.summary.json")) if path.is_dir() else [path]
+
+    ingested = 0
+    for file in files:
+        name = file.name.removesuffix(".summary.json")
+        try:
+            run_id = store.ingest(run_summary.load(file), name, str(file), replace)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARN] Skipping {file}: {e}")
+            continue
+        if run_id is None:
+            print(f"[INFO] Already ingested: {name}")
+        else:
+            ingested += 1
+            print(f"[INFO] Ingested {name} (run_id {run_id})")
+    return ingested
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Local history of k6 runs: ingest run summaries, query and plot trends")
+    arg_parser.add_argument("--db", default=str(DEFAULT_DB_PATH), help="SQLite history file")
+    arg_parser.add_argument("--timezone", default=utils.DEFAULT_TIMEZONE)
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = commands.add_parser("ingest", help="Store run summaries (.summary.json files or directories)")
+    ingest_parser.add_argument("paths", nargs="+")
+    ingest_parser.add_argument("--replace", action="store_true", help="Re-ingest runs that are already stored")
+
+    runs_parser = commands.add_parser("runs", help="List stored runs")
+    runs_parser.add_argument("--last", type=int, default=20)
+
+    for command in ("query", "trend"):
+        sub = commands.add_parser(command, help="Print a metric over recent runs" if command == "query"
+                                  else "Write an HTML trend page for a metric over recent runs")
+        sub.add_argument("--metric", required=True,
+                         help="Run metric (tps, http_req_duration.p95, ...) or, with --url, URL metric (p99, tps, ...)")
+        sub.add_argument("--url", default=None, help="URL (exact or a unique substring)")
+        sub.add_argument("--last", type=int, default=50)
+        if command == "trend":
+            sub.add_argument("--output", default=None, help="HTML path (default: out/trend_<metric>.html)")
+    args = arg_parser.parse_args()
+
+    store = HistoryStore(args.db)
+    try:
+        if args.command == "ingest":
+            count = ingest_files(store, args.paths, args.replace)
+            print(f"[DONE] Ingested {count} runs into {args.db}")
+        elif args.command == "runs":
+            runs = store.runs(args.last)
+            runs["started_at"] = utils.format_epoch_labels(runs["started_at"], args.timezone, "%Y-%m-%d %H:%M:%S")
+            print(runs.to_string(index=False))
+        else:
+            started = time.perf_counter()
+            result = store.query(args.metric, args.url, args.last)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            title = f"{args.metric} ({args.url})" if args.url else args.metric
+            if args.command == "query":
+                shown = result.assign(started_at=utils.format_epoch_labels(result["started_at"], args.timezone,
+                                                                           "%Y-%m-%d %H:%M:%S"))
+                print(shown.to_string(index=False, float_format=lambda v: f"{v:,.2f}"))
+            else:
+                safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in title)
+                output = Path(args.output) if args.output else Path(args.db).parent / f"trend_{safe_name}.html"
+                html_writer.generate_trend_report(output, title, result, args.timezone)
+            print(f"[INFO] {title}: {len(result)} runs in {elapsed_ms:.1f}ms")
+    except ValueError as e:
+        print(e)
+        raise SystemExit(1)
+    finally:
+        store.close()
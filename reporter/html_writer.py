@@ -1,5 +1,295 @@
+import base64
+import gzip
+import io
+import json
+
+import numpy as np
 import pandas as pd
-from utils import format_test_duration_title
+
+import errors
+import rollup
+from utils import format_test_duration_title, format_epoch_labels, determine_interval_seconds, DEFAULT_TIMEZONE
+
+# url, check, errors, 큐브 차원 컬럼은 왼쪽 정렬
+LEFT_ALIGNED_COLUMNS = ("url", "check", "errors", "scenario", "group", "method", "status", "expected_response")
+# 행 수가 이보다 많은 상세 테이블 은 가상 스크롤 테이블 로 그린다
+VIRTUAL_TABLE_MIN_ROWS = 2_000
+# 정적 테이블 행 HTML 을 만들어 파일에 쓰는 단위 (행 수)
+TABLE_CHUNK_ROWS = 10_000
+
+# 가상 스크롤 테이블: 보이는 구간 (+ 여유 행) 만 <tr> 로 그리고, 위/아래 는 높이만 가진 빈 행으로 채운다
+# 헤더 클릭 정렬 (숫자 / 문자열), 필터 는 모든 셀 의 포함 문자열 (대소문자 무시)
+VIRTUAL_TABLE_SCRIPT = """
+    window.k6VirtualTable = window.k6VirtualTable || function (id) {
+        const ROW_HEIGHT = 24, OVERSCAN = 20;
+        const root = document.getElementById(id);
+        const table = JSON.parse(document.getElementById(id + '-data').textContent);
+        const columns = table.columns, data = table.data;
+        const left = JSON.parse(root.dataset.left);
+        const ratioCol = columns.indexOf('ratio');
+        const viewport = root.querySelector('.vt-viewport');
+        const tbody = root.querySelector('tbody');
+        const filter = root.querySelector('.vt-filter');
+        const count = root.querySelector('.vt-count');
+        const headRow = root.querySelector('thead tr');
+        let view = data.map((_, i) => i), sortCol = -1, sortDir = 1, text = null;
+
+        const esc = v => v == null ? '-' : String(v).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+        const color = r => {
+            const ratio = ratioCol < 0 ? 100 : parseFloat(r[ratioCol]);
+            return isNaN(ratio) || ratio >= 100 ? 'green' : ratio < 75 ? 'red' : 'orangered';
+        };
+        const compare = (a, b) => {
+            const x = data[a][sortCol], y = data[b][sortCol];
+            const xn = typeof x === 'number', yn = typeof y === 'number';
+            if (xn && yn) return (x - y) * sortDir;
+            if (xn !== yn) return xn ? -1 : 1;
+            return String(x).localeCompare(String(y)) * sortDir;
+        };
+
+        function render() {
+            const first = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+            const last = Math.min(view.length, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_HEIGHT) + OVERSCAN);
+            const parts = ['<tr style="height:' + first * ROW_HEIGHT + 'px"></tr>'];
+            for (let i = first; i < last; i++) {
+                const r = data[view[i]];
+                let cells = '';
+                for (let j = 0; j < r.length; j++) {
+                    cells += '<td class="' + (left[j] ? 'left' : 'right') + '" style="white-space: nowrap;">' + esc(r[j]) + '</td>';
+                }
+                parts.push('<tr style="height:' + ROW_HEIGHT + 'px; color: ' + color(r) + ';">' + cells + '</tr>');
+            }
+            parts.push('<tr style="height:' + (view.length - last) * ROW_HEIGHT + 'px"></tr>');
+            tbody.innerHTML = parts.join('');
+        }
+
+        function update() {
+            const q = filter.value.trim().toLowerCase();
+            if (q && text === null) text = data.map(r => r.join(' ').toLowerCase());
+            view = [];
+            for (let i = 0; i < data.length; i++) {
+                if (!q || text[i].includes(q)) view.push(i);
+            }
+            if (sortCol >= 0) view.sort(compare);
+            count.textContent = view.length.toLocaleString() + ' / ' + data.length.toLocaleString() + ' 행';
+            viewport.scrollTop = 0;
+            render();
+        }
+
+        headRow.innerHTML = columns.map(c => '<th style="cursor: pointer;">' + esc(c) + '</th>').join('');
+        headRow.querySelectorAll('th').forEach((th, j) => th.addEventListener('click', () => {
+            sortDir = sortCol === j ? -sortDir : 1;
+            sortCol = j;
+            update();
+        }));
+        filter.addEventListener('input', update);
+        viewport.addEventListener('scroll', () => window.requestAnimationFrame(render));
+        update();
+    };
+"""
+
+# 차트 데이터: {차트: (컬럼, LTTB 기준 컬럼, 반올림 자릿수)}. 컬럼 이 None 이면 timestamp 외 모든 컬럼
+CHART_SERIES = {
+    "vus": (("vus",), "vus", 0),
+    "tps": (("tps",), "tps", 2),
+    "latency": (("avg", "min", "max", "p50", "p90", "p95", "p99"), "p99", 0),
+    "errors": (None, "total", 0),
+}
+# 상태 코드 / 에러 분류 스택 차트 색상 (조합 순서 대로, 마지막 은 나머지 조합)
+ERROR_SERIES_COLORS = ("#e53935", "#fb8c00", "#fdd835", "#8e24aa", "#3949ab", "#00897b", "#6d4c41", "#546e7a", "#bdbdbd")
+# 차트 데이터 버퍼 를 gzip 으로 압축 하는 최소 크기 (바이트). 브라우저 의 DecompressionStream 으로 해제
+CHART_DATA_GZIP_MIN_BYTES = 16 * 1024
+
+# 확대 가능한 시계열 차트: 보이는 구간 의 점 수가 budget * ratio 이하 인 가장 세밀한 롤업 을 골라서 LTTB 로 budget 개로 줄여 그린다
+# (rollup.select_interval / rollup.lttb_indices 와 같은 규칙). 드래그 로 구간 확대, 더블클릭 으로 전체 보기
+# 데이터 는 generate_chart_data_block 의 공유 버퍼 를 처음 필요할 때 한 번만 디코딩 하고, 차트 는 화면 에 보일 때 그린다
+ZOOM_CHART_SCRIPT = """
+    window.k6Lttb = window.k6Lttb || function (x, y, n) {
+        const len = x.length;
+        if (n >= len || n < 3) return Array.from({length: len}, (_, i) => i);
+        const every = (len - 2) / (n - 2);
+        const edges = [];
+        for (let i = 0; i < n - 1; i++) edges.push(Math.floor(i * every) + 1);
+        edges.push(len);
+        const selected = [0];
+        let a = 0;
+        for (let i = 0; i < n - 2; i++) {
+            const start = edges[i], end = edges[i + 1], nextEnd = edges[i + 2];
+            let cx = 0, cy = 0;
+            for (let j = end; j < nextEnd; j++) {
+                cx += x[j];
+                cy += y[j] || 0;
+            }
+            cx /= nextEnd - end;
+            cy /= nextEnd - end;
+            const ax = x[a], ay = y[a] || 0;
+            let best = start, bestArea = -1;
+            for (let j = start; j < end; j++) {
+                const area = Math.abs((ax - cx) * ((y[j] || 0) - ay) - (ax - x[j]) * (cy - ay));
+                if (area > bestArea) {
+                    bestArea = area;
+                    best = j;
+                }
+            }
+            selected.push(best);
+            a = best;
+        }
+        selected.push(len - 1);
+        return selected;
+    };
+
+    // 공유 버퍼 디코딩: base64 → (gzip 이면 DecompressionStream + byte shuffle 복원) → [offset, length, type] 별 Int32Array / Float32Array
+    window.k6ChartData = window.k6ChartData || (function () {
+        let decoded = null;
+
+        async function decode() {
+            const manifest = JSON.parse(document.getElementById('k6ChartData').textContent);
+            let bytes = Uint8Array.from(atob(document.getElementById('k6ChartBuffer').textContent.trim()), c => c.charCodeAt(0));
+            if (manifest.gzip) {
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+                const shuffled = new Uint8Array(await new Response(stream).arrayBuffer());
+                const n = shuffled.length / 4;
+                bytes = new Uint8Array(shuffled.length);
+                for (let b = 0; b < 4; b++) {
+                    for (let i = 0; i < n; i++) bytes[i * 4 + b] = shuffled[b * n + i];
+                }
+            }
+            const array = ([offset, length, type]) => type === 'f4'
+                ? new Float32Array(bytes.buffer, offset, length) : new Int32Array(bytes.buffer, offset, length);
+
+            const axes = {};
+            for (const [interval, ref] of Object.entries(manifest.axes)) {
+                axes[interval] = Float64Array.from(array(ref), t => manifest.start + t);
+            }
+            const charts = {};
+            for (const [name, chart] of Object.entries(manifest.charts)) {
+                charts[name] = {
+                    primary: chart.primary,
+                    budget: chart.budget,
+                    ratio: chart.ratio,
+                    levels: chart.levels.map(level => ({
+                        interval: level.interval,
+                        x: level.rows ? Float64Array.from(array(level.rows), r => axes[level.interval][r]) : axes[level.interval],
+                        series: Object.fromEntries(Object.entries(level.series).map(([col, ref]) => [col, array(ref)])),
+                    })),
+                    initial: {interval: chart.initial.interval, rows: array(chart.initial.rows)},
+                };
+            }
+            return charts;
+        }
+
+        return () => decoded || (decoded = decode());
+    })();
+
+    window.k6ZoomChart = window.k6ZoomChart || function (canvasId, chartKey, config, timeZone) {
+        const canvas = document.getElementById(canvasId);
+        const render = () => k6ChartData().then(charts => draw(charts[chartKey]));
+        if (!('IntersectionObserver' in window)) {
+            render();
+            return;
+        }
+        const observer = new IntersectionObserver(entries => {
+            if (entries.some(entry => entry.isIntersecting)) {
+                observer.disconnect();
+                render();
+            }
+        }, {rootMargin: '200px'});
+        observer.observe(canvas);
+
+        function draw(payload) {
+            const info = document.getElementById(canvasId + 'Info');
+            const levels = payload.levels, coarsest = levels[levels.length - 1];
+            const full = [Math.min(...levels.map(l => l.x[0])), Math.max(...levels.map(l => l.x[l.x.length - 1]))];
+            const timeFormat = new Intl.DateTimeFormat('ko-KR', {
+                timeZone: timeZone, hourCycle: 'h23', hour: '2-digit', minute: '2-digit', second: '2-digit'
+            });
+            const label = v => timeFormat.format(new Date(v * 1000));
+            const lowerBound = (xs, v) => {
+                let lo = 0, hi = xs.length;
+                while (lo < hi) {
+                    const mid = (lo + hi) >> 1;
+                    if (xs[mid] < v) lo = mid + 1; else hi = mid;
+                }
+                return lo;
+            };
+
+            function describe(interval, shown, total) {
+                info.textContent = '해상도 ' + interval + 's · ' + shown.toLocaleString() + ' / ' + total.toLocaleString()
+                    + ' 점 · 드래그 로 확대, 더블클릭 으로 전체 보기';
+            }
+
+            function fill(level, indices, from) {
+                config.data.datasets.forEach(dataset => {
+                    const ys = level.series[dataset.key];
+                    dataset.data = Array.from(indices, i => ({x: level.x[from + i], y: ys[from + i]}));
+                });
+            }
+
+            function zoom(lo, hi) {
+                let level = coarsest, from = 0, to = coarsest.x.length;
+                for (const l of levels) {
+                    const a = lowerBound(l.x, lo), b = lowerBound(l.x, hi + 1);
+                    if (b - a <= payload.budget * payload.ratio || l === coarsest) {
+                        // 양 끝 바깥 점 하나씩 포함 해서 선이 가장자리 까지 이어지게
+                        level = l;
+                        from = Math.max(0, a - 1);
+                        to = Math.min(l.x.length, b + 1);
+                        break;
+                    }
+                }
+                const indices = k6Lttb(level.x.subarray(from, to), level.series[payload.primary].subarray(from, to), payload.budget);
+                fill(level, indices, from);
+                chart.options.scales.x.min = lo;
+                chart.options.scales.x.max = hi;
+                chart.update('none');
+                describe(level.interval, indices.length, to - from);
+            }
+
+            const initial = levels.find(l => l.interval === payload.initial.interval);
+            fill(initial, payload.initial.rows, 0);
+            config.options.scales.x.min = full[0];
+            config.options.scales.x.max = full[1];
+            config.options.scales.x.ticks = {callback: label, maxRotation: 0};
+            config.options.plugins.tooltip = {callbacks: {
+                title: items => items.length ? label(items[0].parsed.x) : '',
+                label: item => item.dataset.label + ': ' + (Math.round(item.parsed.y * 100) / 100).toLocaleString(),
+            }};
+            const chart = new Chart(canvas.getContext('2d'), config);
+            describe(initial.interval, payload.initial.rows.length, initial.x.length);
+
+            // 드래그 구간 표시
+            const box = document.createElement('div');
+            box.style.cssText = 'position: absolute; display: none; pointer-events: none; background: rgba(30, 136, 229, 0.15);';
+            canvas.parentNode.style.position = 'relative';
+            canvas.parentNode.appendChild(box);
+            let dragStart = null;
+            const offset = e => e.clientX - canvas.getBoundingClientRect().left;
+
+            canvas.addEventListener('mousedown', e => {
+                dragStart = offset(e);
+            });
+            canvas.addEventListener('mousemove', e => {
+                if (dragStart === null) return;
+                const x = offset(e);
+                box.style.display = 'block';
+                box.style.left = canvas.offsetLeft + Math.min(dragStart, x) + 'px';
+                box.style.top = canvas.offsetTop + 'px';
+                box.style.width = Math.abs(x - dragStart) + 'px';
+                box.style.height = canvas.offsetHeight + 'px';
+            });
+            window.addEventListener('mouseup', e => {
+                if (dragStart === null) return;
+                const x0 = Math.min(dragStart, offset(e)), x1 = Math.max(dragStart, offset(e));
+                dragStart = null;
+                box.style.display = 'none';
+                if (x1 - x0 < 5) return;
+                const lo = Math.floor(chart.scales.x.getValueForPixel(x0)), hi = Math.ceil(chart.scales.x.getValueForPixel(x1));
+                if (hi > lo) zoom(Math.max(lo, full[0]), Math.min(hi, full[1]));
+            });
+            canvas.addEventListener('dblclick', () => zoom(full[0], full[1]));
+        }
+    };
+"""
 
 def generate_card(title, data: dict, icon="📊") -> str:
     """
@@ -38,76 +328,147 @@ def generate_error_card(errors_text: str) -> str:
     </div>
     """
 
-def generate_detail_table(df, title="상세 테이블") -> str:
-    if df.empty:
-        return f"<div class='card-full'><div class='card-title'>{title}</div><p>데이터 없음</p></div>"
-
-    headers = ''.join(f"<th>{col}</th>" for col in df.columns)
-    rows = ''
+def generate_detail_table(df, title="상세 테이블", table_id: str = None) -> str:
+    """
+    상세 테이블 HTML 문자열 (write_detail_table 결과)
+    """
+    out = io.StringIO()
+    write_detail_table(out, df, title, table_id)
+    return out.getvalue()
 
-    for _, row in df.iterrows():
-        ratio = float(row.get("ratio", 100))
-        color = "green"
-        if ratio < 75:
-            color = "red"
-        elif ratio < 100:
-            color = "orangered"
 
-        row_html = ''
-        for col in df.columns:
-            # url, check, errors 컬럼은 왼쪽 정렬
-            align_class = "left" if col in ["url", "check", "errors"] else "right"
-            row_html += f'<td class="{align_class}">{row[col]}</td>'
+def write_detail_table(out, df, title="상세 테이블", table_id: str = None) -> None:
+    """
+    상세 테이블 HTML 을 out(텍스트 파일 객체) 에 바로 쓴다
+    - 행 수가 VIRTUAL_TABLE_MIN_ROWS 이하: <tr> 을 컬럼 단위 벡터 연산 으로 만들어 TABLE_CHUNK_ROWS 행씩 기록
+    - 그보다 많으면: 데이터 를 compact JSON 으로 한 번만 담고, 브라우저 에서 보이는 행만 그린다 (가상 스크롤, 정렬, 필터)
+    Args:
+        out: write() 를 가진 텍스트 출력 (파일, StringIO)
+        df: 표시할 DataFrame (ratio 컬럼 이 있으면 행 색상 에 사용)
+        title: 카드 제목
+        table_id: 가상 스크롤 테이블 의 DOM id (한 페이지 에서 유일)
+    """
+    if df.empty:
+        out.write(f"<div class='card-full'><div class='card-title'>{title}</div><p>데이터 없음</p></div>")
+        return
 
-        rows += f'<tr style="color: {color};">{row_html}</tr>'
+    if len(df) > VIRTUAL_TABLE_MIN_ROWS:
+        _write_virtual_table(out, df, title, table_id or f"detailTable{id(df)}")
+        return
 
-    return f"""
+    headers = ''.join(f"<th>{col}</th>" for col in df.columns)
+    out.write(f"""
     <div class="card-full">
         <div class="card-title">{title}</div>
         <table>
             <thead><tr>{headers}</tr></thead>
-            <tbody>{rows}</tbody>
+            <tbody>""")
+    for start in range(0, len(df), TABLE_CHUNK_ROWS):
+        out.write(_table_rows_html(df.iloc[start:start + TABLE_CHUNK_ROWS]))
+    out.write("""</tbody>
         </table>
     </div>
+    """)
+
+
+def write_breakdown_tables(out, tables: dict) -> None:
     """
+    차원 별 요약 표 (scenario / group / method / status / expected_response) 를 out 에 쓴다
+    모든 표를 미리 그려 두고 선택 상자 로 하나씩 보여 준다 (브라우저 에서 다시 집계 하지 않음)
+    """
+    if not tables:
+        return
+    options = ''.join(f'<option value="{dim}">{dim}</option>' for dim in tables)
+    out.write(f"""
+    <div class="card-full">
+        <div class="card-title">🧊 차원 별 요약
+            <select onchange="document.querySelectorAll('.breakdown-table').forEach(el => {{
+                el.style.display = el.dataset.dim === this.value ? 'block' : 'none';
+                const viewport = el.querySelector('.vt-viewport');
+                if (viewport) viewport.dispatchEvent(new Event('scroll'));
+            }})">{options}</select>
+        </div>
+    </div>""")
+    for i, (dim, df) in enumerate(tables.items()):
+        out.write(f'<div class="breakdown-table" data-dim="{dim}" style="display: {"block" if i == 0 else "none"};">')
+        write_detail_table(out, df, title=f"{dim} 별 요청 / 지연 시간", table_id=f"breakdownTable-{dim}")
+        out.write("</div>")
+
+
+def _row_colors(df: pd.DataFrame) -> np.ndarray:
+    # 성공률(ratio) 100% 초록, 75% 이상 주황, 그 미만 빨강
+    if "ratio" not in df.columns:
+        return np.full(len(df), "green", dtype=object)
+    ratio = pd.to_numeric(df["ratio"], errors="coerce").fillna(100).to_numpy()
+    return np.select([ratio < 75, ratio < 100], ["red", "orangered"], "green").astype(object)
 
-def generate_chartjs_vus_chart(df_vus_timeseries: pd.DataFrame) -> str:
+
+def _table_rows_html(df: pd.DataFrame) -> str:
+    # 행 마다 파이썬 루프 를 돌지 않고, 컬럼 단위 로 '<td ...>값</td>' 문자열 을 이어 붙인다
+    rows = '<tr style="color: ' + pd.Series(_row_colors(df), index=df.index) + ';">'
+    for col in df.columns:
+        align_class = "left" if col in LEFT_ALIGNED_COLUMNS else "right"
+        rows = rows + f'<td class="{align_class}">' + df[col].astype(str) + '</td>'
+    return ''.join(rows + '</tr>')
+
+
+def _write_virtual_table(out, df: pd.DataFrame, title: str, table_id: str) -> None:
+    # orient="split" → {"columns": [...], "data": [[...], ...]}, "</" 는 <script> 를 닫지 않도록 이스케이프
+    payload = df.to_json(orient="split", index=False, force_ascii=False).replace("</", "<\\/")
+    left_columns = json.dumps([col in LEFT_ALIGNED_COLUMNS for col in df.columns])
+    out.write(f"""
+    <div class="card-full" id="{table_id}" data-left='{left_columns}'>
+        <div class="card-title">{title}</div>
+        <div style="padding: 0.5rem 0;">
+            <input class="vt-filter" type="search" placeholder="필터 (포함 문자열)" style="width: 30rem; max-width: 100%;">
+            <span class="vt-count"></span>
+        </div>
+        <div class="vt-viewport" style="height: 600px; overflow: auto;">
+            <table style="width: 100%;">
+                <thead style="position: sticky; top: 0; background: #fff;"><tr></tr></thead>
+                <tbody></tbody>
+            </table>
+        </div>
+    </div>
+    <script type="application/json" id="{table_id}-data">""")
+    out.write(payload)
+    out.write(f"""</script>
+    <script>{VIRTUAL_TABLE_SCRIPT}
+    k6VirtualTable('{table_id}');
+    </script>
+    """)
+
+
+def generate_chartjs_vus_chart(vus_rollups: dict, timezone: str = DEFAULT_TIMEZONE) -> str:
     """
     Chart.js를 이용 해서 VU(Virtual Users) 시계열 그래프 HTML 코드 생성
     Args:
-        df_vus_timeseries: 'timestamp', 'vus' 컬럼을 가진 DataFrame
+        vus_rollups: {롤업 간격(초): 'timestamp'(epoch 초), 'vus' 컬럼을 가진 DataFrame}
+        timezone: 시간축 라벨 시간대
     Returns:
-        VU 시계열 Chart.js HTML 코드
+        VU 시계열 Chart.js HTML 코드 (데이터 는 generate_chart_data_block 의 "vus")
     """
-    if df_vus_timeseries.empty:
+    if not _has_rollups(vus_rollups):
         return "<p>VU 데이터가 없습니다.</p>"
 
-    labels = df_vus_timeseries["timestamp"].dt.strftime("%H:%M:%S").tolist()
-    vus_data = df_vus_timeseries["vus"].astype(int).tolist()
+    datasets = _zoom_chart_datasets({"vus": ("VUs", "rgba(255, 159, 64, 0.8)", "rgba(255, 159, 64, 0.2)")})
 
     chart_js = f"""
     <div class="card-full">
         <div class="card-title">👥 가상 사용자(VU) 시계열</div>
         <canvas id="vusChart" height="60"></canvas>
+        <div id="vusChartInfo" style="text-align: right; font-size: 0.8rem; color: #666;"></div>
     </div>
     <script>
-    const vusCtx = document.getElementById('vusChart').getContext('2d');
-    new Chart(vusCtx, {{
+    k6ZoomChart('vusChart', 'vus', {{
         type: 'line',
         data: {{
-            labels: {labels},
-            datasets: [{{
-                label: 'VUs',
-                data: {vus_data},
-                borderColor: 'rgba(255, 159, 64, 0.8)',
-                backgroundColor: 'rgba(255, 159, 64, 0.2)',
-                fill: false,
-                tension: 0.1,
-                pointRadius: 2
-            }}]
+            datasets: [{datasets}]
         }},
         options: {{
             responsive: true,
+            animation: false,
+            parsing: false,
             plugins: {{
                 title: {{
                     display: true,
@@ -119,6 +480,7 @@ def generate_chartjs_vus_chart(df_vus_timeseries: pd.DataFrame) -> str:
             }},
             scales: {{
                 x: {{
+                    type: 'linear',
                     title: {{
                         display: true,
                         text: '시간'
@@ -136,46 +498,38 @@ def generate_chartjs_vus_chart(df_vus_timeseries: pd.DataFrame) -> str:
                 }}
             }}
         }}
-    }});
+    }}, '{timezone}');
     </script>
     """
 
     return chart_js
 
 
-def generate_chartjs_tps_chart(df_tps_timeseries: pd.DataFrame) -> str:
+def generate_chartjs_tps_chart(tps_rollups: dict, timezone: str = DEFAULT_TIMEZONE) -> str:
     """
-    Chart.js를 이용한 TPS 시계열 그래프 생성
+    Chart.js를 이용한 TPS 시계열 그래프 생성 (tps_rollups: {롤업 간격(초): 'timestamp', 'tps' DataFrame})
     """
-    if df_tps_timeseries.empty:
+    if not _has_rollups(tps_rollups):
         return "<p>TPS 데이터가 없습니다.</p>"
 
-    labels = df_tps_timeseries["timestamp"].dt.strftime("%H:%M:%S").tolist()
-    tps_data = df_tps_timeseries["tps"].tolist()
+    datasets = _zoom_chart_datasets({"tps": ("TPS (성공 요청 수 / sec)", "rgba(0, 123, 255, 0.9)", "rgba(0, 123, 255, 0.2)")})
 
     chart_js = f"""
     <div class="card-full">
         <div class="card-title">🚀 성공 TPS 시계열</div>
         <canvas id="tpsChart" height="60"></canvas>
+        <div id="tpsChartInfo" style="text-align: right; font-size: 0.8rem; color: #666;"></div>
     </div>
     <script>
-    const tpsCtx = document.getElementById('tpsChart').getContext('2d');
-    new Chart(tpsCtx, {{
+    k6ZoomChart('tpsChart', 'tps', {{
         type: 'line',
         data: {{
-            labels: {labels},
-            datasets: [{{
-                label: 'TPS (성공 요청 수 / sec)',
-                data: {tps_data},
-                borderColor: 'rgba(0, 123, 255, 0.9)',
-                backgroundColor: 'rgba(0, 123, 255, 0.2)',
-                fill: false,
-                tension: 0.1,
-                pointRadius: 2
-            }}]
+            datasets: [{datasets}]
         }},
         options: {{
             responsive: true,
+            animation: false,
+            parsing: false,
             plugins: {{
                 title: {{
                     display: true,
@@ -187,6 +541,7 @@ def generate_chartjs_tps_chart(df_tps_timeseries: pd.DataFrame) -> str:
             }},
             scales: {{
                 x: {{
+                    type: 'linear',
                     title: {{
                         display: true,
                         text: '시간'
@@ -204,25 +559,24 @@ def generate_chartjs_tps_chart(df_tps_timeseries: pd.DataFrame) -> str:
                 }}
             }}
         }}
-    }});
+    }}, '{timezone}');
     </script>
     """
     return chart_js
 
 
-def generate_chartjs_latency_chart(df_latency_timeseries: pd.DataFrame) -> str:
+def generate_chartjs_latency_chart(latency_rollups: dict, timezone: str = DEFAULT_TIMEZONE) -> str:
     """
     Chart.js를 이용 해서 HTTP Request Latency 시계열 그래프 HTML 코드 생성
     Args:
-        df_latency_timeseries: 'timestamp', 'avg', 'min', 'max', 'p50', 'p90', 'p95', 'p99' 컬럼을 가진 DataFrame
+        latency_rollups: {롤업 간격(초): 'timestamp'(epoch 초), 'avg', 'min', 'max', 'p50', 'p90', 'p95', 'p99' 컬럼을 가진 DataFrame}
+        timezone: 시간축 라벨 시간대
     Returns:
-        HTTP 요청 지연 시계열 Chart.js HTML 코드
+        HTTP 요청 지연 시계열 Chart.js HTML 코드 (데이터 는 generate_chart_data_block 의 "latency")
     """
-    if df_latency_timeseries.empty:
+    if not _has_rollups(latency_rollups):
         return "<p>Latency 데이터가 없습니다.</p>"
 
-    labels = df_latency_timeseries["timestamp"].dt.strftime("%H:%M:%S").tolist()
-
     colors = {
         "avg": "rgba(0, 200, 83, 0.6)",        # 초록 (평균)
         "min": "rgba(255, 235, 59, 0.6)",      # 노랑 (최소)
@@ -232,37 +586,25 @@ def generate_chartjs_latency_chart(df_latency_timeseries: pd.DataFrame) -> str:
         "p95": "rgba(30, 136, 229, 0.6)",      # 진한 파랑 (95 퍼센타일)
         "p99": "rgba(21, 101, 192, 0.7)"       # 아주 진한 파랑 (99 퍼센타일)
     }
-
-    datasets = []
-    for col, color in colors.items():
-        if col in df_latency_timeseries.columns:
-            datasets.append(f"""
-            {{
-                label: '{col}',
-                data: {df_latency_timeseries[col].astype(int).tolist()},
-                borderColor: '{color}',
-                backgroundColor: '{color}',
-                fill: false,
-                tension: 0.1,
-                pointRadius: 2
-            }}
-            """)
+    columns = next(df.columns for df in latency_rollups.values() if not df.empty)
+    datasets = _zoom_chart_datasets({col: (col, color, color) for col, color in colors.items() if col in columns})
 
     chart_js = f"""
     <div class="card-full">
         <div class="card-title">📈 HTTP 요청 지연 시계열</div>
         <canvas id="latencyChart" height="100"></canvas>
+        <div id="latencyChartInfo" style="text-align: right; font-size: 0.8rem; color: #666;"></div>
     </div>
     <script>
-    const latencyCtx = document.getElementById('latencyChart').getContext('2d');
-    new Chart(latencyCtx, {{
+    k6ZoomChart('latencyChart', 'latency', {{
         type: 'line',
         data: {{
-            labels: {labels},
-            datasets: [{','.join(datasets)}]
+            datasets: [{datasets}]
         }},
         options: {{
             responsive: true,
+            animation: false,
+            parsing: false,
             interaction: {{
                 mode: 'index',
                 intersect: false
@@ -278,6 +620,7 @@ def generate_chartjs_latency_chart(df_latency_timeseries: pd.DataFrame) -> str:
             }},
             scales: {{
                 x: {{
+                    type: 'linear',
                     title: {{
                         display: true,
                         text: '시간'
@@ -291,20 +634,221 @@ def generate_chartjs_latency_chart(df_latency_timeseries: pd.DataFrame) -> str:
                 }}
             }}
         }}
-    }});
+    }}, '{timezone}');
     </script>
     """
 
     return chart_js
 
 
-def generate_report(output_path, data: dict):
+def error_chart_rollups(error_series: pd.DataFrame, interval_sec: int) -> dict:
+    """
+    errors.error_chart_series 를 generate_chart_data_block 의 "errors" 롤업 으로 변환
+    ({롤업 간격(초): timestamp, 조합 별 실패 건수, total}. interval_sec 버킷 과, 그 배수 인 rollup.ROLLUP_INTERVALS 의 합계)
+    """
+    if error_series.empty or len(error_series.columns) <= 1:
+        return {}
+    base = error_series.assign(total=error_series.drop(columns="timestamp").sum(axis=1))
+    rollups = {interval_sec: base}
+    for interval in rollup.ROLLUP_INTERVALS:
+        if interval > interval_sec and interval % interval_sec == 0:
+            rollups[interval] = rollup.rebin_sum(base, interval)
+    return rollups
+
+
+def generate_chartjs_error_chart(error_rollups: dict, timezone: str = DEFAULT_TIMEZONE) -> str:
+    """
+    Chart.js 를 이용 해서 실패 요청 을 (상태 코드 + 에러 분류) 조합 별로 쌓은 시계열 막대 그래프 HTML 코드 생성
+    Args:
+        error_rollups: error_chart_rollups 의 결과 (데이터 는 generate_chart_data_block 의 "errors")
+        timezone: 시간축 라벨 시간대
+    """
+    if not _has_rollups(error_rollups):
+        return ""
+
+    columns = next(df.columns for df in error_rollups.values() if not df.empty).drop(["timestamp", "total"])
+    datasets = ",".join(
+        json.dumps({
+            "key": col,
+            "label": col,
+            "data": [],
+            "backgroundColor": ERROR_SERIES_COLORS[min(i, len(ERROR_SERIES_COLORS) - 1)],
+        }, ensure_ascii=False)
+        for i, col in enumerate(columns)
+    )
+
+    return f"""
+    <div class="section-gap">
+        <div class="card-full">
+            <div class="card-title">🧯 상태 코드 / 에러 분류 시계열</div>
+            <canvas id="errorChart" height="60"></canvas>
+            <div id="errorChartInfo" style="text-align: right; font-size: 0.8rem; color: #666;"></div>
+        </div>
+    </div>
+    <script>
+    k6ZoomChart('errorChart', 'errors', {{
+        type: 'bar',
+        data: {{
+            datasets: [{datasets}]
+        }},
+        options: {{
+            responsive: true,
+            animation: false,
+            parsing: false,
+            plugins: {{
+                title: {{
+                    display: true,
+                    text: '실패 요청 수 (상태 코드 + 에러 분류)'
+                }}
+            }},
+            scales: {{
+                x: {{
+                    type: 'linear',
+                    stacked: true,
+                    title: {{
+                        display: true,
+                        text: '시간'
+                    }}
+                }},
+                y: {{
+                    stacked: true,
+                    beginAtZero: true,
+                    title: {{
+                        display: true,
+                        text: '실패 요청 수'
+                    }},
+                    ticks: {{
+                        precision: 0
+                    }}
+                }}
+            }}
+        }}
+    }}, '{timezone}');
+    </script>
+    """
+
+
+def generate_chart_data_block(chart_rollups: dict) -> str:
+    """
+    차트 롤업 데이터 를 페이지 에 한 번만 담는 <script> 블록 과 ZOOM_CHART_SCRIPT (차트 HTML 보다 앞에 둔다)
+      - 롤업 간격 마다 공유 시간축 하나 (테스트 시작 epoch 기준 Int32 초 offset)
+      - 차트 / 간격 별 값은 Float32 (CHART_SERIES 의 자릿수 로 반올림), 시간축 의 일부 버킷 에만 값이 있으면 Int32 위치 목록
+      - 처음 그리는 점은 rollup.select_interval 로 고른 롤업 의 LTTB 위치 (Int32)
+      - 모든 배열 을 하나의 little-endian 버퍼 로 이어 붙여 base64 로 담고, CHART_DATA_GZIP_MIN_BYTES 이상 이면 gzip
+    Args:
+        chart_rollups: {"vus" | "tps" | "latency": {롤업 간격(초): DataFrame}} (process_data 의 chart_rollups)
+                       와 "errors" (error_chart_rollups)
+    """
+    charts = {
+        name: {interval: df for interval, df in sorted(levels.items()) if not df.empty}
+        for name, levels in chart_rollups.items() if name in CHART_SERIES and _has_rollups(levels)
+    }
+    if not charts:
+        return ""
+
+    axes = {}
+    for levels in charts.values():
+        for interval, df in levels.items():
+            axes.setdefault(interval, []).append(df["timestamp"].to_numpy(dtype="int64"))
+    axes = {interval: np.unique(np.concatenate(parts)) for interval, parts in sorted(axes.items())}
+    start = int(min(axis[0] for axis in axes.values()))
+
+    buffer = _ArrayBuffer()
+    manifest = {
+        "start": start,
+        "axes": {str(interval): buffer.add(axis - start, "i4") for interval, axis in axes.items()},
+        "charts": {},
+    }
+    for name, levels in charts.items():
+        columns, primary, decimals = CHART_SERIES[name]
+        available = next(iter(levels.values())).columns
+        columns = [col for col in (available.drop("timestamp") if columns is None else columns) if col in available]
+        primary = primary if primary in columns else columns[0]
+
+        chart_levels = []
+        for interval, df in levels.items():
+            timestamps = df["timestamp"].to_numpy(dtype="int64")
+            rows = None if len(timestamps) == len(axes[interval]) else buffer.add(np.searchsorted(axes[interval], timestamps), "i4")
+            series = {col: buffer.add(df[col].astype("float64").round(decimals).to_numpy(), "f4") for col in columns}
+            chart_levels.append({"interval": interval, "rows": rows, "series": series})
+
+        initial = rollup.select_interval({interval: len(df) for interval, df in levels.items()})
+        df = levels[initial]
+        manifest["charts"][name] = {
+            "primary": primary,
+            "budget": rollup.CHART_MAX_POINTS,
+            "ratio": rollup.LTTB_MAX_RATIO,
+            "levels": chart_levels,
+            "initial": {"interval": initial,
+                        "rows": buffer.add(rollup.lttb_indices(df["timestamp"].to_numpy(), df[primary].to_numpy()), "i4")},
+        }
+
+    data, manifest["gzip"] = buffer.encode()
+    return f"""
+    <script type="application/json" id="k6ChartData">{json.dumps(manifest, separators=(",", ":"))}</script>
+    <script type="text/plain" id="k6ChartBuffer">{data}</script>
+    <script>{ZOOM_CHART_SCRIPT}</script>
+    """
+
+
+class _ArrayBuffer:
+    """
+    숫자 배열 들을 하나의 little-endian 바이트 버퍼 로 이어 붙이고, 배열 마다 [offset, length, type] 참조 를 돌려준다
+    (type: "i4" = Int32, "f4" = Float32. 모두 4바이트 라서 offset 이 typed array 정렬 조건 을 만족)
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.size = 0
+
+    def add(self, values, dtype: str) -> list:
+        array = np.ascontiguousarray(values, dtype=f"<{dtype}")
+        ref = [self.size, int(array.size), dtype]
+        self.parts.append(array.tobytes())
+        self.size += array.nbytes
+        return ref
+
+    def encode(self) -> tuple:
+        """
+        (base64 문자열, gzip 여부). gzip 할 때는 4바이트 값의 같은 자리 바이트 끼리 모아서(byte shuffle) 압축 한다
+        (시계열 값은 상위 바이트 가 거의 같아서, 그대로 압축 할 때보다 작고 빠르다)
+        """
+        raw = b"".join(self.parts)
+        if len(raw) < CHART_DATA_GZIP_MIN_BYTES:
+            return base64.b64encode(raw).decode("ascii"), False
+        shuffled = np.frombuffer(raw, dtype="u1").reshape(-1, 4).T.tobytes()
+        return base64.b64encode(gzip.compress(shuffled, compresslevel=6, mtime=0)).decode("ascii"), True
+
+
+def _has_rollups(rollups: dict) -> bool:
+    return any(not df.empty for df in rollups.values())
+
+
+def _zoom_chart_datasets(series: dict) -> str:
+    # {컬럼: (범례, 선 색, 배경 색)} → Chart.js datasets. 데이터 는 k6ZoomChart 가 key 컬럼 으로 채운다
+    return ','.join(f"""
+            {{
+                key: '{col}',
+                label: '{label}',
+                data: [],
+                borderColor: '{border}',
+                backgroundColor: '{background}',
+                fill: false,
+                tension: 0.1,
+                pointRadius: 2
+            }}""" for col, (label, border, background) in series.items())
+
+
+def generate_report(output_path, data: dict, timezone: str = DEFAULT_TIMEZONE, refresh_sec: int = None):
     """
     최종 HTML Report 생성
     Args:
         output_path: 저장할 HTML 파일 경로
         data: process_data()의 결과 dict
+        timezone: 시각 표시 시간대 (예: Asia/Seoul, UTC)
+        refresh_sec: 지정 하면 브라우저 가 refresh_sec 마다 페이지를 다시 읽는다 (--follow 모드)
     """
+    refresh_meta = f'<meta http-equiv="refresh" content="{refresh_sec}">' if refresh_sec else ""
 
     # 카드별 로 준비
     card_http_summary = generate_card("HTTP 요청 요약", data["summary_http_request"], icon="📊")
@@ -313,28 +857,29 @@ def generate_report(output_path, data: dict):
     card_network_usage = generate_card("네트워크 사용량", data["summary_network_usage"], icon="📡")
     card_errors_html = generate_error_card(data["summary_http_errors"])
 
-    # 시계열 차트 준비
-    chart_vus = generate_chartjs_vus_chart(data["chart_vus_timeseries"])
-    chart_tps = generate_chartjs_tps_chart(data["chart_tps_timeseries"])
-    chart_latency = generate_chartjs_latency_chart(data["chart_latency_timeseries"])
-
-    # 디테일 테이블 준비
-    detail_latency_table_html = generate_detail_table(data["detail_table"], title="📈 URL 별 지연 시간 요약")
-    detail_check_table_html = generate_detail_table(data["detail_check_table"], title="✅ Check 결과 요약")
+    # 시계열 차트 준비 (네 차트 의 데이터 는 chart_data 블록 에 한 번만 담는다)
+    error_rollups = error_chart_rollups(errors.error_chart_series(data["chart_error_timeseries"]),
+                                        determine_interval_seconds(data["test_duration"]["seconds"]))
+    chart_data = generate_chart_data_block({**data["chart_rollups"], "errors": error_rollups})
+    chart_vus = generate_chartjs_vus_chart(data["chart_rollups"]["vus"], timezone)
+    chart_tps = generate_chartjs_tps_chart(data["chart_rollups"]["tps"], timezone)
+    chart_latency = generate_chartjs_latency_chart(data["chart_rollups"]["latency"], timezone)
+    chart_errors = generate_chartjs_error_chart(error_rollups, timezone)
 
-    # 최종 HTML 조합
-    html_content = f"""
+    # 최종 HTML 조합 (상세 테이블 은 행이 많을 수 있으므로 문자열 로 모으지 않고 파일에 바로 쓴다)
+    html_head = f"""
     <!DOCTYPE html>
     <html lang="ko">
     <head>
         <meta charset="UTF-8">
+        {refresh_meta}
         <title>K6 성능 테스트 리포트</title>
         <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
         <link rel="stylesheet" href="assets/css/style.css">
     </head>
     <body>
         <h1>K6 Performance Test Report</h1>
-        <h3>{format_test_duration_title(data["test_duration"])}</h3>
+        <h3>{format_test_duration_title(data["test_duration"], timezone)}</h3>
         
         <div class="container">
             {card_http_summary}
@@ -345,6 +890,8 @@ def generate_report(output_path, data: dict):
         
             {card_errors_html}
 
+        {chart_data}
+
         <div class="section-gap">
             {chart_vus}
         </div>
@@ -357,16 +904,177 @@ def generate_report(output_path, data: dict):
             {chart_latency}
         </div>
 
+        {chart_errors}
+
         <div class="section-gap">
-            {detail_latency_table_html}
+            """
+
+    with output_path.open("w", encoding="utf-8") as out:
+        out.write(html_head)
+        write_detail_table(out, data["detail_table"], title="📈 URL 별 지연 시간 요약", table_id="latencyTable")
+        out.write("""
+        </div>
+
+        <div class="section-gap">
+            """)
+        write_detail_table(out, data["url_error_table"], title="🧯 URL 별 상태 코드 / 에러 분류", table_id="urlErrorTable")
+        out.write("""
+        </div>
+
+        <div class="section-gap">
+            """)
+        write_detail_table(out, data["detail_check_table"], title="✅ Check 결과 요약", table_id="checkTable")
+        out.write("""
+        </div>
+
+        <div class="section-gap">
+            """)
+        write_breakdown_tables(out, data["breakdown_tables"])
+        out.write("""
+        </div>
+    </body>
+    </html>
+    """)
+
+    print(f"[DONE] HTML 리포트 생성 완료: {output_path}")
+
+
+def generate_batch_index(output_path, results: list, timezone: str = DEFAULT_TIMEZONE):
+    """
+    batch 실행 결과 리포트 목록 HTML 생성
+    Args:
+        output_path: 저장할 HTML 파일 경로
+        results: batch.run_one() 결과 dict 목록 (input, html, test_duration, summary_http_request)
+        timezone: 시각 표시 시간대
+    """
+    summary_keys = ["total_reqs", "tps", "failed_reqs", "success_rate", "vus_max"]
+    headers = ''.join(f"<th>{col}</th>" for col in ["input", "test"] + summary_keys)
+
+    rows = []
+    for result in results:
+        if not result.get("html"):
+            rows.append(
+                f'<tr style="color: red;"><td class="left">{result["input"]}</td>'
+                f'<td class="left" colspan="{len(summary_keys) + 1}">실패: {result.get("error", "-")}</td></tr>'
+            )
+            continue
+
+        summary = result["summary_http_request"]
+        cells = ''.join(f'<td class="right">{summary.get(key, "-")}</td>' for key in summary_keys)
+        rows.append(
+            f'<tr><td class="left"><a href="{result["html"]}">{result["input"]}</a></td>'
+            f'<td class="left">{format_test_duration_title(result["test_duration"], timezone)}</td>{cells}</tr>'
+        )
+
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="ko">
+    <head>
+        <meta charset="UTF-8">
+        <title>K6 성능 테스트 리포트 목록</title>
+        <link rel="stylesheet" href="assets/css/style.css">
+    </head>
+    <body>
+        <h1>K6 Performance Test Reports</h1>
+        <div class="card-full">
+            <div class="card-title">📚 리포트 목록 ({len(results)})</div>
+            <table>
+                <thead><tr>{headers}</tr></thead>
+                <tbody>{''.join(rows)}</tbody>
+            </table>
+        </div>
+    </body>
+    </html>
+    """
+
+    output_path.write_text(html_content, encoding="utf-8")
+    print(f"[DONE] 리포트 목록 생성 완료: {output_path}")
+
+
+def generate_trend_report(output_path, title: str, df_trend: pd.DataFrame, timezone: str = DEFAULT_TIMEZONE):
+    """
+    여러 실행에 걸친 metric 추이 HTML 생성 (history.py trend)
+    Args:
+        output_path: 저장할 HTML 파일 경로
+        title: metric 이름 (URL 포함)
+        df_trend: 'name', 'started_at'(epoch 초), 'value' 컬럼을 가진 DataFrame (시간 순)
+        timezone: 시각 표시 시간대
+    """
+    labels = format_epoch_labels(df_trend["started_at"], timezone, "%m-%d %H:%M")
+    values = [None if pd.isna(v) else round(float(v), 2) for v in df_trend["value"]]
+    started = format_epoch_labels(df_trend["started_at"], timezone, "%Y-%m-%d %H:%M:%S")
+    rows = ''.join(
+        f'<tr><td class="left">{name}</td><td class="left">{start}</td>'
+        f'<td class="right">{"-" if v is None else f"{v:,.2f}"}</td></tr>'
+        for name, start, v in zip(df_trend["name"], started, values)
+    )
+
+    html_content = f"""
+    <!DOCTYPE html>
+    <html lang="ko">
+    <head>
+        <meta charset="UTF-8">
+        <title>K6 실행 추이 - {title}</title>
+        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+        <link rel="stylesheet" href="assets/css/style.css">
+    </head>
+    <body>
+        <h1>K6 Trend: {title}</h1>
+        <h3>최근 {len(df_trend)} 회 실행</h3>
+
+        <div class="card-full">
+            <div class="card-title">📉 {title}</div>
+            <canvas id="trendChart" height="80"></canvas>
         </div>
+        <script>
+        const trendCtx = document.getElementById('trendChart').getContext('2d');
+        new Chart(trendCtx, {{
+            type: 'line',
+            data: {{
+                labels: {labels},
+                datasets: [{{
+                    label: '{title}',
+                    data: {json.dumps(values)},
+                    borderColor: 'rgba(21, 101, 192, 0.8)',
+                    backgroundColor: 'rgba(21, 101, 192, 0.2)',
+                    fill: false,
+                    tension: 0.1,
+                    pointRadius: 3,
+                    spanGaps: true
+                }}]
+            }},
+            options: {{
+                responsive: true,
+                plugins: {{
+                    legend: {{
+                        display: false
+                    }}
+                }},
+                scales: {{
+                    x: {{
+                        title: {{
+                            display: true,
+                            text: '실행 시작 시각'
+                        }}
+                    }}
+                }}
+            }}
+        }});
+        </script>
 
         <div class="section-gap">
-            {detail_check_table_html}
+            <div class="card-full">
+                <div class="card-title">📚 실행 목록</div>
+                <table>
+                    <thead><tr><th>run</th><th>started</th><th>{title}</th></tr></thead>
+                    <tbody>{rows}</tbody>
+                </table>
+            </div>
         </div>
     </body>
     </html>
     """
 
+    output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(html_content, encoding="utf-8")
-    print(f"[DONE] HTML 리포트 생성 완료: {output_path}")
+    print(f"[DONE] 추이 리포트 생성 완료: {output_path}")
@@ -1,8 +1,40 @@
 import argparse
 from pathlib import Path
 from datetime import datetime
+from typing import Union
 
-import parser, data_processor, html_writer, csv_writer
+import parser, data_processor, html_writer, csv_writer, streaming, parallel, follow, multinode, run_summary, history, utils
+import url_template, profiler
+from cache import ParsedRunCache, load_csv_cached, DEFAULT_CACHE_DIR
+from analyzer import PERCENTILE_ENGINES
+from sketch import RELATIVE_ACCURACY
+
+# --only 로 고를 수 있는 출력 (기본값: 전부). 고른 출력 에 필요한 섹션 만 계산 한다
+REPORT_OUTPUTS = ("html", "csv", "summary", "console")
+
+# print_summary_to_console 가 쓰는 섹션
+CONSOLE_SECTIONS = ("summary_http_request", "summary_http_req_duration", "summary_iteration_duration",
+                    "summary_network_usage")
+
+# 출력 별 로 쓰는 섹션 (리포트 작성 전에 report_graph.compute 단계 에서 한 번에 계산)
+OUTPUT_SECTIONS = {
+    "html": ("test_duration", *CONSOLE_SECTIONS, "summary_http_errors", "chart_rollups", "chart_error_timeseries",
+             "detail_table", "url_error_table", "detail_check_table", "breakdown_tables"),
+    "csv": ("detail_table", "detail_check_table", "chart_error_timeseries", "url_error_table", "breakdown_tables",
+            "cube_table"),
+    "summary": ("run_summary",),
+    "console": CONSOLE_SECTIONS,
+}
+
+
+def report_sections(outputs: set, history_db: str = None) -> list:
+    """
+    고른 출력 (과 이력 저장) 에 필요한 섹션 이름 (중복 없이 REPORT_OUTPUTS 순서)
+    """
+    sections = [section for output in REPORT_OUTPUTS if output in outputs for section in OUTPUT_SECTIONS[output]]
+    if history_db:
+        sections.append("run_summary")
+    return list(dict.fromkeys(sections))
 
 
 def generate_timestamp():
@@ -26,44 +58,230 @@ def print_summary_to_console(data: dict):
         print(f"{key:20}: {value}")
 
 
-def main(input_path: str):
+def main(input_path: Union[str, list], stream: bool = False, chunk_size: int = 1_000_000,
+         percentile_engine: str = "exact", sketch_accuracy: float = RELATIVE_ACCURACY,
+         cache: ParsedRunCache = None, timezone: str = utils.DEFAULT_TIMEZONE, workers: int = 1,
+         output_dir: Path = None, follow_mode: bool = False, refresh_sec: int = 10, idle_timeout: int = None,
+         csv_engine: str = "pandas", time_from: str = None, time_to: str = None,
+         metrics: list = None, exclude_metrics: list = None, clock_offsets: list = None, history_db: str = None,
+         url_templates: list = None, raw_urls: bool = False, max_urls: int = url_template.DEFAULT_MAX_ENDPOINTS,
+         profile: bool = False, outputs: list = None, stem: str = None):
+    """
+    리포트(HTML, 상세 CSV) 생성 후 (HTML 경로, process_data 결과) 반환. 입력 파일이 없으면 None
+
+    time_from/time_to/metrics/exclude_metrics 를 주면 파싱 단계 에서 해당 시간 구간/metric 행만 읽는다
+    (테스트 시간, TPS 등 모든 집계 가 선택한 구간 기준 이 된다)
+
+    input_path 에 노드(부하 발생기) 별 결과 파일 목록 을 주면 timestamp 순서 로 합쳐서 하나의 리포트 로 만든다
+    (clock_offsets: 노드 별 시계 보정 초, VU 는 노드 합산, 항상 스트리밍 집계)
+
+    history_db 를 주면 실행 요약 을 해당 SQLite 이력 저장소 에 저장 한다
+
+    URL 별 테이블 은 url 을 endpoint 템플릿 (숫자/UUID/16진수 segment, url_templates 규칙, k6 name 태그) 으로
+    묶어서 집계 한다 (서로 다른 endpoint 는 최대 max_urls 개). raw_urls 면 원본 url 그대로
+
+    profile 이면 단계 (파싱, process_data 안의 analyzer 호출, HTML/CSV 작성 ...) 별 wall / CPU 시간, 최대 RSS, 행 수를
+    표로 출력 하고 리포트 옆에 Chrome trace 형식 <리포트>.profile.json 으로 저장 한다
+
+    outputs (REPORT_OUTPUTS 의 부분 집합, 기본값 전부) 에 있는 출력 만 만들고, 그에 필요한 섹션 만 계산 한다
+    (예: ["console"] 이면 시간 버킷 별 퍼센타일, 롤업, URL / check 테이블 은 계산 하지 않는다)
+
+    stem 을 주면 출력 파일 이름 을 입력 파일 이름 대신 <stem>_<시각> 으로 만든다 (batch 에서 이름 이 겹치는 입력 구분)
+    """
     BASE_DIR = Path(__file__).resolve().parent
-    OUTPUT_DIR = BASE_DIR / "out"
+    OUTPUT_DIR = Path(output_dir) if output_dir else BASE_DIR / "out"
+
+    input_files = [Path(p) for p in input_path] if isinstance(input_path, (list, tuple)) else [Path(input_path)]
+    for input_file in input_files:
+        if not input_file.exists():
+            print(f"[ERROR] File not found: {input_file}")
+            return None
+    input_file = input_files[0]
+    multi_node = len(input_files) > 1
+
+    outputs = set(outputs or REPORT_OUTPUTS)
+    unknown = outputs - set(REPORT_OUTPUTS)
+    if unknown:
+        print(f"[ERROR] Unknown --only output(s): {', '.join(sorted(unknown))} (choose from {', '.join(REPORT_OUTPUTS)})")
+        return None
+
+    if multi_node and (follow_mode or workers > 1):
+        print("[ERROR] --follow and --workers take a single input file")
+        return None
+    if not multi_node and clock_offsets:
+        print("[WARN] --clock-offsets only applies to multiple input files, ignoring")
+
+    if (follow_mode or workers > 1) and not parser.is_plain_csv(input_file):
+        if follow_mode:
+            print(f"[ERROR] --follow only supports uncompressed CSV: {input_file}")
+            return None
+        print(f"[WARN] --workers needs an uncompressed CSV, falling back to --stream: {input_file}")
+        workers, stream = 1, True
+
+    try:
+        origin = multinode.merged_start(input_files, clock_offsets) if multi_node and (time_from or time_to) else None
+        row_filter = parser.build_row_filter(input_file, time_from, time_to, metrics, exclude_metrics, timezone, origin)
+        url_templater = url_template.build_url_templater(url_templates, raw_urls, max_urls)
+    except ValueError as e:
+        print(e)
+        return None
 
-    input_file = Path(input_path)
-    if not input_file.exists():
-        print(f"[ERROR] File not found: {input_file}")
-        return
+    if follow_mode:
+        if profile or outputs != set(REPORT_OUTPUTS):
+            print("[WARN] --profile and --only are not supported with --follow, ignoring")
+        return follow.follow_csv(input_file, OUTPUT_DIR, refresh_sec, idle_timeout, timezone, sketch_accuracy, row_filter,
+                                 url_templater)
 
     timestamp = generate_timestamp()
-    stem = input_file.stem  # 'stg_load_test'
+    if stem is None:
+        stem = parser.result_stem(input_file)  # 'stg_load_test'
+        if multi_node:
+            stem = f"{stem}_{len(input_files)}nodes"
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
     html_output = OUTPUT_DIR / f"{stem}_{timestamp}.html"
     csv_output_dir = OUTPUT_DIR
 
-    print(f"[INFO] Parsing CSV: {input_path}")
-    df = parser.load_csv(input_path)
+    with profiler.profiling(profile) as prof:
+        rows = None
+        if multi_node:
+            print(f"[INFO] Merging {len(input_files)} node results by timestamp: {', '.join(str(p) for p in input_files)}")
+            try:
+                processed = profiler.call(multinode.process_nodes_streaming, input_files, clock_offsets, chunk_size,
+                                          sketch_accuracy, csv_engine, row_filter, url_templater)
+            except ValueError as e:
+                print(e)
+                return None
+        elif workers > 1:
+            print(f"[INFO] Aggregating CSV in parallel: {input_path}")
+            processed = profiler.call(parallel.process_csv_parallel, input_path, workers, chunk_size, sketch_accuracy,
+                                      csv_engine, row_filter, url_templater)
+        elif stream:
+            print(f"[INFO] Streaming in chunks of {chunk_size:,} rows: {input_path}")
+            processed = profiler.call(streaming.process_csv_streaming, input_path, chunk_size, sketch_accuracy,
+                                      csv_engine, row_filter, url_templater)
+        else:
+            print(f"[INFO] Parsing: {input_path}")
+            with profiler.stage("cache.load_csv_cached") as record:
+                df = load_csv_cached(input_path, cache, csv_engine, row_filter)
+                record.rows = len(df)
+            print(f"[INFO] Parsed {len(df):,} rows, in-memory size: {utils.format_bytes(parser.memory_footprint(df))}")
 
-    print(f"[INFO] Processing data...")
-    processed = data_processor.process_data(df)
+            print(f"[INFO] Processing data...")
+            rows = len(df)
+            processed = profiler.call(data_processor.process_data, df, percentile_engine, sketch_accuracy, url_templater,
+                                      row_filter)
 
-    print(f"[INFO] Writing HTML report to: {html_output}")
-    html_writer.generate_report(html_output, processed)
+        # 섹션 은 지연 계산 이라, 리포트 작성 단계 에 섞이지 않도록 고른 출력 에 필요한 섹션 을 먼저 계산
+        with profiler.stage("report_graph.compute", rows):
+            processed.compute(report_sections(outputs, history_db))
 
-    print(f"[INFO] Writing detail CSV files to: {csv_output_dir}")
-    csv_writer.export_detail_tables_to_csv(csv_output_dir, f"{stem}_{timestamp}", processed)
+        if "html" in outputs:
+            print(f"[INFO] Writing HTML report to: {html_output}")
+            profiler.call(html_writer.generate_report, html_output, processed, timezone)
+
+        if "csv" in outputs:
+            print(f"[INFO] Writing detail CSV files to: {csv_output_dir}")
+            profiler.call(csv_writer.export_detail_tables_to_csv, csv_output_dir, f"{stem}_{timestamp}", processed)
+        if "summary" in outputs:
+            with profiler.stage("run_summary.save"):
+                run_summary.save(run_summary.summary_path(html_output), processed["run_summary"])
+
+        if history_db:
+            with profiler.stage("history.HistoryStore.ingest"):
+                store = history.HistoryStore(history_db)
+                try:
+                    run_id = store.ingest(processed["run_summary"], html_output.stem,
+                                          ", ".join(str(p) for p in input_files))
+                finally:
+                    store.close()
+            if run_id is None:
+                print(f"[WARN] {html_output.stem} is already in history {history_db}, skipped")
+            else:
+                print(f"[INFO] Stored run in history {history_db} (run_id {run_id})")
 
     print("[DONE] Report generation complete.")
+    if outputs != set(REPORT_OUTPUTS):
+        print(f"[INFO] Computed sections: {', '.join(processed.computed)}")
+
+    if "console" in outputs:
+        print_summary_to_console(processed)
 
-    print_summary_to_console(processed)
+    if prof is not None:
+        prof.print_table()
+        trace = prof.save_trace(profiler.trace_path(html_output), {"input": [str(p) for p in input_files]})
+        print(f"[INFO] Profile trace (chrome://tracing, Perfetto): {trace}")
+
+    return html_output, processed
 
 
 if __name__ == "__main__":
     arg_parser = argparse.ArgumentParser()
-    arg_parser.add_argument("input", help="Input CSV file path")
+    arg_parser.add_argument("input", nargs="+",
+                            help="k6 result file (.csv, or --out json NDJSON .json; either may be .gz). "
+                                 "Pass one file per load generator to merge a distributed run into one report")
+    arg_parser.add_argument("--clock-offsets", type=utils.parse_list, default=None,
+                            help="Comma-separated seconds added to each input's timestamps, in input order "
+                                 "(e.g. 0,-2,1 when the second node's clock is 2s ahead)")
+    arg_parser.add_argument("--stream", action="store_true",
+                            help="Read the CSV in chunks and aggregate online (constant memory, approximate percentiles)")
+    arg_parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Rows per chunk in --stream mode")
+    arg_parser.add_argument("--csv-engine", choices=parser.CSV_ENGINES, default="pandas",
+                            help="pandas: pd.read_csv, mmap: memory-mapped tokenizer for the k6 CSV layout "
+                                 "(uses numba when installed)")
+    arg_parser.add_argument("--workers", type=int, default=1,
+                            help="Aggregate byte-range shards in N worker processes (same result as --stream; "
+                                 f"this machine has {parallel.default_workers()} cores)")
+    arg_parser.add_argument("--percentile-engine", choices=PERCENTILE_ENGINES, default="exact",
+                            help="exact: sort raw values, sketch: mergeable quantile sketches (always used in --stream)")
+    arg_parser.add_argument("--sketch-accuracy", type=float, default=RELATIVE_ACCURACY,
+                            help="Relative error of quantile sketches (default: 0.01 = 1%%)")
+    arg_parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help="Directory for cached parsed runs")
+    arg_parser.add_argument("--cache-max-size", default="10G",
+                            help="Evict least recently used cache entries above this size (e.g. 10G)")
+    arg_parser.add_argument("--no-cache", action="store_true", help="Always re-parse the CSV")
+    arg_parser.add_argument("--follow", action="store_true",
+                            help="Tail a CSV that k6 is still writing and re-render <stem>_live.html periodically")
+    arg_parser.add_argument("--refresh-interval", type=int, default=10, help="Seconds between refreshes in --follow mode")
+    arg_parser.add_argument("--idle-timeout", type=int, default=None,
+                            help="Stop --follow after this many seconds without new rows (default: run until Ctrl+C)")
+    arg_parser.add_argument("--from", dest="time_from", default=None,
+                            help="Only rows at or after this time: offset from test start (90s, 3m, 1h30m), "
+                                 "HH:MM[:SS] on the test start date, an ISO datetime or epoch seconds")
+    arg_parser.add_argument("--to", dest="time_to", default=None, help="Only rows before this time (same formats as --from)")
+    arg_parser.add_argument("--metrics", type=utils.parse_list, default=None,
+                            help="Comma-separated metric names to keep (e.g. http_reqs,http_req_duration,vus)")
+    arg_parser.add_argument("--exclude-metrics", type=utils.parse_list, default=None,
+                            help="Comma-separated metric names to skip while parsing")
+    arg_parser.add_argument("--url-template", dest="url_templates", action="append", default=None,
+                            metavar="REGEX=>TEMPLATE",
+                            help="Rewrite URLs matching REGEX before grouping (repeatable, applied in order, "
+                                 "e.g. '/orders/[^/]+/items=>/orders/{order}/items')")
+    arg_parser.add_argument("--max-urls", type=int, default=url_template.DEFAULT_MAX_ENDPOINTS,
+                            help="Group endpoints beyond this many distinct templated URLs as (other)")
+    arg_parser.add_argument("--raw-urls", action="store_true",
+                            help="Group the URL table by raw URL (no numeric/UUID/hex templating or k6 name tag)")
+    arg_parser.add_argument("--history", nargs="?", const=str(history.DEFAULT_DB_PATH), default=None,
+                            help="Also store the run summary in a SQLite history file (default: out/history.sqlite)")
+    arg_parser.add_argument("--timezone", default=utils.DEFAULT_TIMEZONE,
+                            help="Timezone for times shown in the report (default: Asia/Seoul)")
+    arg_parser.add_argument("--only", type=utils.parse_list, default=None,
+                            help=f"Comma-separated outputs to produce ({','.join(REPORT_OUTPUTS)}; default: all). "
+                                 "Only the sections they need are computed, e.g. --only console skips charts and tables")
+    arg_parser.add_argument("--profile", action="store_true",
+                            help="Print wall/CPU time, peak RSS and rows per stage and save <report>.profile.json "
+                                 "(Chrome trace format)")
     args = arg_parser.parse_args()
 
-    main(args.input)
+    cache = None if args.no_cache else ParsedRunCache(args.cache_dir, utils.parse_bytes(args.cache_max_size))
+
+    main(args.input if len(args.input) > 1 else args.input[0], stream=args.stream, chunk_size=args.chunk_size,
+         percentile_engine=args.percentile_engine, sketch_accuracy=args.sketch_accuracy, cache=cache,
+         timezone=args.timezone, workers=args.workers, follow_mode=args.follow,
+         refresh_sec=args.refresh_interval, idle_timeout=args.idle_timeout, csv_engine=args.csv_engine,
+         time_from=args.time_from, time_to=args.time_to, metrics=args.metrics, exclude_metrics=args.exclude_metrics,
+         clock_offsets=args.clock_offsets, history_db=args.history, url_templates=args.url_templates,
+         raw_urls=args.raw_urls, max_urls=args.max_urls, profile=args.profile,
+         outputs=args.only)
     # main('../k6/out/stg-cloud-be-load.csv')
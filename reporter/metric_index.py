@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+
+class MetricIndex:
+    """
+    parser 결과 DataFrame 을 metric_name 별 행 묶음으로 한 번만 나눠 둔 인덱스
+
+    analyzer 함수들이 df[df["metric_name"] == X] 로 전체 행을 매번 다시 훑지 않도록,
+    metric_name 별 행 위치를 한 번의 groupby 로 구해 두고 필요한 metric 만 잘라서 캐시 한다.
+    시간 버킷(epoch 초를 interval_sec 로 내림한 정수) 역시 (metric, interval_sec) 별로 한 번만 계산 한다.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.positions = {
+            name: np.asarray(pos)
+            for name, pos in df.groupby("metric_name", sort=False, observed=True).indices.items()
+        } if not df.empty else {}
+        self._frames = {}
+        self._buckets = {}
+
+    @property
+    def empty(self) -> bool:
+        return self.df.empty
+
+    @property
+    def metrics(self) -> list:
+        return list(self.positions)
+
+    def get(self, metric: str) -> pd.DataFrame:
+        """
+        metric_name 이 metric 인 행만 담은 DataFrame (없으면 빈 DataFrame)
+        """
+        if metric not in self._frames:
+            positions = self.positions.get(metric, np.empty(0, dtype="int64"))
+            self._frames[metric] = self.df.take(positions)
+        return self._frames[metric]
+
+    def buckets(self, metric: str, interval_sec: int) -> pd.Series:
+        """
+        metric 행들의 timestamp(epoch 초) 를 interval_sec 간격 으로 내림한 버킷 (get(metric) 과 같은 순서)
+        """
+        key = (metric, interval_sec)
+        if key not in self._buckets:
+            timestamps = self.get(metric)["timestamp"]
+            self._buckets[key] = timestamps - timestamps % interval_sec
+        return self._buckets[key]
+
+    def with_buckets(self, metric: str, interval_sec: int) -> pd.DataFrame:
+        """
+        get(metric) 에 bucket 컬럼을 붙인 DataFrame
+        """
+        return self.get(metric).assign(bucket=self.buckets(metric, interval_sec))
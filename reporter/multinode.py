@@ -0,0 +1,126 @@
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+import parser
+import profiler
+from sketch import RELATIVE_ACCURACY
+from streaming import StreamingAggregator
+from url_template import UrlTemplater
+
+
+class NodeReader:
+    """
+    부하 발생기(노드) 하나의 결과 파일을 chunk 단위로 읽으면서, 아직 내보내지 않은 행(pending)을 들고 있는 reader
+
+    - clock_offset 초를 모든 timestamp 에 더해서 노드 간 시계 차이를 보정 한다.
+    - 읽은 행에는 node 컬럼(노드 번호)을 붙인다 (VU 합산 에 사용).
+    """
+
+    def __init__(self, node_id: int, path: Union[str, Path], clock_offset: int = 0, chunk_size: int = 1_000_000,
+                 csv_engine: str = "pandas", row_filter: Optional[parser.RowFilter] = None):
+        self.node_id = node_id
+        self.path = Path(path)
+        self.clock_offset = clock_offset
+        self.rows = 0
+        self.pending = None
+        self.exhausted = False
+        # 시간 조건 은 보정 후 시각 기준 이므로, 원본 timestamp 에는 offset 만큼 반대로 옮겨서 적용
+        if row_filter is not None and clock_offset:
+            row_filter = row_filter.shifted(-clock_offset)
+        self._chunks = parser.iter_result_chunks(path, chunk_size, csv_engine, row_filter)
+
+    def fill(self) -> None:
+        """
+        들고 있는 행이 없으면 다음 chunk 를 읽어 둔다 (파일 끝이면 exhausted)
+        """
+        while self.pending is None and not self.exhausted:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self.exhausted = True
+                return
+            if chunk.empty:
+                continue
+            self.rows += len(chunk)
+            self.pending = chunk.assign(
+                timestamp=chunk["timestamp"] + self.clock_offset,
+                node=np.full(len(chunk), self.node_id, dtype="int16"),
+            )
+
+    def take_until(self, watermark: int) -> pd.DataFrame:
+        """
+        timestamp <= watermark 인 행을 꺼내서 반환 하고 나머지 는 계속 들고 있는다
+        """
+        mask = self.pending["timestamp"].to_numpy() <= watermark
+        if mask.all():
+            taken, self.pending = self.pending, None
+        else:
+            taken, self.pending = self.pending[mask], self.pending[~mask]
+        return taken
+
+
+def iter_merged_chunks(nodes: list) -> Iterator[pd.DataFrame]:
+    """
+    노드 별 chunk 를 timestamp 기준 으로 k-way merge 해서 시간 순서 의 chunk 로 반환
+
+    각 노드가 들고 있는 행의 최대 timestamp 중 가장 작은 값(watermark) 까지 를 모든 노드 에서 꺼내 정렬 해서 내보낸다.
+    watermark 를 정한 노드는 들고 있던 행을 모두 내보내므로 다음 차례 에 새 chunk 를 읽고,
+    나머지 노드는 남은 행을 다 내보낼 때 까지 새로 읽지 않는다. (메모리 에 있는 행은 노드 수 x chunk_size 이하)
+    """
+    while True:
+        for node in nodes:
+            node.fill()
+        active = [node for node in nodes if node.pending is not None]
+        if not active:
+            return
+
+        watermark = min(int(node.pending["timestamp"].max()) for node in active)
+        merged = parser.concat_frames([node.take_until(watermark) for node in active])
+        yield merged.sort_values("timestamp", kind="stable", ignore_index=True)
+
+
+def process_nodes_streaming(paths: list, clock_offsets: Optional[list] = None, chunk_size: int = 1_000_000,
+                            relative_accuracy: float = RELATIVE_ACCURACY, csv_engine: str = "pandas",
+                            row_filter: Optional[parser.RowFilter] = None,
+                            url_templater: Optional[UrlTemplater] = None) -> dict:
+    """
+    여러 노드의 결과 파일을 시간 순서 로 합치면서 StreamingAggregator 로 집계 하여 process_data 와 같은 구조의 dict 를 반환
+    (VU 는 버킷 마다 노드 별 값을 합산)
+    """
+    nodes = [
+        NodeReader(i, path, offset, chunk_size, csv_engine, row_filter)
+        for i, (path, offset) in enumerate(zip(paths, resolve_clock_offsets(paths, clock_offsets)))
+    ]
+
+    aggregator = StreamingAggregator(relative_accuracy, url_templater)
+    for chunk in profiler.iterate("multinode.iter_merged_chunks", iter_merged_chunks(nodes)):
+        with profiler.stage("streaming.StreamingAggregator.update", len(chunk)):
+            aggregator.update(chunk)
+
+    for node in nodes:
+        print(f"[INFO] Node {node.node_id} {node.path.name}: {node.rows:,} rows (clock offset {node.clock_offset:+d}s)")
+    return profiler.call(aggregator.result, row_filter)
+
+
+def resolve_clock_offsets(paths: list, clock_offsets: Optional[list]) -> list:
+    """
+    노드 별 시계 보정값(초). 지정 하지 않으면 모두 0
+    """
+    if not clock_offsets:
+        return [0] * len(paths)
+    if len(clock_offsets) != len(paths):
+        raise ValueError(f"[ERROR] Got {len(clock_offsets)} clock offsets for {len(paths)} input files")
+    try:
+        return [int(offset) for offset in clock_offsets]
+    except ValueError:
+        raise ValueError(f"[ERROR] Clock offsets must be whole seconds: {clock_offsets}")
+
+
+def merged_start(paths: list, clock_offsets: Optional[list] = None) -> int:
+    """
+    보정된 시계 기준 으로 가장 먼저 시작한 노드의 첫 timestamp (--from/--to offset 의 기준)
+    """
+    offsets = resolve_clock_offsets(paths, clock_offsets)
+    return min(parser.first_timestamp(path) + offset for path, offset in zip(paths, offsets))
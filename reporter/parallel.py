@@ -0,0 +1,59 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import parser
+import profiler
+from sketch import RELATIVE_ACCURACY
+from streaming import StreamingAggregator
+from url_template import UrlTemplater
+
+
+def process_csv_parallel(path: Union[str, Path], workers: int, chunk_size: int = 1_000_000,
+                         relative_accuracy: float = RELATIVE_ACCURACY, csv_engine: str = "pandas",
+                         row_filter: Optional[parser.RowFilter] = None,
+                         url_templater: Optional[UrlTemplater] = None) -> dict:
+    """
+    CSV 를 workers 개의 바이트 구간(shard) 으로 나눠서 프로세스 별로 집계 한 뒤 합산
+
+    각 worker 는 자기 구간 을 chunk 단위로 읽어 StreamingAggregator 에 누적 하고,
+    부모 프로세스 는 구간 순서 대로 merge 하므로 --stream (단일 프로세스) 과 같은 결과를 만든다.
+    worker 는 --max-urls 를 적용 하지 않은 endpoint 로 집계 하고, 부모 의 result 에서 합친 요청 수 로 한 번만 적용 한다.
+    """
+    ranges = parser.split_byte_ranges(path, workers)
+    print(f"[INFO] Aggregating {len(ranges)} shards with {workers} worker processes")
+
+    aggregator = StreamingAggregator(relative_accuracy, url_templater)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(aggregate_shard, str(path), byte_range, chunk_size, relative_accuracy, csv_engine, row_filter,
+                            url_templater)
+            for byte_range in ranges
+        ]
+        for i, future in enumerate(futures):
+            with profiler.stage("parallel.wait_shard") as record:
+                shard = future.result()
+                record.rows = shard.rows
+            profiler.call(aggregator.merge, shard)
+            print(f"[INFO] Merged shard {i + 1}/{len(futures)} ({shard.rows:,} rows)")
+
+    return profiler.call(aggregator.result, row_filter)
+
+
+def aggregate_shard(path: str, byte_range: Tuple[int, int], chunk_size: int,
+                    relative_accuracy: float, csv_engine: str = "pandas",
+                    row_filter: Optional[parser.RowFilter] = None,
+                    url_templater: Optional[UrlTemplater] = None) -> StreamingAggregator:
+    """
+    worker 프로세스 에서 실행: 한 구간 을 집계 한 부분 상태(StreamingAggregator)를 반환
+    """
+    aggregator = StreamingAggregator(relative_accuracy, url_templater)
+    for chunk in parser.iter_csv_chunks(path, chunk_size, byte_range=byte_range, engine=csv_engine,
+                                        row_filter=row_filter):
+        aggregator.update(chunk)
+    return aggregator
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
@@ -1,36 +1,486 @@
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Union
+from typing import Iterator, Optional, Tuple, Union
 
+try:
+    # 설치 되어 있으면 orjson 으로 JSON 디코딩 (표준 json 보다 수 배 빠름)
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 필요한 열만 남기기
+KEEP_COLUMNS = [
+    "metric_name",      # 어떤 메트릭 인지 (http_req_duration 등)
+    "timestamp",        # epoch 초 (시간대 변환은 리포트 렌더링 시점 에만)
+    "metric_value",     # 수치값
+    "check",            # checks 이름
+    "url",              # 요청 URL
+    "name",             # k6 name 태그 (기본값 은 url, URL 템플릿 단계 에서 url 에 합쳐진다)
+    "status",           # HTTP 상태 코드
+    "error",            # 에러 내용
+    "method",           # HTTP method
+    "scenario",         # k6 scenario 이름
+    "group",            # k6 group 경로 (root group 은 빈 값)
+    "expected_response" # 기대한 응답 인지 (true / false)
+]
+
+# 반복 되는 문자열 컬럼 은 category(정수 코드 + 사전)로 읽는다
+CATEGORY_COLUMNS = ["metric_name", "check", "url", "name", "status", "error", "method", "scenario", "group",
+                    "expected_response"]
+
+# 수치 컬럼 은 정제(NaN 제거) 직후 compact 타입 으로 변환
+NUMERIC_DTYPES = {
+    "metric_value": "float32",
+    "timestamp": "int64",       # epoch 초
+}
+
+# CSV 파싱 방식. pandas: pd.read_csv, mmap: csv_tokenizer (압축 되지 않은 CSV 만, 안 되면 pandas 로 대체)
+CSV_ENGINES = ("pandas", "mmap")
+
+# k6 --out json (NDJSON) 입력. tags 중 KEEP_COLUMNS 에 해당 하는 키만 컬럼 으로 꺼낸다
+JSON_SUFFIXES = (".json", ".ndjson")
+JSON_TAG_COLUMNS = ["check", "url", "name", "status", "error", "method", "scenario", "group", "expected_response"]
+
+
+class RowFilter:
+    """
+    파싱 중에 적용 하는 행 조건 (predicate pushdown). 조건 에 맞지 않는 행은 DataFrame 으로 모으지 않는다.
+
+    - 시간 구간: start <= timestamp < end (epoch 초, None 이면 제한 없음)
+    - metric: metrics 에 있는 이름만 (None 이면 전부), exclude_metrics 에 있는 이름은 제외
+    """
+
+    def __init__(self, start: Optional[int] = None, end: Optional[int] = None,
+                 metrics: Optional[list] = None, exclude_metrics: Optional[list] = None):
+        if start is not None and end is not None and start >= end:
+            raise ValueError(f"[ERROR] Empty time window: --from must be before --to ({start} >= {end})")
+        self.start = start
+        self.end = end
+        self.metrics = frozenset(metrics) if metrics else None
+        self.exclude_metrics = frozenset(exclude_metrics or ())
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, RowFilter) and vars(self) == vars(other)
+
+    @property
+    def active(self) -> bool:
+        return self.start is not None or self.end is not None or self.metrics is not None or bool(self.exclude_metrics)
+
+    def shifted(self, seconds: int) -> "RowFilter":
+        """
+        시간 구간 을 seconds 만큼 옮긴 RowFilter (시계가 어긋난 노드 의 원본 timestamp 에 적용할 때 사용)
+        """
+        shifted = RowFilter(metrics=self.metrics, exclude_metrics=self.exclude_metrics)
+        shifted.start = self.start + seconds if self.start is not None else None
+        shifted.end = self.end + seconds if self.end is not None else None
+        return shifted
+
+    def metric_allowed(self, name: str) -> bool:
+        return (self.metrics is None or name in self.metrics) and name not in self.exclude_metrics
+
+    def metric_mask(self, names) -> np.ndarray:
+        """
+        metric 이름 목록(카테고리 목록 등) 각각이 조건 에 맞는지
+        """
+        return np.fromiter((self.metric_allowed(name) for name in names), dtype=bool, count=len(names))
+
+    def time_mask(self, timestamps: np.ndarray) -> np.ndarray:
+        timestamps = np.asarray(timestamps)
+        mask = np.ones(len(timestamps), dtype=bool)
+        if self.start is not None:
+            mask &= timestamps >= self.start
+        if self.end is not None:
+            mask &= timestamps < self.end
+        return mask
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        clean_frame 을 거친 DataFrame 에서 조건 에 맞는 행만 남긴다
+        """
+        mask = self.time_mask(df["timestamp"].to_numpy())
+        if self.metrics is not None or self.exclude_metrics:
+            names = df["metric_name"]
+            if isinstance(names.dtype, pd.CategoricalDtype):
+                allowed = np.append(self.metric_mask(names.cat.categories), False)
+                mask &= allowed[names.cat.codes.to_numpy()]  # 코드 -1 은 마지막 (False)
+            else:
+                mask &= names.map(self.metric_allowed).to_numpy(dtype=bool)
+        return df if mask.all() else df[mask]
+
+    def describe(self, timezone: str) -> str:
+        import utils
+        parts = []
+        if self.start is not None or self.end is not None:
+            start = utils.to_datetime(self.start, timezone).strftime("%Y-%m-%d %H:%M:%S") if self.start is not None else "-"
+            end = utils.to_datetime(self.end, timezone).strftime("%Y-%m-%d %H:%M:%S") if self.end is not None else "-"
+            parts.append(f"time [{start}, {end})")
+        if self.metrics is not None:
+            parts.append(f"metrics {sorted(self.metrics)}")
+        if self.exclude_metrics:
+            parts.append(f"excluding {sorted(self.exclude_metrics)}")
+        return ", ".join(parts)
+
+
+# HTTP 요청 요약 카드 의 필드 가 쓰는 metric (--metrics / --exclude-metrics 로 빠지면 해당 필드 는 비어 있다)
+SUMMARY_METRIC_FIELDS = {
+    "http_reqs": ("total_reqs",),
+    "http_req_failed": ("tps", "failed_reqs", "success_reqs", "success_rate", "errors"),
+    "vus": ("vus_min", "vus_max"),
+}
+
+
+def build_row_filter(path: Union[str, Path], time_from: Optional[str] = None, time_to: Optional[str] = None,
+                     metrics: Optional[list] = None, exclude_metrics: Optional[list] = None,
+                     timezone: str = "Asia/Seoul", origin: Optional[int] = None) -> Optional[RowFilter]:
+    """
+    --from/--to/--metrics/--exclude-metrics 값 으로 RowFilter 생성 (조건 이 없으면 None)
+    offset("3m") 은 origin (없으면 파일 앞부분 의 첫 timestamp = 테스트 시작) 기준 으로 절대 시각 으로 바꾼다
+    """
+    import utils
+    start = end = None
+    if time_from or time_to:
+        origin = first_timestamp(path) if origin is None else origin
+        start = utils.parse_time_bound(time_from, origin, timezone) if time_from else None
+        end = utils.parse_time_bound(time_to, origin, timezone) if time_to else None
+
+    row_filter = RowFilter(start, end, metrics, exclude_metrics)
+    if not row_filter.active:
+        return None
+    print(f"[INFO] Row filter: {row_filter.describe(timezone)}")
+    for metric, fields in SUMMARY_METRIC_FIELDS.items():
+        if not row_filter.metric_allowed(metric):
+            print(f"[WARN] Metric {metric} is filtered out, summary fields will be empty: {', '.join(fields)}")
+    return row_filter
 
-def load_csv(path: Union[str, Path]) -> pd.DataFrame:
-    path = Path(path)
-    if not path.exists():
-        raise FileNotFoundError(f"[ERROR] File not found: {path}")
+
+def first_timestamp(path: Union[str, Path], sample_rows: int = 10_000) -> int:
+    """
+    파일 앞부분 sample_rows 행 중 가장 이른 timestamp (테스트 시작 시각, epoch 초)
+    """
+    chunk = next(iter_result_chunks(path, sample_rows), None)
+    if chunk is None or chunk.empty:
+        raise ValueError(f"[ERROR] No rows to determine the test start time: {path}")
+    return int(chunk["timestamp"].min())
+
+
+def load_csv(path: Union[str, Path], engine: str = "pandas", row_filter: Optional[RowFilter] = None) -> pd.DataFrame:
+    path = _check_path(path)
+
+    if _use_tokenizer(path, engine):
+        import csv_tokenizer
+        try:
+            return clean_frame(csv_tokenizer.read_csv(path, row_filter=row_filter))
+        except csv_tokenizer.UnsupportedLayout as e:
+            print(f"[WARN] mmap engine: {e}, falling back to pandas")
+
+    if row_filter is not None:
+        # chunk 단위로 읽으면서 조건 에 맞는 행만 모은다 (전체 행을 한 번에 올리지 않음)
+        return concat_frames(list(iter_csv_chunks(path, row_filter=row_filter)))
 
     try:
-        df = pd.read_csv(path)
+        df = _read_csv(path)
     except Exception as e:
         raise ValueError(f"[ERROR] Failed to parse CSV: {e}")
 
-    # 핵심 컬럼 타입 정제
+    return clean_frame(df)
+
+
+def load_results(path: Union[str, Path], engine: str = "pandas", row_filter: Optional[RowFilter] = None) -> pd.DataFrame:
+    """
+    k6 결과 파일(.csv, .json, 각각 .gz 포함)을 읽어서 load_csv 와 같은 컬럼/타입의 DataFrame 반환
+    engine 은 CSV 입력 에만 적용
+    """
+    if not is_json(path):
+        return load_csv(path, engine, row_filter)
+    return concat_frames(list(iter_json_chunks(path, row_filter=row_filter)))
+
+
+def concat_frames(chunks: list) -> pd.DataFrame:
+    """
+    chunk 들을 하나의 DataFrame 으로 합친다
+    chunk 마다 카테고리 목록이 달라서 concat 하면 object 가 되므로, 다시 category 로 맞춘다
+    """
+    if not chunks:
+        return clean_frame(pd.DataFrame({col: pd.Series(dtype="object") for col in KEEP_COLUMNS}))
+    df = pd.concat(chunks, ignore_index=True)
+    return df.astype({col: "category" for col in CATEGORY_COLUMNS if col in df.columns})
+
+
+def iter_result_chunks(path: Union[str, Path], chunk_size: int = 1_000_000, engine: str = "pandas",
+                       row_filter: Optional[RowFilter] = None) -> Iterator[pd.DataFrame]:
+    """
+    파일 형식에 맞춰 iter_csv_chunks / iter_json_chunks 중 하나로 chunk 단위 읽기
+    """
+    if is_json(path):
+        return iter_json_chunks(path, chunk_size, row_filter)
+    return iter_csv_chunks(path, chunk_size, engine=engine, row_filter=row_filter)
+
+
+def iter_json_chunks(path: Union[str, Path], chunk_size: int = 1_000_000,
+                     row_filter: Optional[RowFilter] = None) -> Iterator[pd.DataFrame]:
+    """
+    k6 NDJSON 결과(--out json, .gz 면 압축을 풀면서)를 chunk_size 줄 단위로 디코딩 해서
+    load_csv 와 같은 컬럼/타입의 DataFrame 을 순서 대로 반환 (압축 해제 파일을 디스크 에 만들지 않음)
+
+    "type": "Point" 줄만 사용 하고, Metric 정의 줄은 건너뛴다.
+    """
+    path = _check_path(path)
+    opener = gzip.open if is_compressed(path) else open
+
+    with opener(path, "rt", encoding="utf-8") as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                break
+            chunk = _decode_json_points(lines, row_filter)
+            if not chunk.empty:
+                yield chunk
+
+
+def is_json(path: Union[str, Path]) -> bool:
+    return _base_suffix(path) in JSON_SUFFIXES
+
+
+def is_compressed(path: Union[str, Path]) -> bool:
+    return Path(path).suffix == ".gz"
+
+
+def is_plain_csv(path: Union[str, Path]) -> bool:
+    """
+    바이트 위치 로 나눠 읽을 수 있는 (압축 되지 않은) CSV 인지
+    """
+    return Path(path).suffix == ".csv"
+
+
+def result_stem(path: Union[str, Path]) -> str:
+    """
+    출력 파일 이름에 쓸 입력 파일 이름 (확장자 와 .gz 제거. run.json.gz -> run)
+    """
+    path = Path(path)
+    if is_compressed(path):
+        path = path.with_suffix("")
+    return path.stem
+
+
+def iter_csv_chunks(path: Union[str, Path], chunk_size: int = 1_000_000,
+                    byte_range: Optional[Tuple[int, int]] = None, engine: str = "pandas",
+                    row_filter: Optional[RowFilter] = None) -> Iterator[pd.DataFrame]:
+    """
+    CSV 를 chunk_size 행 단위로 읽어서 load_csv 와 같은 정제를 거친 DataFrame 을 순서 대로 반환
+    파일 전체를 메모리에 올리지 않으므로, 파일 크기와 무관 하게 chunk 하나 분량의 메모리만 사용
+
+    byte_range=(start, end) 를 주면 해당 바이트 구간 의 행만 읽는다 (split_byte_ranges 결과 사용)
+    row_filter 를 주면 조건 에 맞는 행만 남기고, 남는 행이 없는 chunk 는 건너뛴다
+    """
+    path = _check_path(path)
+
+    if _use_tokenizer(path, engine):
+        import csv_tokenizer
+        chunks = csv_tokenizer.iter_csv_chunks(path, chunk_size, byte_range, row_filter)
+        try:
+            first = next(chunks, None)
+        except csv_tokenizer.UnsupportedLayout as e:
+            print(f"[WARN] mmap engine: {e}, falling back to pandas")
+        else:
+            for chunk in itertools.chain([first] if first is not None else [], chunks):
+                chunk = clean_frame(chunk)
+                if not chunk.empty:
+                    yield chunk
+            return
+
+    try:
+        if byte_range is None:
+            with _read_csv(path, chunksize=chunk_size) as reader:
+                yield from _filter_chunks(reader, row_filter)
+        else:
+            names = read_header(path)
+            with io.BufferedReader(_ByteRangeReader(path, *byte_range)) as source:
+                with _read_csv(source, chunksize=chunk_size, header=None, names=names) as reader:
+                    yield from _filter_chunks(reader, row_filter)
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise ValueError(f"[ERROR] Failed to parse CSV: {e}")
+
+
+def parse_csv_block(data: bytes, names: list, row_filter: Optional[RowFilter] = None) -> pd.DataFrame:
+    """
+    헤더 없는 CSV 행 묶음(완전한 줄 들의 바이트) 을 load_csv 와 같은 정제를 거친 DataFrame 으로 변환
+    """
+    try:
+        df = clean_frame(_read_csv(io.BytesIO(data), header=None, names=names, index_col=False))
+        return row_filter.apply(df) if row_filter is not None else df
+    except (pd.errors.ParserError, UnicodeDecodeError) as e:
+        raise ValueError(f"[ERROR] Failed to parse CSV: {e}")
+
+
+def read_header(path: Union[str, Path]) -> list:
+    """
+    CSV 첫 줄(컬럼 이름 목록)
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return next(csv.reader(f))
+
+
+def split_byte_ranges(path: Union[str, Path], n: int) -> list:
+    """
+    헤더 를 제외한 본문 을 n 개의 (start, end) 바이트 구간 으로 나눈다. 구간 경계는 항상 줄 시작 위치.
+
+    k6 CSV 의 필드 에는 줄바꿈 이 들어가지 않으므로, 줄 단위로 자르면 행이 쪼개지지 않는다.
+    """
+    path = _check_path(path)
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        f.readline()
+        body_start = f.tell()
+
+        boundaries = [body_start]
+        for i in range(1, n):
+            target = body_start + (size - body_start) * i // n
+            if target <= boundaries[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()  # target 이 속한 줄의 끝까지 건너뛰기
+            boundaries.append(min(f.tell(), size))
+        boundaries.append(size)
+
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    k6 원본 DataFrame 의 타입을 정제 하고, NaN 행과 불필요한 열을 제거
+    """
+    # 핵심 컬럼 타입 정제 (이미 숫자로 읽힌 컬럼 은 그대로, 깨진 값은 NaN)
     df["metric_value"] = pd.to_numeric(df["metric_value"], errors="coerce")
     df["timestamp"] = pd.to_numeric(df["timestamp"], errors="coerce")
-    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="s", utc=True).dt.tz_convert("Asia/Seoul")
 
     # NaN 행 제거
     df = df.dropna(subset=["metric_name", "metric_value", "timestamp"])
 
-    # 필요한 열만 남기기
-    keep_columns = [
-        "metric_name",      # 어떤 메트릭 인지 (http_req_duration 등)
-        "timestamp",        # 시분초
-        "metric_value",     # 수치값
-        "check",            # checks 이름
-        "url",              # 요청 URL
-        "status",           # HTTP 상태 코드
-        "error"             # 에러 내용
-    ]
-    df = df[[col for col in keep_columns if col in df.columns]]
+    df = df.astype(NUMERIC_DTYPES)
+
+    df = df[[col for col in KEEP_COLUMNS if col in df.columns]]
 
     return df
+
+
+def memory_footprint(df: pd.DataFrame) -> int:
+    """
+    DataFrame 이 차지 하는 메모리 (문자열/카테고리 사전 포함, 바이트)
+    """
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _decode_json_points(lines: list, row_filter: Optional[RowFilter] = None) -> pd.DataFrame:
+    names, times, values = [], [], []
+    tags = {col: [] for col in JSON_TAG_COLUMNS}
+
+    for line in lines:
+        try:
+            record = _json_loads(line)
+        except ValueError as e:
+            if not line.strip():
+                continue
+            raise ValueError(f"[ERROR] Failed to parse JSON line: {e}")
+        if record.get("type") != "Point":
+            continue
+        if row_filter is not None and not row_filter.metric_allowed(record["metric"]):
+            continue
+
+        data = record["data"]
+        point_tags = data.get("tags") or {}
+        names.append(record["metric"])
+        # 초 단위 epoch 만 필요 하므로 소수점 이하를 버린 "YYYY-MM-DDTHH:MM:SS+09:00" 로 줄여서 중복 을 늘린다
+        time = data["time"]
+        times.append(time[:19] + time[19:].lstrip(".0123456789"))
+        values.append(data["value"])
+        for col in JSON_TAG_COLUMNS:
+            tags[col].append(point_tags.get(col))
+
+    # RFC3339 시각(시간대 offset 포함) → CSV 와 같은 epoch 초. 같은 초는 한 번만 파싱 (cache)
+    timestamps = pd.to_datetime(times, utc=True, format="ISO8601", cache=True).as_unit("s").asi8
+
+    df = pd.DataFrame({
+        "metric_name": pd.Categorical(names),
+        "timestamp": timestamps,
+        "metric_value": values,
+        **{col: pd.Categorical([None if v == "" else v for v in tags[col]]) for col in JSON_TAG_COLUMNS},
+    })
+    df = clean_frame(df)
+    return row_filter.apply(df) if row_filter is not None else df
+
+
+def _base_suffix(path: Union[str, Path]) -> str:
+    path = Path(path)
+    return path.with_suffix("").suffix if is_compressed(path) else path.suffix
+
+
+def _filter_chunks(reader, row_filter: Optional[RowFilter]) -> Iterator[pd.DataFrame]:
+    for chunk in reader:
+        chunk = clean_frame(chunk)
+        if row_filter is not None:
+            chunk = row_filter.apply(chunk)
+        if not chunk.empty:
+            yield chunk
+
+
+def _use_tokenizer(path: Path, engine: str) -> bool:
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"[ERROR] Unknown CSV engine: {engine} (choose from {', '.join(CSV_ENGINES)})")
+    if engine == "mmap" and not is_plain_csv(path):
+        print(f"[WARN] The mmap engine only reads uncompressed CSV, using pandas: {path}")
+        return False
+    return engine == "mmap"
+
+
+def _read_csv(path: Path, **kwargs):
+    """
+    필요한 컬럼만, 문자열 컬럼 은 category 로 읽기
+    """
+    return pd.read_csv(
+        path,
+        usecols=lambda col: col in KEEP_COLUMNS,
+        dtype={col: "category" for col in CATEGORY_COLUMNS},
+        **kwargs,
+    )
+
+
+class _ByteRangeReader(io.RawIOBase):
+    """
+    파일의 [start, end) 구간 만 읽는 file-like 객체
+    """
+
+    def __init__(self, path: Path, start: int, end: int):
+        self.file = open(path, "rb")
+        self.file.seek(start)
+        self.remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self.remaining)
+        if size <= 0:
+            return 0
+        read = self.file.readinto(memoryview(buffer)[:size])
+        self.remaining -= read
+        return read
+
+    def close(self) -> None:
+        self.file.close()
+        super().close()
+
+
+def _check_path(path: Union[str, Path]) -> Path:
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"[ERROR] File not found: {path}")
+    return path
@@ -0,0 +1,220 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional, Union
+
+import utils
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Linux 는 /proc/self/clear_refs 로 단계 마다 최대 RSS(VmHWM) 를 초기화 해서 단계 별 최대 RSS 를 잰다.
+# 다른 OS 는 프로세스 시작 이후 최대 RSS (getrusage) 를 기록 한다
+_STATUS_FILE = Path("/proc/self/status")
+_CLEAR_REFS_FILE = Path("/proc/self/clear_refs")
+
+# 현재 활성 프로파일러 (없으면 stage() 는 아무것도 하지 않는다)
+_active = None
+
+
+class StageProfiler:
+    """
+    main.main 의 단계 (파싱, 집계, HTML 작성 ...) 와 process_data 안의 analyzer 호출 을 중첩 구간 으로 기록 하는 프로파일러
+
+    구간 마다 wall time, CPU time (프로세스 user + sys), 최대 RSS, 처리 행 수 를 남기고,
+    표 (print_table) 와 Chrome trace 형식 JSON (save_trace, chrome://tracing / Perfetto 에서 열림) 으로 출력 한다.
+    """
+
+    def __init__(self):
+        self.records = []
+        self._stack = []
+        self._origin = time.perf_counter()
+        self._per_stage_peak = _reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent.peak_rss = max(parent.peak_rss, _peak_rss())
+        self._per_stage_peak = _reset_peak_rss()
+
+        path = (parent.path if parent is not None else ()) + (name,)
+        record = SimpleNamespace(name=name, path=path, depth=len(self._stack), rows=rows, start=time.perf_counter(),
+                                 wall=0.0, cpu=0.0, peak_rss=_current_rss())
+        self.records.append(record)
+        self._stack.append(record)
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record.cpu = time.process_time() - cpu_start
+            record.wall = time.perf_counter() - record.start
+            record.peak_rss = max(record.peak_rss, _peak_rss())
+            self._stack.pop()
+            if parent is not None:
+                parent.peak_rss = max(parent.peak_rss, record.peak_rss)
+
+    def summary(self) -> list:
+        """
+        같은 경로 (부모 단계 이름들 + 이름) 의 구간 을 합친 표 행 목록 (처음 나온 순서, chunk 단위 반복 구간 은 calls 로 합산)
+        """
+        rows = {}
+        for r in self.records:
+            row = rows.setdefault(r.path, {"name": r.name, "depth": r.depth, "calls": 0, "wall": 0.0, "cpu": 0.0,
+                                           "peak_rss": 0, "rows": None})
+            row["calls"] += 1
+            row["wall"] += r.wall
+            row["cpu"] += r.cpu
+            row["peak_rss"] = max(row["peak_rss"], r.peak_rss)
+            if r.rows is not None:
+                row["rows"] = (row["rows"] or 0) + r.rows
+        return list(rows.values())
+
+    def print_table(self) -> None:
+        summary = self.summary()
+        total = sum(row["wall"] for row in summary if row["depth"] == 0) or 1.0
+        print("\n===== 단계 별 프로파일 =====")
+        print(f"{'stage':<52} {'calls':>6} {'wall':>9} {'cpu':>9} {'cpu%':>5} {'share':>6} {'peak RSS':>10} "
+              f"{'rows':>13} {'rows/s':>12}")
+        for row in summary:
+            name = "  " * row["depth"] + row["name"]
+            wall, cpu = row["wall"], row["cpu"]
+            cpu_ratio = f"{cpu / wall * 100:.0f}" if wall > 0 else "-"
+            rows = f"{row['rows']:,}" if row["rows"] is not None else "-"
+            rate = f"{row['rows'] / wall:,.0f}" if row["rows"] and wall > 0 else "-"
+            print(f"{name:<52} {row['calls']:>6} {wall:>8.3f}s {cpu:>8.3f}s {cpu_ratio:>5} {wall / total * 100:>5.1f}% "
+                  f"{utils.format_bytes(row['peak_rss']):>10} {rows:>13} {rate:>12}")
+        if not self._per_stage_peak:
+            print("(peak RSS: process high-water mark, per-stage reset is Linux only)")
+
+    def to_trace(self, metadata: Optional[dict] = None) -> dict:
+        """
+        Chrome trace event 형식 (완료 이벤트 "X", 마이크로초) dict
+        """
+        pid = os.getpid()
+        events = [{
+            "name": r.name,
+            "cat": r.name.split(".")[0],
+            "ph": "X",
+            "ts": round((r.start - self._origin) * 1e6, 1),
+            "dur": round(r.wall * 1e6, 1),
+            "pid": pid,
+            "tid": 0,
+            "args": {"cpu_ms": round(r.cpu * 1e3, 3), "peak_rss_bytes": int(r.peak_rss), "rows": r.rows,
+                     "depth": r.depth},
+        } for r in self.records]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "argv": sys.argv,
+                "peak_rss_scope": "stage" if self._per_stage_peak else "process",
+                **(metadata or {}),
+            },
+        }
+
+    def save_trace(self, path: Union[str, Path], metadata: Optional[dict] = None) -> Path:
+        path = Path(path)
+        path.write_text(json.dumps(self.to_trace(metadata), ensure_ascii=False, indent=1), encoding="utf-8")
+        return path
+
+
+@contextmanager
+def profiling(enabled: bool = True):
+    """
+    with 블록 동안 StageProfiler 를 활성화 (enabled=False 면 None 을 넘기고 아무것도 기록 하지 않는다)
+    """
+    global _active
+    if not enabled:
+        yield None
+        return
+    previous, _active = _active, StageProfiler()
+    try:
+        yield _active
+    finally:
+        _active = previous
+
+
+@contextmanager
+def stage(name: str, rows: Optional[int] = None):
+    """
+    활성 프로파일러 가 있으면 구간 으로 기록 (record.rows 를 나중에 채울 수 있다), 없으면 아무것도 하지 않는다
+    """
+    if _active is None:
+        yield SimpleNamespace(rows=rows)
+        return
+    with _active.stage(name, rows) as record:
+        yield record
+
+
+def call(fn, *args, **kwargs):
+    """
+    fn(*args, **kwargs) 를 "모듈.함수" 이름의 구간 으로 기록 하며 실행
+    """
+    if _active is None:
+        return fn(*args, **kwargs)
+    with _active.stage(f"{fn.__module__}.{fn.__qualname__}"):
+        return fn(*args, **kwargs)
+
+
+def iterate(name: str, iterable):
+    """
+    iterable 에서 항목 (chunk) 을 꺼내는 시간 을 항목 마다 name 구간 으로 기록 (rows = len(항목))
+    """
+    iterator = iter(iterable)
+    while True:
+        with stage(name) as record:
+            item = next(iterator, None)
+            if item is not None:
+                record.rows = len(item)
+        if item is None:
+            return
+        yield item
+
+
+def trace_path(html_output: Union[str, Path]) -> Path:
+    """
+    리포트 HTML 옆에 저장할 trace 파일 경로 (report.html → report.profile.json)
+    """
+    return Path(html_output).with_suffix(".profile.json")
+
+
+def _reset_peak_rss() -> bool:
+    # VmHWM 을 현재 RSS 로 초기화 (성공 하면 True)
+    try:
+        _CLEAR_REFS_FILE.write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> int:
+    hwm = _status_kib("VmHWM")
+    if hwm is not None:
+        return hwm * 1024
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # macOS 는 바이트, Linux 는 KiB
+
+
+def _current_rss() -> int:
+    rss = _status_kib("VmRSS")
+    return rss * 1024 if rss is not None else 0
+
+
+def _status_kib(field: str) -> Optional[int]:
+    try:
+        with _STATUS_FILE.open() as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
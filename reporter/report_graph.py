@@ -0,0 +1,92 @@
+from collections.abc import Mapping
+from typing import Callable, Optional
+
+import profiler
+
+
+class Ref:
+    """
+    ReportGraph.add 의 keyword 인자 로 다른 섹션 값 (key 를 주면 그 값의 [key]) 을 넘길 때 쓰는 표시
+    """
+
+    def __init__(self, name: str, key=None):
+        self.name = name
+        self.key = key
+
+
+def ref(name: str, key=None) -> Ref:
+    return Ref(name, key)
+
+
+class ReportGraph(Mapping):
+    """
+    이름 붙은 섹션 과 의존 관계 를 선언 해 두고, 꺼내는 섹션 (과 그 의존 섹션) 만 한 번씩 계산 하는 지연 계산 dict
+
+    process_data / StreamingAggregator.result 가 반환 하는 값. data["detail_table"] 처럼 읽을 때 처음 계산 하고 결과 를 기억 한다.
+    public=False 인 섹션 (MetricIndex 등 중간값) 은 의존 으로만 쓰이고 키 목록 에는 나오지 않는다.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+        self._values = {}
+        self._public = []
+
+    def add(self, name: str, fn: Callable, *deps: str, public: bool = True, **kwargs) -> "ReportGraph":
+        """
+        name 섹션 = fn(*[deps 섹션 값], **kwargs) (kwargs 의 Ref 는 해당 섹션 값 으로 바뀐다)
+        """
+        self._nodes[name] = (fn, deps, kwargs)
+        if public and name not in self._public:
+            self._public.append(name)
+        return self
+
+    def value(self, name: str, value, public: bool = True) -> "ReportGraph":
+        """
+        이미 계산 된 값을 섹션 으로 등록
+        """
+        self._values[name] = value
+        if public and name not in self._public:
+            self._public.append(name)
+        return self
+
+    def __getitem__(self, name: str):
+        if name in self._values:
+            return self._values[name]
+        if name not in self._nodes:
+            raise KeyError(name)
+
+        fn, deps, kwargs = self._nodes[name]
+        args = [self[dep] for dep in deps]
+        kwargs = {key: self._resolve(value) for key, value in kwargs.items()}
+        self._values[name] = profiler.call(fn, *args, **kwargs)
+        return self._values[name]
+
+    def _resolve(self, value):
+        if not isinstance(value, Ref):
+            return value
+        resolved = self[value.name]
+        return resolved if value.key is None else resolved[value.key]
+
+    def __contains__(self, name) -> bool:
+        return name in self._nodes or name in self._values
+
+    def __iter__(self):
+        return iter(self._public)
+
+    def __len__(self) -> int:
+        return len(self._public)
+
+    @property
+    def computed(self) -> list:
+        """
+        지금까지 계산 (또는 등록) 된 섹션 이름
+        """
+        return [name for name in self._public if name in self._values]
+
+    def compute(self, names: Optional[list] = None) -> "ReportGraph":
+        """
+        names (없으면 모든 공개 섹션) 를 미리 계산
+        """
+        for name in names if names is not None else self._public:
+            self[name]
+        return self
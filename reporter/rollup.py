@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+# 차트 시계열 롤업 해상도 (초). 리포트 에는 모든 해상도 를 담고, 확대 하면 더 세밀한 롤업 을 그린다
+ROLLUP_INTERVALS = (1, 10, 60, 600)
+
+# 롤업 하나에 담을 최대 버킷 수. 넘는 해상도 는 계산 / 저장 하지 않는다 (가장 큰 간격 은 항상 포함)
+ROLLUP_MAX_POINTS = 20_000
+
+# 차트 에 한 번에 그리는 시리즈 별 최대 점 수 (LTTB 로 줄인다)
+CHART_MAX_POINTS = 1_000
+
+# 보이는 구간 의 점 수가 CHART_MAX_POINTS 의 이 배수 이하 인 가장 세밀한 롤업 을 골라서 LTTB 로 줄인다
+LTTB_MAX_RATIO = 4
+
+
+def rollup_intervals(duration_sec: int, intervals=ROLLUP_INTERVALS) -> list:
+    """
+    테스트 시간(초) 에 대해 버킷 수가 ROLLUP_MAX_POINTS 이하 인 롤업 간격 목록 (작은 간격 부터)
+    """
+    kept = [interval for interval in intervals if duration_sec // interval + 1 <= ROLLUP_MAX_POINTS]
+    return kept or [max(intervals)]
+
+
+def select_interval(point_counts: dict, n_max: int = CHART_MAX_POINTS) -> int:
+    """
+    {롤업 간격: 보이는 구간 의 점 수} 중 점 수가 n_max * LTTB_MAX_RATIO 이하 인 가장 작은 간격 (없으면 가장 큰 간격)
+    """
+    fitting = [interval for interval, count in point_counts.items() if count <= n_max * LTTB_MAX_RATIO]
+    return min(fitting) if fitting else max(point_counts)
+
+
+def rebin_first(df: pd.DataFrame, interval_sec: int) -> pd.DataFrame:
+    """
+    timestamp 순 시계열 을 interval_sec 버킷 의 첫 값으로 다시 묶는다 (VU 롤업)
+    """
+    bucket = df["timestamp"] - df["timestamp"] % interval_sec
+    return df.groupby(bucket, sort=True).first().drop(columns="timestamp").rename_axis("timestamp").reset_index()
+
+
+def rebin_sum(df: pd.DataFrame, interval_sec: int) -> pd.DataFrame:
+    """
+    timestamp 별 건수 시계열 을 interval_sec 버킷 합계 로 다시 묶는다 (요청 / 실패 건수 롤업)
+    """
+    bucket = df["timestamp"] - df["timestamp"] % interval_sec
+    return df.drop(columns="timestamp").groupby(bucket, sort=True).sum().rename_axis("timestamp").reset_index()
+
+
+def lttb_indices(x, y, n_out: int = CHART_MAX_POINTS) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링 으로 남길 점의 위치 (오름차순, 첫 / 마지막 점 포함)
+
+    가운데 점들을 n_out - 2 개 구간 으로 나누고, 구간 마다 (앞에서 고른 점, 현재 점, 다음 구간 평균) 삼각형 넓이가
+    가장 큰 점 하나를 고른다. 평균 / 간격 샘플링 과 달리 짧은 스파이크 가 남는다. NaN 은 0 으로 본다.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype="float64")
+    y = np.nan_to_num(np.asarray(y, dtype="float64"))
+    every = (n - 2) / (n_out - 2)
+    edges = np.append(np.floor(np.arange(n_out - 1) * every).astype("int64") + 1, n)
+
+    selected = np.empty(n_out, dtype="int64")
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        cx, cy = x[end:next_end].mean(), y[end:next_end].mean()
+        area = np.abs((x[a] - cx) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (cy - y[a]))
+        a = start + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
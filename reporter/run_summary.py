@@ -0,0 +1,115 @@
+import json
+import math
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from sketch import QuantileSketch
+
+# 요약 포맷 이 바뀌면 올린다 (load 시 다른 버전 은 거부)
+SUMMARY_VERSION = 1
+
+# 요약 에 담는 duration metric
+DURATION_METRICS = ("http_req_duration", "iteration_duration")
+
+
+def build(test_duration: dict, requests: dict, durations: dict, transfer: dict, urls: dict, checks: dict,
+          relative_accuracy: float, charts: dict = None) -> dict:
+    """
+    실행(run) 하나의 수치 요약 dict 생성 (표시용 문자열 없이 ms / 건수 / 바이트 그대로)
+
+    - requests: total, failed, successes, success_rate, tps, vus_min, vus_max
+    - durations: {metric: (stats, sketch)} - stats 는 avg, min, max, p50 ~ p99 (ms)
+    - transfer: data_received, data_sent (바이트)
+    - urls: {url: (total, fail, stats, sketch)}
+    - checks: {check: (total, success)}
+    - charts: {"vus" | "tps" | "latency": 차트 시계열 DataFrame} - 컬럼별 리스트 로 저장 (이력 저장소 의 시간 버킷 값)
+
+    스케치 를 함께 저장 해서, 나중에 여러 실행을 합치거나 다른 분위수 를 원본 CSV 없이 다시 계산할 수 있다.
+    """
+    return {
+        "version": SUMMARY_VERSION,
+        "relative_accuracy": relative_accuracy,
+        "test_duration": {k: int(v) for k, v in test_duration.items()},
+        "requests": {k: _number(v) for k, v in requests.items()},
+        "durations": {
+            metric: {"stats": _stats(stats), "sketch": sketch.to_dict()}
+            for metric, (stats, sketch) in durations.items() if sketch.count
+        },
+        "transfer": {k: float(v) for k, v in transfer.items()},
+        "urls": {
+            str(url): {"total": int(total), "fail": int(fail), "stats": _stats(stats),
+                       "sketch": sketch.to_dict() if sketch is not None else None}
+            for url, (total, fail, stats, sketch) in sorted(urls.items())
+        },
+        "checks": {str(check): {"total": int(total), "success": int(success)}
+                   for check, (total, success) in sorted(checks.items())},
+        "timeseries": {
+            name: {col: [_number(v) for v in df[col].tolist()] for col in df.columns}
+            for name, df in (charts or {}).items() if not df.empty
+        },
+    }
+
+
+def request_totals(total_reqs: int, failures: int, successes: int, success_rate: float,
+                   vus_min, vus_max, seconds: int) -> dict:
+    """
+    build 의 requests 항목 (tps 는 반올림 하지 않은 성공 요청 / 초)
+    """
+    return {
+        "total": total_reqs,
+        "failed": failures,
+        "successes": successes,
+        "success_rate": success_rate,
+        "tps": successes / seconds if seconds else 0.0,
+        "vus_min": vus_min,
+        "vus_max": vus_max,
+    }
+
+
+def save(path: Union[str, Path], summary: dict) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(summary, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    print(f"[DONE] 실행 요약 저장 완료: {path}")
+    return path
+
+
+def load(path: Union[str, Path]) -> dict:
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"[ERROR] Summary file not found: {path}")
+    summary = json.loads(path.read_text(encoding="utf-8"))
+    if summary.get("version") != SUMMARY_VERSION:
+        raise ValueError(f"[ERROR] Unsupported summary version {summary.get('version')} (expected {SUMMARY_VERSION}): {path}")
+    return summary
+
+
+def summary_path(html_path: Union[str, Path]) -> Path:
+    """
+    리포트 HTML 경로 에 대응 하는 요약 파일 경로 (<stem>_<timestamp>.summary.json)
+    """
+    html_path = Path(html_path)
+    return html_path.with_name(f"{html_path.stem}.summary.json")
+
+
+def sketch_of(summary_part: dict) -> QuantileSketch:
+    """
+    요약 의 durations / urls 항목에 저장된 스케치 복원
+    """
+    return QuantileSketch.from_dict(summary_part["sketch"])
+
+
+def _stats(stats: dict) -> dict:
+    return {k: _number(v) for k, v in stats.items()}
+
+
+def _number(value):
+    # NumPy 스칼라 → 파이썬 숫자, NaN → None (JSON 호환)
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    value = float(value)
+    return None if math.isnan(value) else value
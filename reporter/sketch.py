@@ -0,0 +1,221 @@
+import math
+import numpy as np
+
+# 기본 상대 오차 1% (p99 = 200ms 이면 실제 값은 198 ~ 202ms 사이)
+RELATIVE_ACCURACY = 0.01
+
+# 스케치 하나가 유지 하는 최대 버킷 수. 상대 오차 1% 기준 으로 1µs ~ 1시간 범위를 약 1,100 개 버킷 으로 덮으므로
+# 일반적인 latency 분포 에서는 넘지 않으며, 넘으면 가장 작은 값 쪽 버킷 부터 합쳐서 메모리를 제한 한다.
+MAX_BINS = 2048
+
+
+class QuantileSketch:
+    """
+    로그 스케일 버킷 기반 분위수 스케치 (DDSketch 방식)
+
+    값을 저장 하지 않고 버킷별 건수만 유지 하므로, 샘플 수와 무관 하게 메모리 사용량이 일정 하다.
+    상대 오차(relative_accuracy)가 같은 스케치 끼리는 merge 로 합칠 수 있어서,
+    chunk / 프로세스 / 실행(run) 단위로 나눠 만든 스케치 를 원본 샘플 없이 합산할 수 있다.
+    count, sum, min, max 는 정확한 값을 유지 한다.
+    """
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY, max_bins: int = MAX_BINS):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"[ERROR] relative_accuracy must be in (0, 1): {relative_accuracy}")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.keys = np.empty(0, dtype="int64")
+        self.counts = np.empty(0, dtype="int64")
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, values) -> None:
+        """
+        값 배열을 스케치에 추가
+        """
+        values = np.asarray(values, dtype="float64")
+        if values.size == 0:
+            return
+
+        self.count += int(values.size)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        positive = values[values > 0]
+        self.zero_count += int(values.size - positive.size)
+        if positive.size:
+            keys, counts = np.unique(self.key(positive), return_counts=True)
+            self._add_bins(keys, counts)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """
+        다른 스케치 의 버킷 건수를 합산 (시간 버킷 재구성, chunk / 프로세스 / 실행 간 병합에 사용)
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError(
+                f"[ERROR] Cannot merge sketches with different accuracy: "
+                f"{self.relative_accuracy} != {other.relative_accuracy}"
+            )
+
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.zero_count += other.zero_count
+        self._add_bins(other.keys, other.counts)
+
+    def key(self, values: np.ndarray) -> np.ndarray:
+        """
+        양수 값 배열을 버킷 인덱스로 변환
+        """
+        return np.ceil(np.log(values) / self.log_gamma).astype("int64")
+
+    def value(self, keys) -> np.ndarray:
+        """
+        버킷 인덱스 의 대표값 (버킷 구간 내 상대 오차가 최소가 되는 값)
+        """
+        return 2 * self.gamma ** np.asarray(keys, dtype="float64") / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """
+        q(0 ~ 100) 퍼센타일 근사값 반환. np.percentile 과 같은 rank(q * (n - 1)) 기준
+        """
+        return float(self.quantiles([q])[0])
+
+    def quantiles(self, qs) -> np.ndarray:
+        """
+        여러 퍼센타일 을 한 번의 누적합 으로 계산
+        """
+        qs = np.asarray(qs, dtype="float64")
+        if self.count == 0:
+            return np.full(qs.shape, math.nan)
+
+        ranks = qs / 100 * (self.count - 1)
+        cumulative = self.zero_count + np.cumsum(self.counts)
+        positions = np.searchsorted(cumulative, ranks, side="right")
+
+        result = np.empty(qs.shape, dtype="float64")
+        is_zero = ranks < self.zero_count
+        in_bins = ~is_zero & (positions < len(self.keys))
+        result[is_zero] = max(self.min, 0.0)
+        result[in_bins] = self.value(self.keys[positions[in_bins]])
+        result[~is_zero & ~in_bins] = self.max
+        return np.clip(result, self.min, self.max)
+
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else math.nan
+
+    def stats(self, percentiles=(50, 90, 95, 99)) -> dict:
+        """
+        avg, min, max, p50 ... 형태의 dict 반환
+        """
+        values = self.quantiles(percentiles)
+        return {
+            "avg": self.mean(),
+            "min": self.min,
+            "max": self.max,
+            **{f"p{q}": float(v) for q, v in zip(percentiles, values)},
+        }
+
+    def to_dict(self) -> dict:
+        """
+        JSON 으로 저장 가능한 dict 로 직렬화
+        """
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_bins": self.max_bins,
+            "keys": self.keys.tolist(),
+            "counts": self.counts.tolist(),
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"], data.get("max_bins", MAX_BINS))
+        sketch.keys = np.asarray(data["keys"], dtype="int64")
+        sketch.counts = np.asarray(data["counts"], dtype="int64")
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.min = data["min"] if data["min"] is not None else math.inf
+        sketch.max = data["max"] if data["max"] is not None else -math.inf
+        return sketch
+
+    def _add_bins(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        if len(self.keys):
+            keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+            counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts])).astype("int64")
+        self.keys, self.counts = keys, counts
+        self._collapse()
+
+    def _collapse(self) -> None:
+        # 버킷 수가 max_bins 를 넘으면 가장 작은 값 쪽 버킷 들을 하나로 합친다 (높은 분위수 정확도 우선)
+        overflow = len(self.keys) - self.max_bins
+        if overflow > 0:
+            self.counts[overflow] += self.counts[:overflow].sum()
+            self.keys = self.keys[overflow:]
+            self.counts = self.counts[overflow:]
+
+
+def grouped_sketches(codes: np.ndarray, values: np.ndarray, n_groups: int,
+                     relative_accuracy: float = RELATIVE_ACCURACY) -> list:
+    """
+    그룹 코드(0 ~ n_groups-1)별 스케치 목록 을 한 번의 정렬로 생성
+
+    값 → 버킷 인덱스 변환과 (그룹, 버킷) 별 건수 집계를 전체 배열에 대해 벡터 연산 으로 처리 하고,
+    파이썬 루프는 그룹 수만큼만 돈다.
+    """
+    codes = np.asarray(codes, dtype="int64")
+    values = np.asarray(values, dtype="float64")
+    sketches = [QuantileSketch(relative_accuracy) for _ in range(n_groups)]
+    if values.size == 0:
+        return sketches
+
+    template = sketches[0]
+    counts = np.bincount(codes, minlength=n_groups)
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    mins = np.full(n_groups, math.inf)
+    maxs = np.full(n_groups, -math.inf)
+    np.minimum.at(mins, codes, values)
+    np.maximum.at(maxs, codes, values)
+
+    positive = values > 0
+    zeros = np.bincount(codes[~positive], minlength=n_groups)
+
+    # (그룹, 버킷) 쌍 별 건수
+    pos_codes = codes[positive]
+    pos_keys = template.key(values[positive])
+    order = np.lexsort((pos_keys, pos_codes))
+    pos_codes, pos_keys = pos_codes[order], pos_keys[order]
+    boundary = np.ones(len(pos_keys), dtype=bool)
+    boundary[1:] = (pos_codes[1:] != pos_codes[:-1]) | (pos_keys[1:] != pos_keys[:-1])
+    starts = np.flatnonzero(boundary)
+    pair_codes = pos_codes[starts]
+    pair_keys = pos_keys[starts]
+    pair_counts = np.diff(np.append(starts, len(pos_keys)))
+    group_bounds = np.searchsorted(pair_codes, np.arange(n_groups + 1))
+
+    for g, sketch in enumerate(sketches):
+        if counts[g] == 0:
+            continue
+        sketch.count = int(counts[g])
+        sketch.sum = float(sums[g])
+        sketch.min = float(mins[g])
+        sketch.max = float(maxs[g])
+        sketch.zero_count = int(zeros[g])
+        lo, hi = group_bounds[g], group_bounds[g + 1]
+        sketch.keys = pair_keys[lo:hi].copy()
+        sketch.counts = pair_counts[lo:hi].astype("int64")
+        sketch._collapse()
+    return sketches
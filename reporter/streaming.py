@@ -0,0 +1,432 @@
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+import analyzer
+import cube
+import data_processor
+import errors
+import parser
+import profiler
+import rollup
+import run_summary
+import utils
+from metric_index import MetricIndex
+from report_graph import ReportGraph, ref
+from cube import MetricCube
+from sketch import QuantileSketch, RELATIVE_ACCURACY
+from url_template import UrlTemplater, fold_endpoint
+
+# 요청 / 실패 건수 와 VU 는 1초 단위 (가장 세밀한 롤업), latency 스케치 는 5초 단위로 누적 해 두고,
+# 마지막 에 테스트 시간에 맞는 interval / 롤업 간격 으로 다시 묶는다
+# (determine_interval_seconds 가 반환 하는 5/10/20/30초 는 모두 5의 배수)
+BASE_INTERVAL_SEC = 5
+
+
+class StreamingAggregator:
+    """
+    k6 결과를 chunk 단위로 받아서 process_data 의 모든 섹션을 온라인 으로 누적 하는 집계기
+
+    원본 행은 보관 하지 않고 건수/합계/스케치만 유지 하므로,
+    메모리 사용량은 파일 크기가 아니라 시간 버킷 수, URL 수, check 수에 비례 한다.
+    분위수(p50 ~ p99)는 QuantileSketch 근사값, 나머지 값은 process_data 와 동일 하다.
+    url_templater 를 주면 chunk 마다 url 을 endpoint 템플릿 으로 바꾼 뒤 누적 하고, max_endpoints (--max-urls) 는
+    모든 chunk / shard 를 합친 요청 수 로 result 에서 한 번만 적용 한다 (shard 를 나눈 방식 과 무관 한 결과).
+    """
+
+    def __init__(self, relative_accuracy: float = RELATIVE_ACCURACY, url_templater: Optional[UrlTemplater] = None):
+        self.relative_accuracy = relative_accuracy
+        self.url_templater = url_templater
+        self.rows = 0
+        self.start = None
+        self.end = None
+
+        # 요청 / 실패
+        self.total_reqs = 0
+        self.failed_total = 0
+        self.failed_sum = 0
+        self.error_counts = Counter()
+
+        # Duration, 네트워크, VU
+        self.durations = {
+            "http_req_duration": QuantileSketch(relative_accuracy),
+            "iteration_duration": QuantileSketch(relative_accuracy),
+        }
+        self.transfer = {"data_received": 0.0, "data_sent": 0.0}
+        self.vus_min = np.nan
+        self.vus_max = np.nan
+
+        # 시계열: 건수 / VU 는 초 별 (VU 는 (노드, 초) 별), latency 는 BASE_INTERVAL_SEC 버킷 별
+        self.bucket_vus = {}
+        self.bucket_reqs = Counter()
+        self.bucket_fails = Counter()
+        self.bucket_latency = {}
+
+        # URL / check 별 테이블
+        self.url_reqs = Counter()
+        self.url_fails = Counter()
+        self.url_latency = {}
+        self.url_errors = {}
+        self.check_total = Counter()
+        self.check_success = Counter()
+
+        # 차원 (scenario, group, method, status, expected_response, url) × 시간 버킷 큐브, 상태 코드 × 에러 분류 교차표
+        self.cube = MetricCube(relative_accuracy=relative_accuracy)
+        self.error_crosstab = errors.ErrorCrosstab(BASE_INTERVAL_SEC)
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        parser.clean_frame 을 거친 chunk 하나를 누적
+        """
+        if chunk.empty:
+            return
+        if self.url_templater is not None:
+            chunk = self.url_templater.apply(chunk, limit=False)
+
+        self.rows += len(chunk)
+        epoch = chunk["timestamp"].to_numpy()
+        chunk = chunk.assign(bucket=epoch - epoch % BASE_INTERVAL_SEC)
+
+        chunk_start, chunk_end = int(epoch.min()), int(epoch.max())
+        self.start = chunk_start if self.start is None else min(self.start, chunk_start)
+        self.end = chunk_end if self.end is None else max(self.end, chunk_end)
+
+        # metric_name 별로 한 번만 나눠서 처리
+        index = MetricIndex(chunk)
+        self.cube.update(index)
+        for metric in index.metrics:
+            part = index.get(metric)
+            if metric == "http_reqs":
+                self._update_reqs(part)
+            elif metric == "http_req_failed":
+                self._update_failed(part)
+            elif metric == "http_req_duration":
+                self._update_latency(part)
+            elif metric == "iteration_duration":
+                self.durations[metric].add(part["metric_value"].to_numpy())
+            elif metric in self.transfer:
+                self.transfer[metric] += float(part["metric_value"].astype("float64").sum())
+            elif metric == "vus":
+                self._update_vus(part)
+            elif metric == "checks":
+                self._update_checks(part)
+
+    def _update_reqs(self, part: pd.DataFrame) -> None:
+        self.total_reqs += len(part)
+        self.bucket_reqs.update(_value_counts(part["timestamp"]))
+        self.url_reqs.update(_value_counts(part["url"]))
+
+    def _update_failed(self, part: pd.DataFrame) -> None:
+        self.failed_total += len(part)
+        self.failed_sum += int(part["metric_value"].astype("float64").sum())
+        self.error_crosstab.update(part)
+
+        failed = part[part["metric_value"] == 1]
+        self.bucket_fails.update(_value_counts(failed["timestamp"]))
+        self.url_fails.update(_value_counts(failed["url"]))
+
+        errors = part[part["error"].notna()]
+        if not errors.empty:
+            self.error_counts.update(_value_counts(errors["error"]))
+            for (url, error), cnt in errors.groupby(["url", "error"], observed=True).size().items():
+                self.url_errors.setdefault(url, Counter())[error] += cnt
+
+    def _update_latency(self, part: pd.DataFrame) -> None:
+        self.durations["http_req_duration"].add(part["metric_value"].to_numpy())
+        _merge_sketches(self.bucket_latency, analyzer.build_latency_sketches(part, "bucket", self.relative_accuracy))
+        _merge_sketches(self.url_latency, analyzer.build_latency_sketches(part, "url", self.relative_accuracy))
+
+    def _update_vus(self, part: pd.DataFrame) -> None:
+        values = part["metric_value"]
+        self.vus_min = np.nanmin([self.vus_min, values.min()])
+        self.vus_max = np.nanmax([self.vus_max, values.max()])
+
+        # 노드 별 초 마다 먼저 읽은 행의 값. node 컬럼 이 없으면 노드 0
+        if "node" not in part.columns:
+            part = part.assign(node=0)
+        firsts = part.drop_duplicates(["node", "timestamp"])
+        for node, epoch, value in zip(firsts["node"], firsts["timestamp"], firsts["metric_value"]):
+            if (node, epoch) not in self.bucket_vus:
+                self.bucket_vus[(node, epoch)] = (epoch, value)
+
+    def _update_checks(self, part: pd.DataFrame) -> None:
+        grouped = part["metric_value"].astype("float64").groupby(part["check"], observed=True)
+        self.check_total.update(grouped.count().to_dict())
+        self.check_success.update(grouped.sum().to_dict())
+
+    def merge(self, other: "StreamingAggregator") -> None:
+        """
+        다른 집계기(다른 shard / 파일 구간)의 누적 상태를 합산
+
+        VU 시계열 의 버킷 대표값 은 더 이른 timestamp 를 우선 하고, 같은 시각 이면 기존(앞 구간) 값을 유지 하므로
+        파일 순서 대로 merge 하면 한 번에 읽은 것과 같은 결과가 된다.
+        """
+        if other.start is None:
+            return
+
+        self.rows += other.rows
+        self.start = other.start if self.start is None else min(self.start, other.start)
+        self.end = other.end if self.end is None else max(self.end, other.end)
+
+        self.total_reqs += other.total_reqs
+        self.failed_total += other.failed_total
+        self.failed_sum += other.failed_sum
+        self.error_counts.update(other.error_counts)
+
+        _merge_sketches(self.durations, other.durations)
+        for metric, total in other.transfer.items():
+            self.transfer[metric] += total
+        self.vus_min = np.nanmin([self.vus_min, other.vus_min])
+        self.vus_max = np.nanmax([self.vus_max, other.vus_max])
+
+        for key, (epoch, value) in other.bucket_vus.items():
+            current = self.bucket_vus.get(key)
+            if current is None or epoch < current[0]:
+                self.bucket_vus[key] = (epoch, value)
+        self.bucket_reqs.update(other.bucket_reqs)
+        self.bucket_fails.update(other.bucket_fails)
+        _merge_sketches(self.bucket_latency, other.bucket_latency)
+
+        self.url_reqs.update(other.url_reqs)
+        self.url_fails.update(other.url_fails)
+        _merge_sketches(self.url_latency, other.url_latency)
+        for url, errors in other.url_errors.items():
+            self.url_errors.setdefault(url, Counter()).update(errors)
+        self.check_total.update(other.check_total)
+        self.check_success.update(other.check_success)
+        self.cube.merge(other.cube)
+        self.error_crosstab.merge(other.error_crosstab)
+
+    def result(self, row_filter: Optional[parser.RowFilter] = None) -> ReportGraph:
+        """
+        누적된 상태로 process_data 와 같은 구조의 지연 계산 dict 생성 (상태는 변경 하지 않음)
+
+        row_filter (--from / --to) 를 주면 테스트 시간 은 데이터 범위 로 자른 선택 구간 의 길이.
+
+        섹션 은 처음 꺼낼 때 그 시점 의 누적 상태 로 계산 하므로, 이후 update 전에 필요한 섹션 을 꺼내야 한다.
+        """
+        if self.start is None:
+            raise ValueError("[ERROR] No rows to aggregate")
+
+        test_duration = utils.window_test_duration(self.start, self.end, row_filter.start if row_filter else None,
+                                                   row_filter.end if row_filter else None)
+        seconds = test_duration["seconds"]
+        interval_sec = utils.determine_interval_seconds(seconds)
+
+        graph = ReportGraph()
+        graph.value("test_duration", test_duration)
+        graph.add("vus_range", self._vus_range, public=False)
+        graph.add("http_req_failed", self._failures, public=False)
+        graph.add("summary_http_request", data_processor.build_summary_http_request,
+                  http_reqs={"total": self.total_reqs}, http_req_failed=ref("http_req_failed"),
+                  vus_min=ref("vus_range", 0), vus_max=ref("vus_range", 1), test_duration=test_duration)
+        graph.add("summary_http_req_duration", self._durations_summary, metric="http_req_duration")
+        graph.add("summary_iteration_duration", self._durations_summary, metric="iteration_duration")
+        graph.add("summary_network_usage", analyzer.format_transfer_summary,
+                  data_received_total=self.transfer["data_received"], data_sent_total=self.transfer["data_sent"],
+                  duration_sec=seconds)
+        graph.add("summary_http_errors", data_processor.failure_errors, "http_req_failed")
+        graph.add("chart_vus_timeseries", self._vus_timeseries, interval_sec=interval_sec)
+        graph.add("chart_tps_timeseries", self._tps_timeseries, interval_sec=interval_sec)
+        graph.add("chart_latency_timeseries", self._latency_timeseries, interval_sec=interval_sec)
+        graph.add("chart_rollups", self._chart_rollups, seconds=seconds)
+        graph.add("kept_endpoints", self._kept_endpoints, public=False)
+        graph.add("url_tables", self._url_tables, "kept_endpoints", public=False)
+        graph.add("detail_table", self._detail_table, "url_tables")
+        graph.add("detail_check_table", self._check_table)
+        graph.add("chart_error_timeseries", errors.status_error_timeseries, crosstab=self.error_crosstab,
+                  interval_sec=interval_sec)
+        graph.add("error_crosstab", self._error_crosstab, "kept_endpoints", public=False)
+        graph.add("url_error_table", errors.url_error_table, "error_crosstab")
+        graph.add("cube", self._cube, "kept_endpoints", public=False)
+        graph.add("breakdown_tables", cube.breakdown_tables, "cube")
+        graph.add("cube_table", cube.cube_table, "cube")
+        graph.add("run_summary", self._run_summary, test_duration=test_duration, http_req_failed=ref("http_req_failed"),
+                  vus_min=ref("vus_range", 0), vus_max=ref("vus_range", 1), charts=ref("chart_series"),
+                  url_tables=ref("url_tables"))
+        graph.add("chart_series", data_processor.bundle, public=False, vus=ref("chart_vus_timeseries"),
+                  tps=ref("chart_tps_timeseries"), latency=ref("chart_latency_timeseries"))
+        return graph
+
+    def _kept_endpoints(self) -> Optional[set]:
+        # --max-urls 로 남길 endpoint (합친 요청 수 기준, None 이면 모두)
+        return self.url_templater.limit(self.url_reqs) if self.url_templater is not None else None
+
+    def _url_tables(self, kept: Optional[set]) -> dict:
+        # URL 별 누적 상태. kept 에 없는 endpoint 는 OTHER_ENDPOINT 로 합친 사본 (누적 상태 는 그대로 둔다)
+        tables = {"reqs": self.url_reqs, "fails": self.url_fails, "latency": self.url_latency, "errors": self.url_errors}
+        if kept is None:
+            return tables
+
+        folded = {"reqs": Counter(), "fails": Counter(), "latency": {}, "errors": {}}
+        for key in ("reqs", "fails"):
+            for url in sorted(tables[key]):
+                folded[key][fold_endpoint(url, kept)] += tables[key][url]
+        for url in sorted(self.url_latency):
+            endpoint = fold_endpoint(url, kept)
+            folded["latency"].setdefault(endpoint, QuantileSketch(self.relative_accuracy)).merge(self.url_latency[url])
+        for url in sorted(self.url_errors):
+            folded["errors"].setdefault(fold_endpoint(url, kept), Counter()).update(self.url_errors[url])
+        return folded
+
+    def _cube(self, kept: Optional[set]) -> MetricCube:
+        return self.cube if kept is None else self.cube.relabel("url", lambda url: fold_endpoint(url, kept))
+
+    def _error_crosstab(self, kept: Optional[set]) -> errors.ErrorCrosstab:
+        if kept is None:
+            return self.error_crosstab
+        return self.error_crosstab.relabel_urls(lambda url: fold_endpoint(url, kept))
+
+    def _vus_range(self) -> tuple:
+        # 여러 노드 를 합친 경우 VU 최소/최대 는 노드 합산 시계열 기준 (행 하나는 노드 하나의 VU)
+        if len({node for node, _ in self.bucket_vus}) > 1:
+            summed = self._vus_timeseries(BASE_INTERVAL_SEC)["vus"]
+            return summed.min(), summed.max()
+        return self.vus_min, self.vus_max
+
+    def _failures(self) -> dict:
+        if self.failed_total:
+            return analyzer.format_failures_summary(self.failed_sum, self.failed_total, self.error_counts)
+        return {"failures": 0, "successes": 0, "success_rate": 0.0, "errors": "-"}
+
+    def _chart_rollups(self, seconds: int) -> dict:
+        # 확대 가능한 차트 용 롤업 (latency 는 스케치 버킷 의 배수 인 간격 만)
+        intervals = rollup.rollup_intervals(seconds)
+        return {
+            "vus": {interval: self._vus_timeseries(interval) for interval in intervals},
+            "tps": {interval: self._tps_timeseries(interval) for interval in intervals},
+            "latency": {interval: self._latency_timeseries(interval)
+                        for interval in intervals if interval % BASE_INTERVAL_SEC == 0},
+        }
+
+    def _run_summary(self, test_duration: dict, http_req_failed: dict, vus_min, vus_max, charts: dict,
+                     url_tables: dict) -> dict:
+        requests = run_summary.request_totals(
+            self.total_reqs, http_req_failed["failures"], http_req_failed["successes"], http_req_failed["success_rate"],
+            vus_min, vus_max, test_duration["seconds"],
+        )
+        durations = {metric: (sketch.stats() if sketch.count else {}, sketch) for metric, sketch in self.durations.items()}
+        urls = {}
+        for url, total in url_tables["reqs"].items():
+            sketch = url_tables["latency"].get(url)
+            urls[url] = (total, url_tables["fails"].get(url, 0), sketch.stats() if sketch else {}, sketch)
+        checks = {check: (total, self.check_success[check]) for check, total in self.check_total.items()}
+        return run_summary.build(test_duration, requests, durations, self.transfer, urls, checks,
+                                 self.relative_accuracy, charts)
+
+    def _durations_summary(self, metric: str) -> dict:
+        sketch = self.durations[metric]
+        if sketch.count == 0:
+            print(f"[WARN] No data for metric: {metric}")
+            return {}
+        return analyzer.format_durations_summary(sketch.stats())
+
+    def _vus_timeseries(self, interval_sec: int) -> pd.DataFrame:
+        # 노드 별 로 interval 버킷 의 첫 값을 고른 뒤, 버킷 마다 노드 합산
+        firsts = {}
+        for (node, bucket), (epoch, value) in sorted(self.bucket_vus.items()):
+            firsts.setdefault((node, bucket - bucket % interval_sec), value)
+        summed = {}
+        for (node, bucket), value in firsts.items():
+            summed[bucket] = summed[bucket] + value if bucket in summed else value
+        buckets = sorted(summed)
+        return pd.DataFrame({
+            "timestamp": buckets,
+            "vus": [summed[b] for b in buckets],
+        })
+
+    def _tps_timeseries(self, interval_sec: int) -> pd.DataFrame:
+        reqs = _rebin(self.bucket_reqs, interval_sec)
+        fails = _rebin(self.bucket_fails, interval_sec)
+        buckets = sorted(reqs)
+        tps = [round((reqs[b] - fails.get(b, 0)) / interval_sec, 2) for b in buckets]
+        return pd.DataFrame({"timestamp": buckets, "tps": tps})
+
+    def _latency_timeseries(self, interval_sec: int) -> pd.DataFrame:
+        merged = {}
+        for bucket, sketch in self.bucket_latency.items():
+            merged.setdefault(bucket - bucket % interval_sec, []).append(sketch)
+
+        rows = []
+        for bucket in sorted(merged):
+            combined = QuantileSketch(self.relative_accuracy)
+            for sketch in merged[bucket]:
+                combined.merge(sketch)
+            rows.append({"timestamp": bucket, **combined.stats()})
+        return pd.DataFrame(rows)
+
+    def _detail_table(self, url_tables: dict) -> pd.DataFrame:
+        if not url_tables["reqs"]:
+            return pd.DataFrame()
+
+        rows = []
+        for url, total in url_tables["reqs"].items():
+            sketch = url_tables["latency"].get(url)
+            errors = url_tables["errors"].get(url)
+            rows.append({
+                "url": url,
+                "total": total,
+                "fail": url_tables["fails"].get(url, 0),
+                **(sketch.stats() if sketch else {}),
+                "errors": ", ".join(f"{err}({cnt})" for err, cnt in errors.most_common()) if errors else None,
+            })
+        result = pd.DataFrame(rows).sort_values("url").reset_index(drop=True)
+        return analyzer.format_latency_detail_table(result)
+
+    def _check_table(self) -> pd.DataFrame:
+        if not self.check_total:
+            return pd.DataFrame(columns=["check", "total", "fail", "ratio"])
+
+        result = pd.DataFrame({
+            "check": list(self.check_total),
+            "total": list(self.check_total.values()),
+            "success": [int(self.check_success[c]) for c in self.check_total],
+        })
+        return analyzer.format_check_table(result)
+
+
+def process_csv_streaming(path: Union[str, Path], chunk_size: int = 1_000_000,
+                          relative_accuracy: float = RELATIVE_ACCURACY, csv_engine: str = "pandas",
+                          row_filter: Optional[parser.RowFilter] = None,
+                          url_templater: Optional[UrlTemplater] = None) -> dict:
+    """
+    k6 결과 파일(CSV/NDJSON, .gz 포함)을 chunk 단위로 읽으면서 집계 하여 process_data 와 같은 구조의 dict 를 반환
+    """
+    return aggregate_chunks(parser.iter_result_chunks(path, chunk_size, csv_engine, row_filter), relative_accuracy,
+                            url_templater, row_filter)
+
+
+def aggregate_chunks(chunks: Iterable[pd.DataFrame], relative_accuracy: float = RELATIVE_ACCURACY,
+                     url_templater: Optional[UrlTemplater] = None,
+                     row_filter: Optional[parser.RowFilter] = None) -> dict:
+    aggregator = StreamingAggregator(relative_accuracy, url_templater)
+    for chunk in profiler.iterate("parser.read_chunk", chunks):
+        with profiler.stage("streaming.StreamingAggregator.update", len(chunk)):
+            aggregator.update(chunk)
+        print(f"[INFO] Aggregated rows: {aggregator.rows:,}")
+    return profiler.call(aggregator.result, row_filter)
+
+
+def _value_counts(series: pd.Series) -> dict:
+    # category 컬럼 은 chunk 에 없는 값도 0 건으로 나오므로 제외
+    counts = series.value_counts()
+    return counts[counts > 0].to_dict()
+
+
+def _merge_sketches(target: dict, sketches: dict) -> None:
+    for key, sketch in sketches.items():
+        if key in target:
+            target[key].merge(sketch)
+        else:
+            target[key] = sketch
+
+
+def _rebin(counts: Counter, interval_sec: int) -> Counter:
+    rebinned = Counter()
+    for bucket, cnt in counts.items():
+        rebinned[bucket - bucket % interval_sec] += cnt
+    return rebinned
+
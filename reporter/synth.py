@@ -0,0 +1,251 @@
+import argparse
+import gzip
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+import utils
+
+# k6 CSV 출력 헤더 (k6 v0.5x 기준 컬럼 순서)
+K6_CSV_HEADER = [
+    "metric_name", "timestamp", "metric_value", "check", "error", "error_code", "expected_response", "group",
+    "method", "name", "proto", "scenario", "service", "status", "subproto", "tls_version", "url", "extra_tags",
+    "metadata",
+]
+
+# k6/script/stress-api.js 의 ramp 단계 (초, 목표 VU)
+DEFAULT_STAGES = [(60, 50), (60, 100), (60, 500), (120, 1000), (180, 1000), (120, 0)]
+DEFAULT_START = 1745558400
+BASE_URL = "https://your-company.com"
+
+# 요청 하나가 남기는 행 (http_req_* / checks / data_*) 과 iteration 끝의 iteration_duration
+REQUEST_METRICS = ["http_reqs", "http_req_duration", "http_req_waiting", "http_req_failed", "checks",
+                   "data_sent", "data_received"]
+ITERATION_METRIC = "iteration_duration"
+
+# 실패 요청 의 (status, error, error_code)
+FAILURES = [
+    ("500", "request timeout", "1050"),
+    ("503", "read: connection reset, by peer", "1000"),
+    ("0", "dial tcp 1.2.3.4:443: connect: connection refused", "1212"),
+]
+
+# 한 번에 만들어서 쓰는 iteration 수
+BLOCK_ITERATIONS = 200_000
+
+
+class SyntheticRun:
+    """
+    k6/script/stress-api.js 형태 (로그인 POST 후 API GET 반복) 의 k6 CSV 결과 를 재현 가능 하게 만드는 생성기
+
+    - rows: 만들 행 수 (근사값, iteration 단위 로 맞춘다). 초당 iteration 수는 그 시점 VU 수에 비례
+    - urls: 로그인 외 API endpoint 수, ids: endpoint 마다 경로 끝에 붙는 서로 다른 id 수 (1 이면 id 없음)
+    - checks: 서로 다른 check 이름 수, error_rate: 실패 요청 비율
+    - latency 는 endpoint 별 기준값 에 부하(VU / 최대 VU) 에 비례 하는 지연 을 더한 lognormal
+    - 같은 인자 와 seed 면 항상 같은 파일 을 만든다
+    """
+
+    def __init__(self, rows: int, stages: Optional[list] = None, urls: int = 2, ids: int = 1, checks: Optional[int] = None,
+                 error_rate: float = 0.05, seed: int = 0, start: int = DEFAULT_START):
+        if rows <= 0 or urls <= 0 or ids <= 0:
+            raise ValueError("[ERROR] rows, urls and ids must be positive")
+        if not 0 <= error_rate <= 1:
+            raise ValueError(f"[ERROR] error_rate must be between 0 and 1: {error_rate}")
+        self.rows = rows
+        self.stages = stages or DEFAULT_STAGES
+        self.urls = urls
+        self.ids = ids
+        self.checks = checks or urls + 1
+        self.error_rate = error_rate
+        self.seed = seed
+        self.start = start
+
+        self.duration = sum(duration for duration, _ in self.stages)
+        self.vus = self._vus_per_second()
+        self.requests_per_iteration = urls + 1
+        rows_per_iteration = len(REQUEST_METRICS) * self.requests_per_iteration + 1
+        total_iterations = max((rows - self.duration) // rows_per_iteration, 1)
+
+        # 초당 iteration 수를 VU 에 비례 하게 나누고 누적 합을 내림 해서 정수 로 맞춘다
+        weights = np.maximum(self.vus, 1).astype("float64")
+        cumulative = np.floor(np.cumsum(weights) / weights.sum() * total_iterations).astype("int64")
+        self.iterations = np.diff(cumulative, prepend=0)
+
+        self._url_names = self._build_urls()
+        self._check_names = [f"check {i}, is 200" for i in range(self.checks)]
+        self._tails = self._build_tails()
+
+    def _vus_per_second(self) -> np.ndarray:
+        vus, current = [], 0
+        for duration, target in self.stages:
+            vus.append(np.linspace(current, target, duration, endpoint=False))
+            current = target
+        return np.rint(np.concatenate(vus)).astype("int64") if vus else np.zeros(0, dtype="int64")
+
+    def _build_urls(self) -> list:
+        # 0 번 은 로그인, 나머지 는 endpoint x id
+        urls = [f"{BASE_URL}/auth/login"]
+        for endpoint in range(self.urls):
+            if self.ids == 1:
+                urls.append(f"{BASE_URL}/v1/api{endpoint}")
+            else:
+                urls.extend(f"{BASE_URL}/v1/api{endpoint}/{i}" for i in range(self.ids))
+        return urls
+
+    def _build_tails(self) -> dict:
+        # metric_name, timestamp, metric_value 뒤에 붙는 나머지 컬럼 (http 요청 행은 (url, 실패 종류) 별로 만든다)
+        tails = {
+            "http": [
+                [_http_tail(url, "POST" if i == 0 else "GET", *outcome) for outcome in [("200", "", "")] + FAILURES]
+                for i, url in enumerate(self._url_names)
+            ],
+            "checks": [f",{_quote(name)},,,,,,,,default,,,,,,," for name in self._check_names],
+            "plain": "," * (len(K6_CSV_HEADER) - 3),
+            "iteration": ",,,,,,,,,default,,,,,,,",
+            "vus": "," * (len(K6_CSV_HEADER) - 3),
+        }
+        return tails
+
+    def write(self, path: Union[str, Path]) -> int:
+        """
+        CSV 를 path 에 쓰고 (.gz 면 gzip) 실제 행 수를 반환
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rng = np.random.default_rng(self.seed)
+        opener = gzip.open if path.suffix == ".gz" else open
+        written = 0
+        with opener(path, "wt", encoding="utf-8", newline="") as f:
+            f.write(",".join(K6_CSV_HEADER) + "\n")
+            second = 0
+            while second < self.duration:
+                # BLOCK_ITERATIONS 를 넘지 않는 만큼 의 초를 한 번에 만든다 (최소 1초)
+                cumulative = np.cumsum(self.iterations[second:])
+                end = second + max(int(np.searchsorted(cumulative, BLOCK_ITERATIONS, side="right")), 1)
+                lines = self._block_lines(rng, second, end)
+                f.write("\n".join(lines) + "\n")
+                written += len(lines)
+                second = end
+        return written
+
+    def _block_lines(self, rng: np.random.Generator, first: int, last: int) -> list:
+        seconds = np.arange(first, last)
+        iterations = self.iterations[first:last]
+        n_iter = int(iterations.sum())
+        per_iter = self.requests_per_iteration
+
+        # iteration / 요청 별 값 (iteration 순서 = 시간 순서)
+        iter_second = np.repeat(seconds, iterations)
+        load = self.vus[iter_second] / max(int(self.vus.max()), 1)
+        req_load = np.repeat(load, per_iter)
+        endpoint = np.tile(np.arange(per_iter), n_iter)
+        url = np.where(endpoint == 0, 0, 1 + (endpoint - 1) * self.ids + rng.integers(0, self.ids, len(endpoint)))
+
+        failed = rng.random(len(endpoint)) < self.error_rate
+        outcome = np.where(failed, 1 + rng.integers(0, len(FAILURES), len(endpoint)), 0)
+        base_ms = 30 + 15 * endpoint
+        duration = rng.lognormal(np.log(base_ms * (1 + 2 * req_load)), 0.5)
+        duration = np.where(outcome == 1, 60_000.0, duration)  # request timeout
+        waiting = duration * rng.uniform(0.85, 0.95, len(duration))
+        # check 이름 은 endpoint 별로 나누고, endpoint 보다 많으면 endpoint 안에서 무작위 로 고른다
+        variants = max(-(-self.checks // per_iter), 1)
+        check = endpoint + per_iter * rng.integers(0, variants, len(endpoint))
+        check = np.where(check < self.checks, check, endpoint) % self.checks
+        sent = rng.integers(180, 420, len(endpoint))
+        received = np.where(failed, rng.integers(0, 512, len(endpoint)), rng.integers(8_000, 24_000, len(endpoint)))
+        iteration_ms = duration.reshape(n_iter, per_iter).sum(axis=1) + rng.uniform(1, 5, n_iter)
+
+        # 요청 하나 = REQUEST_METRICS 순서 의 행 묶음, iteration 마다 끝에 iteration_duration 한 행
+        values = np.column_stack([
+            np.full(len(endpoint), "1"), _format_ms(duration), _format_ms(waiting), failed.astype("int8").astype(str),
+            (~failed).astype("int8").astype(str), sent.astype(str), received.astype(str),
+        ]).reshape(n_iter, per_iter * len(REQUEST_METRICS)).tolist()
+        http_tails = [self._tails["http"][u][o] for u, o in zip(url.tolist(), outcome.tolist())]
+        check_tails = [self._tails["checks"][c] for c in check.tolist()]
+        plain = self._tails["plain"]
+
+        iteration_values = _format_ms(iteration_ms).tolist()
+        vus_tail, iteration_tail = self._tails["vus"], self._tails["iteration"]
+
+        # 초 마다 vus 한 행 후 그 초의 iteration 들 (iteration 이 없는 초 에도 vus 행은 남긴다)
+        lines = []
+        i = r = 0
+        for second, count, vus in zip(seconds.tolist(), iterations.tolist(), self.vus[first:last].tolist()):
+            timestamp = self.start + second
+            lines.append(f"vus,{timestamp},{vus}{vus_tail}")
+            for _ in range(count):
+                row = values[i]
+                for k in range(0, per_iter * len(REQUEST_METRICS), len(REQUEST_METRICS)):
+                    http_tail = http_tails[r]
+                    lines.append(f"http_reqs,{timestamp},{row[k]}{http_tail}")
+                    lines.append(f"http_req_duration,{timestamp},{row[k + 1]}{http_tail}")
+                    lines.append(f"http_req_waiting,{timestamp},{row[k + 2]}{http_tail}")
+                    lines.append(f"http_req_failed,{timestamp},{row[k + 3]}{http_tail}")
+                    lines.append(f"checks,{timestamp},{row[k + 4]}{check_tails[r]}")
+                    lines.append(f"data_sent,{timestamp},{row[k + 5]}{plain}")
+                    lines.append(f"data_received,{timestamp},{row[k + 6]}{plain}")
+                    r += 1
+                lines.append(f"{ITERATION_METRIC},{timestamp},{iteration_values[i]}{iteration_tail}")
+                i += 1
+        return lines
+
+
+def parse_stages(text: str) -> list:
+    """
+    "1m:50,2m:1000,1m:0" → [(60, 50), (120, 1000), (60, 0)] (k6 options.stages 의 duration:target)
+    """
+    stages = []
+    for item in utils.parse_list(text):
+        duration, sep, target = item.partition(":")
+        if not sep:
+            raise ValueError(f"[ERROR] Invalid stage {item!r}: expected DURATION:TARGET (e.g. 2m:1000)")
+        stages.append((utils.parse_time_bound(duration, 0), int(target)))
+    return stages
+
+
+def scale_stages(stages: list, duration_sec: int) -> list:
+    """
+    단계 비율 은 유지 하고 전체 길이를 duration_sec 로 늘이거나 줄인다 (soak 테스트 재현)
+    """
+    total = sum(duration for duration, _ in stages)
+    return [(max(int(round(duration * duration_sec / total)), 1), target) for duration, target in stages]
+
+
+def _format_ms(values: np.ndarray) -> np.ndarray:
+    # k6 처럼 ms 값은 소수점 6자리
+    return np.char.mod("%.6f", values)
+
+
+def _http_tail(url: str, method: str, status: str, error: str, error_code: str) -> str:
+    expected = "false" if error else "true"
+    return f",,{_quote(error)},{error_code},{expected},,{method},{url},HTTP/1.1,default,,{status},,tls1.3,{url},,"
+
+
+def _quote(value: str) -> str:
+    return f'"{value}"' if "," in value else value
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description="Generate a synthetic k6 CSV result modeled on k6/script/stress-api.js")
+    arg_parser.add_argument("output", help="Output CSV path (.csv or .csv.gz)")
+    arg_parser.add_argument("--rows", type=utils.parse_count, default=1_000_000, help="Approximate row count (e.g. 1M, 10M, 100M)")
+    arg_parser.add_argument("--stages", type=parse_stages, default=None,
+                            help="Ramp stages as DURATION:TARGET list (default: stress-api.js, 1m:50,1m:100,1m:500,2m:1000,3m:1000,2m:0)")
+    arg_parser.add_argument("--duration", default=None,
+                            help="Stretch the stages to this total length keeping their ratios (e.g. 24h for a soak run)")
+    arg_parser.add_argument("--urls", type=int, default=2, help="API endpoints per iteration besides the login request")
+    arg_parser.add_argument("--ids", type=int, default=1, help="Distinct ids appended to each endpoint path (raw URL cardinality)")
+    arg_parser.add_argument("--checks", type=int, default=None, help="Distinct check names (default: one per endpoint)")
+    arg_parser.add_argument("--error-rate", type=float, default=0.05, help="Fraction of failed requests")
+    arg_parser.add_argument("--seed", type=int, default=0)
+    args = arg_parser.parse_args()
+
+    stages = args.stages or DEFAULT_STAGES
+    if args.duration:
+        stages = scale_stages(stages, utils.parse_time_bound(args.duration, 0))
+
+    run = SyntheticRun(args.rows, stages, args.urls, args.ids, args.checks, args.error_rate, args.seed)
+    print(f"[INFO] Generating ~{args.rows:,} rows over {run.duration:,}s into {args.output}")
+    written = run.write(args.output)
+    print(f"[DONE] Wrote {written:,} rows: {args.output}")
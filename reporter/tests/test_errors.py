@@ -0,0 +1,61 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from errors import ErrorClassifier, ErrorCrosstab, OTHER_ERROR_CLASS, NO_ERROR
+
+
+def failed_rows(messages: list, start: int) -> pd.DataFrame:
+    # http_req_failed 행: 메시지 마다 (순번 + 1) 건 실패, 1초 씩 다른 시각
+    counts = np.arange(len(messages)) + 1
+    return pd.DataFrame({
+        "timestamp": start + np.repeat(np.arange(len(messages)), counts),
+        "metric_value": 1,
+        "url": "https://example.com/api",
+        "status": "500",
+        "error": np.repeat(messages, counts),
+    })
+
+
+class ErrorCrosstabLimitTest(unittest.TestCase):
+    """
+    max_classes 는 merge 순서 / shard 경계 와 무관 하게 전체 요청 수 로 적용 된다
+    """
+
+    def setUp(self):
+        # 분류 40 개, 시간 구간 마다 다른 메시지 (규칙 에 맞지 않고 숫자 가 없어서 메시지 마다 분류 하나)
+        messages = [f"upstream failure kind {chr(65 + i % 26)}{chr(65 + i // 26)}" for i in range(40)]
+        self.shards = [failed_rows(messages[i:i + 10], 1_000 + i * 100) for i in range(0, 40, 10)]
+
+    def crosstab(self, shards: list) -> ErrorCrosstab:
+        merged = ErrorCrosstab(1, ErrorClassifier(max_classes=20))
+        for shard in shards:
+            part = ErrorCrosstab(1, ErrorClassifier(max_classes=20))
+            part.update(shard)
+            merged.merge(part)
+        return merged
+
+    def test_merge_order(self):
+        single = ErrorCrosstab(1, ErrorClassifier(max_classes=20))
+        single.update(pd.concat(self.shards, ignore_index=True))
+        forward, backward = self.crosstab(self.shards), self.crosstab(self.shards[::-1])
+        for crosstab in (forward, backward):
+            self.assertTrue(single.timeline().equals(crosstab.timeline()))
+            self.assertTrue(single.by_url().equals(crosstab.by_url()))
+
+    def test_keeps_busiest_classes(self):
+        timeline = self.crosstab(self.shards).timeline()
+        classes = set(timeline["error_class"]) - {NO_ERROR}
+        self.assertEqual(len(classes), 21)
+        self.assertIn(OTHER_ERROR_CLASS, classes)
+        # 메시지 마다 10 개 구간 중 뒤쪽 일수록 건수 가 많다 (1 ~ 10 건): 건수 1 ~ 5 인 20 개 분류 가 묶인다
+        self.assertEqual(timeline.loc[timeline["error_class"] == OTHER_ERROR_CLASS, "total"].sum(), 4 * sum(range(1, 6)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import history
+import streaming
+from synth import SyntheticRun
+
+
+class HistoryIngestRollbackTest(unittest.TestCase):
+    """
+    ingest 가 중간 에 실패 해서 rollback 되면, 그 트랜잭션 에서 추가한 url / metric id 를 다음 ingest 가 쓰지 않는다
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        path = Path(cls.tmp.name) / "run.csv"
+        SyntheticRun(rows=5_000, urls=3, ids=5, seed=2).write(path)
+        cls.summary = streaming.process_csv_streaming(path, 1_000)["run_summary"]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        self.store = history.HistoryStore(Path(self.tmp.name) / "history.sqlite")
+        self.addCleanup(self.store.close)
+
+    def test_retry_after_rollback(self):
+        # url / metric id 를 만든 뒤 bucket 값 에서 실패
+        with mock.patch.object(history, "bucket_metrics", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                self.store.ingest(self.summary, "run-1")
+        self.assertEqual(self.store.names("urls"), [])
+
+        run_id = self.store.ingest(self.summary, "run-1")
+        self.assertIsNotNone(run_id)
+        self.assertEqual(self.store.names("urls"), sorted(self.summary["urls"]))
+        for url, entry in self.summary["urls"].items():
+            with self.subTest(url=url):
+                self.assertEqual(self.store.query("total", url=url)["value"].tolist(), [entry["total"]])
+        self.assertEqual(self.store.query("total_reqs")["value"].tolist(), [self.summary["requests"]["total"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import parallel
+import streaming
+from synth import SyntheticRun
+from url_template import UrlTemplater, OTHER_ENDPOINT
+
+# 합친 결과 가 shard 를 나눈 방식 과 무관 해야 하는 섹션
+SECTIONS = ("detail_table", "url_error_table", "cube_table", "chart_error_timeseries")
+
+
+class ParallelMatchesStreamTest(unittest.TestCase):
+    """
+    --workers N 의 결과 가 --stream 과 같은지 (--max-urls 로 endpoint 를 OTHER_ENDPOINT 로 묶는 경우 포함)
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = Path(cls.tmp.name) / "run.csv"
+        SyntheticRun(rows=60_000, urls=5, ids=20, seed=3).write(cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def assert_same_result(self, max_endpoints):
+        # 실행 마다 새 UrlTemplater (앞 실행 의 상태 가 worker 로 넘어가지 않게)
+        stream = streaming.process_csv_streaming(self.path, 5_000, url_templater=UrlTemplater(max_endpoints=max_endpoints))
+        sharded = parallel.process_csv_parallel(self.path, 3, 5_000,
+                                                url_templater=UrlTemplater(max_endpoints=max_endpoints))
+        for section in SECTIONS:
+            with self.subTest(section=section):
+                self.assertTrue(stream[section].equals(sharded[section]))
+        self.assertEqual(stream["run_summary"], sharded["run_summary"])
+        return sharded
+
+    def test_max_urls(self):
+        result = self.assert_same_result(max_endpoints=3)
+        urls = list(result["detail_table"]["url"])
+        self.assertIn(OTHER_ENDPOINT, urls)
+        self.assertEqual(len(urls), 4)
+
+    def test_without_limit(self):
+        result = self.assert_same_result(max_endpoints=None)
+        self.assertNotIn(OTHER_ENDPOINT, list(result["detail_table"]["url"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
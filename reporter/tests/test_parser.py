@@ -0,0 +1,97 @@
+import csv
+import gzip
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import parser
+from synth import SyntheticRun
+
+# k6 --out json 의 data.tags 로 들어가는 CSV 컬럼 (값이 빈 태그 는 k6 가 쓰지 않는다)
+TAG_COLUMNS = ["check", "error", "error_code", "expected_response", "group", "method", "name", "proto", "scenario",
+               "service", "status", "subproto", "tls_version", "url"]
+
+
+def write_ndjson(csv_path: Path, json_path: Path) -> None:
+    # 같은 행을 k6 --out json 형식 (Metric 선언 + Point, time 은 +09:00 RFC3339 와 소수 초) 으로 변환
+    opener = gzip.open if json_path.suffix == ".gz" else open
+    declared = set()
+    with open(csv_path, newline="") as src, opener(json_path, "wt") as dst:
+        for i, row in enumerate(csv.DictReader(src)):
+            metric = row["metric_name"]
+            if metric not in declared:
+                declared.add(metric)
+                dst.write(json.dumps({"type": "Metric", "metric": metric, "data": {"name": metric, "type": "trend"}}) + "\n")
+            time = pd.Timestamp(int(row["timestamp"]), unit="s", tz="Asia/Seoul")
+            tags = {column: row[column] for column in TAG_COLUMNS if row[column]}
+            dst.write(json.dumps({"type": "Point", "metric": metric, "data": {
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S") + f".{i % 1000:03d}123+09:00",
+                "value": float(row["metric_value"]),
+                "tags": tags,
+            }}) + "\n")
+
+
+class ResultFormatsTest(unittest.TestCase):
+    """
+    같은 k6 결과 를 CSV / CSV.gz / NDJSON / NDJSON.gz 로 읽으면 정제된 컬럼 과 값이 같다
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        root = Path(cls.tmp.name)
+        cls.csv = root / "run.csv"
+        SyntheticRun(rows=5_000, urls=3, ids=5, error_rate=0.1, seed=1).write(cls.csv)
+        cls.csv_gz = root / "run.csv.gz"
+        with open(cls.csv, "rb") as src, gzip.open(cls.csv_gz, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        cls.json = root / "run.json"
+        cls.json_gz = root / "run.json.gz"
+        write_ndjson(cls.csv, cls.json)
+        write_ndjson(cls.csv, cls.json_gz)
+        cls.expected = parser.load_results(cls.csv)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def assert_same_frame(self, df: pd.DataFrame):
+        self.assertEqual(sorted(df.columns), sorted(self.expected.columns))
+        for column in self.expected.columns:
+            with self.subTest(column=column):
+                self.assertEqual(_kind(df[column]), _kind(self.expected[column]))
+        pd.testing.assert_frame_equal(df[self.expected.columns].reset_index(drop=True), self.expected,
+                                      check_categorical=False, check_dtype=False)
+
+    def test_csv_gz(self):
+        self.assert_same_frame(parser.load_results(self.csv_gz))
+
+    def test_ndjson(self):
+        self.assert_same_frame(parser.load_results(self.json))
+
+    def test_ndjson_gz(self):
+        self.assert_same_frame(parser.load_results(self.json_gz))
+
+    def test_mmap_engine(self):
+        self.assert_same_frame(parser.load_results(self.csv, engine="mmap"))
+
+    def test_chunks(self):
+        for path in (self.csv_gz, self.json_gz):
+            with self.subTest(path=path.name):
+                self.assert_same_frame(parser.concat_frames(list(parser.iter_result_chunks(path, 700))))
+
+
+def _kind(column: pd.Series) -> str:
+    # category / 정수 / 실수 구분 (카테고리 순서 나 비트 수 는 비교 하지 않는다)
+    return "category" if isinstance(column.dtype, pd.CategoricalDtype) else column.dtype.kind
+
+
+if __name__ == "__main__":
+    unittest.main()
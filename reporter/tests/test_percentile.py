@@ -0,0 +1,65 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from percentile import grouped_percentiles, PERCENTILES
+
+QS = (0, 1, 25, 33.3, *PERCENTILES, 99.9, 100)
+
+
+def per_group(codes: np.ndarray, values: np.ndarray, n_groups: int, qs) -> np.ndarray:
+    expected = np.full((n_groups, len(qs)), np.nan)
+    for group in range(n_groups):
+        group_values = values[codes == group]
+        if group_values.size:
+            expected[group] = np.percentile(group_values, qs)
+    return expected
+
+
+class GroupedPercentilesTest(unittest.TestCase):
+    """
+    grouped_percentiles 는 그룹 별 np.percentile 과 같은 값 (값이 없는 그룹 은 NaN)
+    """
+
+    def assert_matches(self, codes, values, n_groups, qs=QS):
+        np.testing.assert_array_equal(grouped_percentiles(codes, values, n_groups, qs),
+                                      per_group(np.asarray(codes), np.asarray(values), n_groups, qs))
+
+    def test_random_groups(self):
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            n_groups = int(rng.integers(1, 30))
+            size = int(rng.integers(0, 500))
+            codes = rng.integers(0, n_groups, size=size)
+            values = rng.lognormal(4, 1.5, size=size)
+            if rng.random() < 0.3:
+                values = np.round(values)  # 같은 값 이 많은 경우
+            self.assert_matches(codes, values, n_groups)
+
+    def test_float32(self):
+        rng = np.random.default_rng(1)
+        codes = rng.integers(0, 4, size=1_000)
+        values = rng.lognormal(4, 1, size=1_000).astype("float32")
+        self.assert_matches(codes, values, 4)
+
+    def test_empty_and_single_groups(self):
+        # 그룹 0, 2 는 비어 있고 그룹 1, 4 는 값이 하나
+        codes = np.array([1, 3, 3, 3, 4])
+        values = np.array([7.5, 3.0, 1.0, 2.0, 0.0])
+        self.assert_matches(codes, values, 5)
+        result = grouped_percentiles(codes, values, 5)
+        self.assertTrue(np.isnan(result[[0, 2]]).all())
+        self.assertTrue((result[1] == 7.5).all())
+
+    def test_no_values(self):
+        result = grouped_percentiles(np.empty(0, dtype="int64"), np.empty(0), 3)
+        self.assertEqual(result.shape, (3, len(PERCENTILES)))
+        self.assertTrue(np.isnan(result).all())
+
+
+if __name__ == "__main__":
+    unittest.main()
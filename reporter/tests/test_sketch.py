@@ -0,0 +1,104 @@
+import json
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sketch import QuantileSketch, grouped_sketches
+
+QS = (0, 1, 25, 50, 90, 95, 99, 99.9, 100)
+
+
+def latencies(size: int, seed: int = 0) -> np.ndarray:
+    # 0 (캐시 응답 등) 이 섞인 lognormal latency (ms)
+    rng = np.random.default_rng(seed)
+    values = rng.lognormal(mean=4, sigma=1.5, size=size)
+    values[rng.random(size) < 0.01] = 0
+    return values
+
+
+def assert_same_sketch(test: unittest.TestCase, a: QuantileSketch, b: QuantileSketch) -> None:
+    np.testing.assert_array_equal(a.keys, b.keys)
+    np.testing.assert_array_equal(a.counts, b.counts)
+    test.assertEqual((a.count, a.zero_count, a.min, a.max), (b.count, b.zero_count, b.min, b.max))
+    test.assertAlmostEqual(a.sum, b.sum, delta=1e-9 * abs(a.sum))
+
+
+class QuantileSketchTest(unittest.TestCase):
+
+    def test_relative_error(self):
+        # 분위수 는 np.percentile 의 rank(q * (n - 1)) 아래쪽 값 기준 상대 오차 relative_accuracy 이내
+        for accuracy in (0.01, 0.05):
+            for seed in range(5):
+                values = latencies(10_000, seed)
+                sketch = QuantileSketch(accuracy)
+                sketch.add(values)
+                expected = np.percentile(values, QS, method="lower")
+                np.testing.assert_array_less(np.abs(sketch.quantiles(QS) - expected),
+                                             accuracy * expected + 1e-9)
+
+    def test_exact_stats(self):
+        values = latencies(1_000)
+        sketch = QuantileSketch()
+        sketch.add(values)
+        self.assertEqual((sketch.count, sketch.min, sketch.max), (len(values), values.min(), values.max()))
+        self.assertAlmostEqual(sketch.mean(), values.mean())
+
+    def test_merge_order(self):
+        values = latencies(20_000)
+        parts = np.array_split(values, 7)
+        whole = QuantileSketch()
+        whole.add(values)
+        for order in (range(7), reversed(range(7)), [3, 0, 6, 1, 5, 2, 4]):
+            merged = QuantileSketch()
+            for i in order:
+                part = QuantileSketch()
+                part.add(parts[i])
+                merged.merge(part)
+            assert_same_sketch(self, whole, merged)
+
+    def test_merge_different_accuracy(self):
+        with self.assertRaises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
+
+    def test_dict_round_trip(self):
+        sketch = QuantileSketch()
+        sketch.add(latencies(5_000))
+        for original in (sketch, QuantileSketch()):
+            restored = QuantileSketch.from_dict(json.loads(json.dumps(original.to_dict())))
+            assert_same_sketch(self, original, restored)
+            self.assertEqual(original.max_bins, restored.max_bins)
+            np.testing.assert_array_equal(original.quantiles(QS), restored.quantiles(QS))
+
+    def test_collapse(self):
+        # 버킷 이 max_bins 를 넘으면 작은 값 쪽 을 합치고, 높은 분위수 의 정확도 와 count / min / max 는 유지
+        values = np.geomspace(0.001, 1e6, 5_000)
+        sketch = QuantileSketch(0.01, max_bins=64)
+        for part in np.array_split(values, 10):
+            sketch.add(part)
+        self.assertEqual(len(sketch.keys), 64)
+        self.assertEqual(sketch.counts.sum() + sketch.zero_count, len(values))
+        self.assertEqual((sketch.min, sketch.max), (values.min(), values.max()))
+        for q in (99, 99.9):
+            expected = np.percentile(values, q, method="lower")
+            self.assertLessEqual(abs(sketch.quantile(q) - expected), 0.01 * expected)
+
+    def test_empty(self):
+        self.assertTrue(np.isnan(QuantileSketch().quantiles(QS)).all())
+
+    def test_grouped_sketches(self):
+        values = latencies(10_000)
+        codes = np.random.default_rng(1).integers(0, 5, size=len(values))
+        codes[codes == 3] = 4  # 그룹 3 은 비어 있음
+        sketches = grouped_sketches(codes, values, 6)
+        for group, sketch in enumerate(sketches):
+            expected = QuantileSketch()
+            expected.add(values[codes == group])
+            assert_same_sketch(self, expected, sketch)
+
+
+if __name__ == "__main__":
+    unittest.main()
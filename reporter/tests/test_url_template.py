@@ -0,0 +1,140 @@
+import sys
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from url_template import UrlTemplater, build_url_templater, OTHER_ENDPOINT
+
+UUID = "3f2b8c1e-9a4d-4e6f-8b7a-1c2d3e4f5a6b"
+
+
+class BuiltinRulesTest(unittest.TestCase):
+    """
+    경로 segment 전체가 숫자 / UUID / 16진수 면 {id} / {uuid} / {hex}, host 와 query / fragment 는 그대로
+    """
+
+    def setUp(self):
+        self.templater = UrlTemplater()
+
+    def assert_templates(self, cases: dict):
+        for url, expected in cases.items():
+            with self.subTest(url=url):
+                self.assertEqual(self.templater.template(url), expected)
+
+    def test_segments(self):
+        self.assert_templates({
+            "https://x.com/v1/members/42": "https://x.com/v1/members/{id}",
+            f"https://x.com/orders/{UUID}/items/7": "https://x.com/orders/{uuid}/items/{id}",
+            f"https://x.com/orders/{UUID.upper()}": "https://x.com/orders/{uuid}",
+            "https://x.com/files/507f1f77bcf86cd799439011": "https://x.com/files/{hex}",
+            "https://x.com/files/0123456789ab": "https://x.com/files/{hex}",
+            "/v1/members/42/": "/v1/members/{id}/",
+        })
+
+    def test_partial_segments_unchanged(self):
+        # segment 일부 만 숫자 / 16진수 이거나, 숫자 가 없는 16진수 단어, 12자 미만 16진수 는 그대로
+        self.assert_templates({
+            "https://x.com/v1/api2/item-42": "https://x.com/v1/api2/item-42",
+            "https://x.com/tags/deadbeefcafe": "https://x.com/tags/deadbeefcafe",
+            "https://x.com/commits/abc1234": "https://x.com/commits/abc1234",
+        })
+
+    def test_host_and_query_unchanged(self):
+        self.assert_templates({
+            "https://10.0.0.12:8443/users/5": "https://10.0.0.12:8443/users/{id}",
+            "http://api-123.example.com/users/5": "http://api-123.example.com/users/{id}",
+            "https://x.com/search?page=2&id=5": "https://x.com/search?page=2&id=5",
+            "https://x.com/users/5?ref=123#section/7": "https://x.com/users/{id}?ref=123#section/7",
+            "https://x.com": "https://x.com",
+        })
+
+    def test_builtin_disabled(self):
+        self.assertEqual(UrlTemplater(builtin=False).template("https://x.com/users/5"), "https://x.com/users/5")
+
+
+class NameTagTest(unittest.TestCase):
+    """
+    k6 name 태그 가 url 과 다르면 name 을 그대로 endpoint 로 쓴다
+    """
+
+    def test_override(self):
+        templater = UrlTemplater()
+        self.assertEqual(templater.endpoint("https://x.com/users/5", "GET user"), "GET user")
+        self.assertEqual(templater.endpoint("https://x.com/users/5", "https://x.com/users/5"), "https://x.com/users/{id}")
+        self.assertEqual(templater.endpoint("https://x.com/users/5"), "https://x.com/users/{id}")
+        self.assertIsNone(templater.endpoint(None, "GET user"))
+
+    def test_disabled(self):
+        templater = UrlTemplater(use_name_tag=False)
+        self.assertEqual(templater.endpoint("https://x.com/users/5", "GET user"), "https://x.com/users/{id}")
+
+
+class UserTemplatesTest(unittest.TestCase):
+    """
+    --url-template 규칙 은 지정한 순서 대로 적용 되고, 그 결과 에 기본 segment 규칙 이 적용 된다
+    """
+
+    def test_order(self):
+        url = "https://x.com/users/5/avatar"
+        rules = ["/users/\\d+=>/users/{user}", "/users/\\{user\\}/avatar=>/avatar"]
+        self.assertEqual(build_url_templater(rules).template(url), "https://x.com/avatar")
+        # 순서 를 바꾸면 두 번째 규칙 은 첫 번째 규칙 의 결과 에 맞지 않는다
+        self.assertEqual(build_url_templater(rules[::-1]).template(url), "https://x.com/users/{user}/avatar")
+
+    def test_before_builtin(self):
+        templater = build_url_templater(["/shops/(\\d+)/=>/shops/{shop}/"])
+        self.assertEqual(templater.template("https://x.com/shops/3/items/9"), "https://x.com/shops/{shop}/items/{id}")
+
+    def test_group_reference_and_separator(self):
+        # 치환 문자열 에 그룹 참조 를 쓸 수 있고, 첫 번째 => 만 구분자
+        templater = build_url_templater(["/v(\\d)/=>/api-v\\1/", "/legacy=>/a=>b"])
+        self.assertEqual(templater.template("https://x.com/v2/users/5"), "https://x.com/api-v2/users/{id}")
+        self.assertEqual(templater.template("https://x.com/legacy"), "https://x.com/a=>b")
+
+    def test_invalid(self):
+        for spec in ("/users/\\d+", "=>/users", "/users/(\\d+=>/users"):
+            with self.subTest(spec=spec):
+                with self.assertRaises(ValueError):
+                    build_url_templater([spec])
+
+    def test_raw_urls(self):
+        self.assertIsNone(build_url_templater(["/a=>/b"], raw_urls=True))
+
+
+class ApplyTest(unittest.TestCase):
+    """
+    apply 는 url 컬럼 을 endpoint 카테고리 로 바꾸고, max_endpoints 를 넘으면 요청 이 적은 endpoint 를 묶는다
+    """
+
+    def frame(self) -> pd.DataFrame:
+        rows = [("https://x.com/users/1", None)] * 3 + [("https://x.com/users/2", None)] * 2 \
+            + [("https://x.com/health", None)] * 2 + [("https://x.com/login", "POST login")] \
+            + [("https://x.com/static/a.js", None)]
+        return pd.DataFrame({
+            "metric_name": "http_reqs",
+            "url": [url for url, _ in rows],
+            "name": [name or url for url, name in rows],
+        })
+
+    def test_apply(self):
+        result = UrlTemplater().apply(self.frame())
+        self.assertNotIn("name", result.columns)
+        self.assertEqual(result["url"].value_counts().to_dict(), {
+            "https://x.com/users/{id}": 5, "https://x.com/health": 2, "POST login": 1, "https://x.com/static/a.js": 1,
+        })
+
+    def test_limit(self):
+        # 요청 수 가 같으면 이름 순 으로 남긴다
+        result = UrlTemplater(max_endpoints=3).apply(self.frame())
+        self.assertEqual(result["url"].value_counts().to_dict(), {
+            "https://x.com/users/{id}": 5, "https://x.com/health": 2, "POST login": 1, OTHER_ENDPOINT: 1,
+        })
+        unlimited = UrlTemplater(max_endpoints=3).apply(self.frame(), limit=False)
+        self.assertNotIn(OTHER_ENDPOINT, set(unlimited["url"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
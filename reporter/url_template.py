@@ -0,0 +1,196 @@
+import re
+from collections import Counter
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# 경로 segment 전체가 아래 형태 이면 placeholder 로 바꾼다 (위에서 부터 처음 맞는 규칙)
+BUILTIN_SEGMENT_RULES = (
+    (re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"), "{uuid}"),
+    (re.compile(r"\d+"), "{id}"),
+    (re.compile(r"(?=[a-fA-F]*\d)[0-9a-fA-F]{12,}"), "{hex}"),  # 숫자 가 섞인 12자 이상 16진수 (ObjectId, 해시 등)
+)
+
+# scheme://host 부분 은 그대로 두고, 그 뒤 경로 (? 또는 # 전까지) 의 segment 만 바꾼다
+_URL_PARTS = re.compile(r"^((?:[a-zA-Z][a-zA-Z0-9+.-]*://)?[^/?#]*)([^?#]*)(.*)$", re.DOTALL)
+_PATH_SEGMENT = re.compile(r"[^/]+")
+
+# 템플릿 결과 가 이 개수 를 넘으면 요청 수 가 적은 나머지 endpoint 는 OTHER_ENDPOINT 하나로 묶는다
+DEFAULT_MAX_ENDPOINTS = 1_000
+OTHER_ENDPOINT = "(other)"
+
+# (url, name) -> endpoint 캐시 최대 크기 (넘으면 비운다)
+_CACHE_MAX = 100_000
+
+
+class UrlTemplater:
+    """
+    url (와 k6 name 태그) 을 개수가 제한된 endpoint 키로 바꾸는 집계 전 단계
+
+    - name 태그 가 url 과 다르면 (http.url`...` 이나 tags: { name } 으로 지정한 경우) name 을 그대로 endpoint 로 쓴다
+    - 아니면 templates ((정규식, 치환 문자열) 목록) 을 순서대로 re.sub 로 적용한 뒤,
+      경로 segment 중 숫자 / UUID / 16진수 값을 {id} / {uuid} / {hex} 로 바꾼다 (builtin=False 면 생략)
+    - 요청 이 있는 endpoint 가 max_endpoints 를 넘으면 요청 수 (http_reqs 행 수) 가 많은 순 (같으면 이름 순) 으로
+      max_endpoints 개만 남기고 나머지 는 OTHER_ENDPOINT 로 묶는다 (limit). 전체 건수 로 고르므로 행 / chunk / shard 순서 와 무관
+
+    apply 는 행이 아니라 고유한 (url, name) 쌍 에만 규칙 을 적용 하고, url 컬럼 을 endpoint 카테고리 코드 로 다시 만든다.
+    chunk 단위 집계 는 apply(limit=False) 로 템플릿 만 적용 해서 누적 한 뒤, 합친 건수 로 limit 을 한 번 적용 한다.
+    """
+
+    def __init__(self, templates: Optional[list] = None, builtin: bool = True, use_name_tag: bool = True,
+                 max_endpoints: Optional[int] = DEFAULT_MAX_ENDPOINTS):
+        self.templates = [(re.compile(pattern), replacement) for pattern, replacement in (templates or [])]
+        self.builtin = builtin
+        self.use_name_tag = use_name_tag
+        self.max_endpoints = max_endpoints
+        self._cache = {}
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, UrlTemplater) and self._key() == other._key()
+
+    def __getstate__(self) -> dict:
+        return {**vars(self), "_cache": {}}
+
+    def _key(self) -> tuple:
+        templates = tuple((pattern.pattern, replacement) for pattern, replacement in self.templates)
+        return templates, self.builtin, self.use_name_tag, self.max_endpoints
+
+    def template(self, url: str) -> str:
+        """
+        URL 하나에 사용자 템플릿 과 기본 segment 규칙 을 적용한 결과
+        """
+        for pattern, replacement in self.templates:
+            url = pattern.sub(replacement, url)
+        if not self.builtin:
+            return url
+        prefix, path, rest = _URL_PARTS.match(url).groups()
+        return prefix + _PATH_SEGMENT.sub(_template_segment, path) + rest
+
+    def endpoint(self, url, name=None):
+        """
+        (url, name 태그) 의 endpoint 키 (url 이 없는 행은 None, max_endpoints 적용 전)
+        """
+        if url is None:
+            return None
+        key = (url, name)
+        if key not in self._cache:
+            if len(self._cache) >= _CACHE_MAX:
+                self._cache.clear()
+            self._cache[key] = name if self.use_name_tag and name is not None and name != url else self.template(url)
+        return self._cache[key]
+
+    def limit(self, counts: dict) -> Optional[set]:
+        """
+        endpoint 별 요청 수 로 남길 endpoint 집합 (요청 이 있는 endpoint 가 max_endpoints 이하 면 None = 모두 남김)
+        """
+        ranked = sorted((endpoint for endpoint, count in counts.items() if count > 0),
+                        key=lambda endpoint: (-counts[endpoint], endpoint))
+        if self.max_endpoints is None or len(ranked) <= self.max_endpoints:
+            return None
+        print(f"[WARN] {len(ranked):,} endpoints after URL templating, keeping the {self.max_endpoints:,} busiest and "
+              f"grouping the rest as {OTHER_ENDPOINT} (add --url-template rules or raise --max-urls)")
+        return set(ranked[:self.max_endpoints])
+
+    def apply(self, df: pd.DataFrame, limit: bool = True) -> pd.DataFrame:
+        """
+        url 컬럼 을 endpoint 카테고리 로 바꾸고 name 컬럼 은 뺀 DataFrame
+
+        limit 이면 df 의 http_reqs 행 수 로 max_endpoints 를 적용 한다 (chunk 에는 False 로 주고 집계 후 적용)
+        """
+        if "url" not in df.columns:
+            return df
+        url = _as_category(df["url"])
+        url_codes = url.cat.codes.to_numpy().astype("int64")
+        url_values = url.cat.categories
+
+        if self.use_name_tag and "name" in df.columns:
+            name = _as_category(df["name"])
+            name_codes = name.cat.codes.to_numpy().astype("int64")
+            name_values = name.cat.categories
+        else:
+            name_codes = np.full(len(df), -1, dtype="int64")
+            name_values = pd.Index([])
+
+        # 고유한 (url, name) 쌍 만 규칙 적용 (코드 -1 = 값 없음 을 0 으로 당겨서 하나의 정수로)
+        width = len(name_values) + 1
+        pair_codes, pairs = pd.factorize((url_codes + 1) * width + (name_codes + 1))
+        endpoints = [
+            self.endpoint(url_values[u] if u >= 0 else None, name_values[n] if n >= 0 else None)
+            for u, n in zip(pairs // width - 1, pairs % width - 1)
+        ]
+        if limit and self.max_endpoints is not None and "metric_name" in df.columns:
+            requests = np.bincount(pair_codes[(df["metric_name"] == "http_reqs").to_numpy()], minlength=len(pairs))
+            counts = Counter()
+            for endpoint, count in zip(endpoints, requests):
+                if endpoint is not None:
+                    counts[endpoint] += int(count)
+            kept = self.limit(counts)
+            endpoints = [fold_endpoint(endpoint, kept) for endpoint in endpoints]
+
+        categories = sorted({e for e in endpoints if e is not None})
+        position = {endpoint: i for i, endpoint in enumerate(categories)}
+        lookup = np.array([position[e] if e is not None else -1 for e in endpoints] or [-1], dtype="int32")
+        codes = lookup[pair_codes] if len(df) else np.empty(0, dtype="int32")
+
+        columns = {"url": pd.Categorical.from_codes(codes, categories=categories)}
+        return df.drop(columns=[col for col in ("name",) if col in df.columns]).assign(**columns)
+
+    def describe(self) -> str:
+        parts = []
+        if self.builtin:
+            parts.append("numeric/uuid/hex segments")
+        if self.templates:
+            parts.append(f"{len(self.templates)} template(s)")
+        if self.use_name_tag:
+            parts.append("name tag")
+        if self.max_endpoints is not None:
+            parts.append(f"max {self.max_endpoints:,} endpoints")
+        return ", ".join(parts)
+
+
+def build_url_templater(templates: Optional[list] = None, raw_urls: bool = False,
+                        max_endpoints: Optional[int] = DEFAULT_MAX_ENDPOINTS) -> Optional[UrlTemplater]:
+    """
+    --url-template ('정규식=>치환' 목록) / --raw-urls / --max-urls 값 으로 UrlTemplater 생성 (--raw-urls 면 None)
+    """
+    if raw_urls:
+        if templates:
+            print("[WARN] --url-template is ignored with --raw-urls")
+        return None
+
+    parsed = []
+    for spec in templates or []:
+        pattern, sep, replacement = spec.partition("=>")
+        if not sep or not pattern:
+            raise ValueError(f"[ERROR] Invalid --url-template {spec!r}: expected REGEX=>TEMPLATE")
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"[ERROR] Invalid --url-template regex {pattern!r}: {e}")
+        parsed.append((pattern, replacement))
+
+    templater = UrlTemplater(parsed, max_endpoints=max_endpoints)
+    print(f"[INFO] URL templating: {templater.describe()}")
+    return templater
+
+
+def fold_endpoint(endpoint, kept: Optional[set]):
+    """
+    limit 으로 고른 kept 에 없는 endpoint 는 OTHER_ENDPOINT (kept 가 None 이거나 값 없음 은 그대로)
+    """
+    if kept is None or endpoint is None or endpoint in kept:
+        return endpoint
+    return OTHER_ENDPOINT
+
+
+def _template_segment(match: re.Match) -> str:
+    segment = match.group(0)
+    for pattern, placeholder in BUILTIN_SEGMENT_RULES:
+        if pattern.fullmatch(segment):
+            return placeholder
+    return segment
+
+
+def _as_category(series: pd.Series) -> pd.Series:
+    return series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype("category")
@@ -1,33 +1,64 @@
+import re
+import numpy as np
 import pandas as pd
 
-def calculate_test_duration(df: pd.DataFrame) -> dict:
+# 리포트 에 표시할 기본 시간대 (--timezone 으로 변경)
+DEFAULT_TIMEZONE = "Asia/Seoul"
+
+def calculate_test_duration(df: pd.DataFrame, window_start: int = None, window_end: int = None) -> dict:
     """
-    DataFrame 에서 'timestamp' 컬럼을 기준 으로 테스트 시작/종료 시각 및 총 소요 시간(초)을 계산
+    DataFrame 에서 'timestamp'(epoch 초) 컬럼을 기준 으로 테스트 시작/종료 시각 및 총 소요 시간(초)을 계산
+
+    window_start / window_end (--from / --to 구간, end 는 제외) 가 있으면 데이터 범위 로 자른 구간 기준.
 
     Returns:
         {
-            "start": 시작 시각 (timestamp),
-            "end": 종료 시각 (timestamp),
+            "start": 시작 시각 (int, epoch 초),
+            "end": 종료 시각 (int, epoch 초),
             "seconds": 총 테스트 시간 (int, 초 단위)
         }
     """
     if "timestamp" not in df.columns:
         raise ValueError("DataFrame에 'timestamp' 컬럼이 없습니다.")
 
-    start_time = df["timestamp"].min()
-    end_time = df["timestamp"].max()
-    duration = int((end_time - start_time).total_seconds())
+    return window_test_duration(int(df["timestamp"].min()), int(df["timestamp"].max()), window_start, window_end)
+
+
+def window_test_duration(first: int, last: int, window_start: int = None, window_end: int = None) -> dict:
+    """
+    첫/마지막 행 시각 과 선택 구간 으로 test_duration 계산
 
+    구간 이 없으면 마지막 - 첫 행 시각, 있으면 구간 을 데이터 범위 로 자른 [start, end) 의 길이
+    (예: --from 3m --to 8m 이고 그 구간 에 데이터 가 있으면 300 초).
+    """
+    start_time = first if window_start is None else max(window_start, first)
+    end_time = last if window_end is None else min(window_end, last + 1)
     return {
         "start": start_time,
         "end": end_time,
-        "seconds": duration
+        "seconds": end_time - start_time
     }
 
 
-def format_test_duration_title(test_duration: dict) -> str:
+def format_test_duration_title(test_duration: dict, timezone: str = DEFAULT_TIMEZONE) -> str:
     duration_text = format_duration(test_duration['seconds'] * 1000)
-    return f'{test_duration['start'].strftime("%Y.%m.%d %H:%M:%S")} ~ {test_duration['end'].strftime("%H:%M:%S")}, duration : {duration_text}'
+    start = to_datetime(test_duration['start'], timezone)
+    end = to_datetime(test_duration['end'], timezone)
+    return f'{start.strftime("%Y.%m.%d %H:%M:%S")} ~ {end.strftime("%H:%M:%S")}, duration : {duration_text}'
+
+
+def to_datetime(epoch_sec: int, timezone: str = DEFAULT_TIMEZONE) -> pd.Timestamp:
+    """
+    epoch 초 → timezone 기준 Timestamp
+    """
+    return pd.Timestamp(int(epoch_sec), unit="s", tz="UTC").tz_convert(timezone)
+
+
+def format_epoch_labels(epochs: pd.Series, timezone: str = DEFAULT_TIMEZONE, fmt: str = "%H:%M:%S") -> list:
+    """
+    시계열 버킷(epoch 초) 목록 을 timezone 기준 시각 문자열 목록 으로 변환 (차트 라벨용)
+    """
+    return pd.to_datetime(epochs, unit="s", utc=True).dt.tz_convert(timezone).dt.strftime(fmt).tolist()
 
 
 def format_duration(ms: float) -> str:
@@ -57,10 +88,81 @@ def format_bytes(value: float) -> str:
     return "0 B"
 
 
-def format_ratio(success: int, total: int) -> float:
-    if total == 0:
-        return 0.0
-    return round((success / total) * 100, 1)
+def parse_bytes(text: str) -> int:
+    """
+    "512M", "10G", "1.5GB", "1024" 형태의 크기 문자열 을 바이트 수로 변환
+    """
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4}
+    value = str(text).strip().upper().removesuffix("B")
+    try:
+        if value and value[-1] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(float(value))
+    except ValueError:
+        raise ValueError(f"[ERROR] Invalid size: {text}")
+
+
+def parse_count(text: str) -> int:
+    """
+    "1M", "10m", "2.5K", "1000000" 형태의 개수 문자열 을 정수로 변환 (K/M/B = 10^3/10^6/10^9)
+    """
+    units = {"K": 1_000, "M": 1_000_000, "B": 1_000_000_000}
+    value = str(text).strip().upper().replace("_", "")
+    try:
+        if value and value[-1] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(float(value))
+    except ValueError:
+        raise ValueError(f"[ERROR] Invalid count: {text}")
+
+
+def parse_list(text: str) -> list:
+    """
+    "a,b, c" → ["a", "b", "c"] (빈 항목 제외)
+    """
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+
+_OFFSET_PATTERN = re.compile(r"^\+?(?:(\d+)h)?(?:(\d+)m)?(?:(\d+)s)?$")
+
+
+def parse_time_bound(text: str, origin: int, timezone: str = DEFAULT_TIMEZONE) -> int:
+    """
+    --from / --to 값을 epoch 초로 변환
+      - 테스트 시작(origin) 기준 offset: "3m", "+90s", "1h30m", "180"
+      - 절대 시각 (timezone 기준): "2025-04-25 14:23:00", "14:23:00" (날짜 생략 시 테스트 시작일), epoch 초
+    """
+    value = str(text).strip()
+    offset = _OFFSET_PATTERN.match(value)
+    if value and offset and any(offset.groups()):
+        hours, minutes, seconds = (int(v) if v else 0 for v in offset.groups())
+        return origin + hours * 3600 + minutes * 60 + seconds
+    if value.isdigit():
+        # 작은 정수는 초 offset, epoch 범위 의 정수는 절대 시각
+        return int(value) if int(value) >= 1_000_000_000 else origin + int(value)
+
+    try:
+        if re.fullmatch(r"\d{1,2}:\d{2}(:\d{2})?", value):
+            value = f"{to_datetime(origin, timezone).strftime('%Y-%m-%d')} {value}"
+        timestamp = pd.Timestamp(value)
+    except ValueError:
+        raise ValueError(f"[ERROR] Invalid time: {text} (use an offset like 3m / 1h30m or a time like 14:23:00)")
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize(timezone)
+    return int(timestamp.timestamp())
+
+
+def format_ratios(success, total) -> np.ndarray:
+    """
+    성공률(%, 소수 첫째 자리) 배열. total 이 0 인 행은 0.0
+
+    나눗셈 은 배열 로 한 번에 하고, 반올림 은 값 마다 파이썬 round (np.round 는 x * 10 을 거쳐서
+    1/2000 = 0.05% 같은 경계 값 이 round 와 다르게 나온다).
+    """
+    success = np.asarray(success, dtype="float64")
+    total = np.asarray(total, dtype="float64")
+    ratios = np.divide(success, total, out=np.zeros(len(total)), where=total > 0) * 100
+    return np.array([round(ratio, 1) for ratio in ratios.tolist()], dtype="float64")
 
 
 def determine_interval_seconds(duration_sec: int) -> int: